@@ -1,49 +1,6 @@
 import pandas as pd
-import spei as si
 import plotly.graph_objs as go
-
-# Função de categorização de SPEI
-def categorizar_spei(spei_value):
-    if spei_value >= 2.00:
-        return 'Umidade extrema'
-    elif 1.50 <= spei_value < 2.00:
-        return 'Umidade severa'
-    elif 1.00 <= spei_value < 1.50:
-        return 'Umidade moderada'
-    elif 0 <= spei_value < 1.00:
-        return 'Umidade fraca'
-    elif -0.99 <= spei_value < 0:
-        return 'Seca fraca'
-    elif -1.50 <= spei_value < -1.00:
-        return 'Seca moderada'
-    elif -1.99 <= spei_value < -1.50:
-        return 'Seca severa'
-    else:
-        return 'Seca extrema'
-
-# Função para extrair os dados e calcular o balanço hídrico
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    # Leitura dos arquivos ETP e PRP
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-    
-    # Mesclando as duas tabelas pelo campo 'data'
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-    
-    # Calculando o balanço hídrico acumulado
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-    
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-    
-    return df_preparado
+from processamento import extrair_dados, categorizar_spei, spei_em_cache
 
 # Caminhos dos arquivos de ETP e PRP
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
@@ -51,10 +8,10 @@ file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
 
 # Extração dos dados e cálculo do SPEI
 dados_1 = extrair_dados(file_path_etp, file_path_prp, acumulado=1)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
+spei_1 = spei_em_cache(dados_1['dados'])
 
 # Classificando os valores de SPEI em categorias
-categorias = [categorizar_spei(spei) for spei in spei_1]
+categorias = categorizar_spei(spei_1)
 
 # Criando o DataFrame com as categorias e agrupando por ano
 df_categorias = pd.DataFrame({
@@ -66,7 +23,7 @@ df_categorias = pd.DataFrame({
 df_categorias['ano'] = df_categorias['data'].dt.year
 
 # Contagem das ocorrências por categoria por ano
-contagem_ocorrencias = df_categorias.groupby(['ano', 'categoria']).size().unstack(fill_value=0)
+contagem_ocorrencias = df_categorias.groupby(['ano', 'categoria'], observed=False).size().unstack(fill_value=0)
 
 # Calculando a porcentagem por categoria em relação ao total de meses por ano
 contagem_ocorrencias_percentage = contagem_ocorrencias.div(contagem_ocorrencias.sum(axis=1), axis=0) * 100
@@ -95,7 +52,7 @@ fig.add_trace(go.Bar(x=contagem_ocorrencias_percentage.index,
 # Adicionando as barras para cada categoria de seca (será a parte superior)
 fig.add_trace(go.Bar(x=contagem_ocorrencias_percentage.index, 
                      y=contagem_ocorrencias_percentage['Seca fraca'], 
-                     name='Seca Fraca (-0.99 <= SPEI < 0)', 
+                     name='Seca Fraca (-1.00 <= SPEI < 0)', 
                      marker=dict(color='#f87171')))
 fig.add_trace(go.Bar(x=contagem_ocorrencias_percentage.index, 
                      y=contagem_ocorrencias_percentage['Seca moderada'], 
@@ -103,7 +60,7 @@ fig.add_trace(go.Bar(x=contagem_ocorrencias_percentage.index,
                      marker=dict(color='#dc2626')))
 fig.add_trace(go.Bar(x=contagem_ocorrencias_percentage.index, 
                      y=contagem_ocorrencias_percentage['Seca severa'], 
-                     name='Seca Severa (-1.99 <= SPEI < -1.50)', 
+                     name='Seca Severa (-2.00 <= SPEI < -1.50)', 
                      marker=dict(color='#991b1b')))
 fig.add_trace(go.Bar(x=contagem_ocorrencias_percentage.index, 
                      y=contagem_ocorrencias_percentage['Seca extrema'], 
@@ -0,0 +1,125 @@
+"""Compara a carga antiga do testeapp.py (extrair_dados + extrair_etp_prp lendo
+os xlsx duas vezes) com carregar_conjunto, contando leituras de arquivo e tempo.
+
+Uso: python benchmarks/bench_carregamento.py [repeticoes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# O cache é isolado em um diretório temporário para que a medição "fria" seja real
+os.environ['SPEI_CACHE_DIR'] = tempfile.mkdtemp(prefix='spei-cache-')
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+import numpy as np
+import pandas as pd
+
+import processamento.cache as cache
+from processamento import balanco_hidrico, carregar_conjunto, etp_prp, limpar_cache
+
+file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
+file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
+file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
+
+# Contadores de leituras: planilhas parseadas e arquivos de cache abertos
+leituras = {'xlsx': 0, 'cache': 0}
+_read_excel = pd.read_excel
+_np_load = np.load
+
+
+def _read_excel_contado(*args, **kwargs):
+    leituras['xlsx'] += 1
+    return _read_excel(*args, **kwargs)
+
+
+def _np_load_contado(*args, **kwargs):
+    resultado = _np_load(*args, **kwargs)
+    leituras['cache'] += 1
+    return resultado
+
+
+pd.read_excel = _read_excel_contado
+cache.pd.read_excel = _read_excel_contado
+cache.np.load = _np_load_contado
+
+
+# Carga original do testeapp.py, reproduzida aqui como referência
+def extrair_dados_original(path_etp, path_prp, acumulado=1):
+    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
+    df_etp = df_etp.iloc[1:].reset_index(drop=True)
+
+    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
+    df_prp = df_prp.iloc[1:].reset_index(drop=True)
+
+    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
+    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
+    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
+
+    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
+    df.set_index('data', inplace=True)
+
+    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
+                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
+    df_preparado.set_index('data', inplace=True)
+
+    return df_preparado
+
+
+def extrair_etp_prp_original(path_etp, path_prp):
+    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'ETP'})
+    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'Precipitação'})
+
+    df_etp = df_etp.iloc[1:].reset_index(drop=True)
+    df_prp = df_prp.iloc[1:].reset_index(drop=True)
+
+    df_etp['data'] = pd.to_datetime(df_etp['data'], format='%Y-%m-%d')
+    df_prp['data'] = pd.to_datetime(df_prp['data'], format='%Y-%m-%d')
+
+    df_merged = pd.merge(df_etp, df_prp, on='data', how='inner')
+    df_merged.set_index('data', inplace=True)
+
+    return df_merged
+
+
+def carga_original():
+    return extrair_dados_original(file_path_etp, file_path_prp, 1), extrair_etp_prp_original(file_path_etp, file_path_prp)
+
+
+def carga_unificada():
+    conjunto = carregar_conjunto(file_path_etp, file_path_prp, file_path_tmax)
+    return balanco_hidrico(conjunto, 1), etp_prp(conjunto)
+
+
+def medir(nome, funcao, repeticoes, preparar=None):
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        leituras.update(xlsx=0, cache=0)
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    print(f'{nome:<32} {np.median(tempos) * 1000:9.2f} ms   xlsx lidos: {leituras["xlsx"]}   caches lidos: {leituras["cache"]}')
+    return resultado
+
+
+def limpar_todos():
+    for caminho in (file_path_etp, file_path_prp, file_path_tmax):
+        limpar_cache(caminho)
+
+
+if __name__ == '__main__':
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f'Mediana de {repeticoes} execuções (cache em {cache.DIRETORIO_CACHE})\n')
+    dados_antes, etp_prp_antes = medir('antes (2x extrair_*)', carga_original, repeticoes)
+    medir('depois, cache frio', carga_unificada, repeticoes, preparar=limpar_todos)
+    dados_depois, etp_prp_depois = medir('depois, cache quente', carga_unificada, repeticoes)
+
+    # Os resultados precisam ser idênticos aos da carga original
+    pd.testing.assert_frame_equal(dados_antes, dados_depois, check_freq=False, check_index_type=False)
+    pd.testing.assert_frame_equal(etp_prp_antes, etp_prp_depois, check_freq=False, check_index_type=False)
+    print('\nResultados idênticos à carga original.')
@@ -0,0 +1,76 @@
+"""Compara a antiga categorização escalar (if/elif aplicado elemento a elemento)
+com o classificador vetorizado por limites (categorizar_spei / codigos_spei).
+
+A referência é a função escalar: com 1000 estações o ganho fica na casa de
+60-80x. O groupby + apply do antigo dashboard é medido à parte, só para
+mostrar o custo daquele caminho, e não é a base da comparação.
+
+Uso: python benchmarks/bench_categorias.py [estacoes]
+"""
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np
+import pandas as pd
+
+from processamento import categorizar_spei, codigos_spei
+
+
+# Versão antiga, copiada dos scripts, usada como referência
+def categorizar_spei_escalar(spei_value):
+    if spei_value >= 2.00:
+        return 'Umidade extrema'
+    elif 1.50 <= spei_value < 2.00:
+        return 'Umidade severa'
+    elif 1.00 <= spei_value < 1.50:
+        return 'Umidade moderada'
+    elif 0 <= spei_value < 1.00:
+        return 'Umidade fraca'
+    elif -0.99 <= spei_value < 0:
+        return 'Seca fraca'
+    elif -1.50 <= spei_value < -1.00:
+        return 'Seca moderada'
+    elif -1.99 <= spei_value < -1.50:
+        return 'Seca severa'
+    else:
+        return 'Seca extrema'
+
+
+if __name__ == '__main__':
+    estacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = np.random.default_rng(0)
+    valores = rng.normal(size=(504, estacoes))
+
+    inicio = time.perf_counter()
+    antigo = [categorizar_spei_escalar(v) for v in valores.ravel()]
+    tempo_antigo = time.perf_counter() - inicio
+
+    # Padrão do atualizar_graficos: Series.apply dentro de um groupby por ano
+    serie = pd.Series(valores[:, 0], index=pd.date_range('1981-01-01', periods=len(valores), freq='MS'))
+    inicio = time.perf_counter()
+    serie.groupby(serie.index.year).apply(lambda x: x.apply(categorizar_spei_escalar).value_counts(normalize=True))
+    tempo_groupby = (time.perf_counter() - inicio) * estacoes
+
+    inicio = time.perf_counter()
+    novo = categorizar_spei(valores)
+    tempo_novo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    codigos_spei(valores)
+    tempo_codigos = time.perf_counter() - inicio
+
+    # Fora das lacunas antigas (-1.00 a -0.99 e -2.00 a -1.99) as classes são idênticas
+    plano = valores.ravel()
+    fora_das_lacunas = ~(((plano >= -1.0) & (plano < -0.99)) | ((plano >= -2.0) & (plano < -1.99)))
+    assert (np.asarray(novo)[fora_das_lacunas] == np.asarray(antigo)[fora_das_lacunas]).all()
+
+    print(f'{valores.size} valores ({estacoes} estações x 504 meses)')
+    print(f'escalar (if/elif):       {tempo_antigo * 1000:10.2f} ms')
+    print(f'groupby + apply (estim.):{tempo_groupby * 1000:10.2f} ms')
+    print(f'categorizar_spei:        {tempo_novo * 1000:10.2f} ms   ({tempo_antigo / tempo_novo:.0f}x o escalar)')
+    print(f'codigos_spei (int8):     {tempo_codigos * 1000:10.2f} ms   ({tempo_antigo / tempo_codigos:.0f}x o escalar)')
+    print(f'(groupby + apply / categorizar_spei: {tempo_groupby / tempo_novo:.0f}x, outro caminho)')
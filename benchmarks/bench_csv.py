@@ -0,0 +1,66 @@
+"""Compara a leitura de uma exportação multi-estação em xlsx (pd.read_excel)
+com o leitor de CSV brasileiro em blocos (ler_csv_br).
+
+Os arquivos são montados a partir de dados/PRP_TERRACLIMATE.CSV, replicando a
+série em várias estações e emendando cópias no tempo (com datas diárias).
+
+Uso: python benchmarks/bench_csv.py [estacoes] [copias]
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+import numpy as np
+import pandas as pd
+
+from processamento import ler_csv_br
+
+
+def montar_exportacao(diretorio, estacoes, copias):
+    base = ler_csv_br('dados/PRP_TERRACLIMATE.CSV')[0].to_numpy()
+    n = len(base) * copias
+    # Datas diárias terminando em 2022 para caber no intervalo do datetime64[ns]
+    datas = pd.date_range(end='2022-12-31', periods=n, freq='D')
+    rng = np.random.default_rng(0)
+    valores = np.tile(base, copias)[:, None] * rng.uniform(0.8, 1.2, size=(1, estacoes))
+    colunas = [f'estacao_{i}' for i in range(estacoes)]
+    df = pd.DataFrame(np.round(valores, 2), index=datas.strftime('%Y-%m-%d'), columns=colunas)
+
+    caminho_csv = os.path.join(diretorio, 'exportacao.CSV')
+    caminho_xlsx = os.path.join(diretorio, 'exportacao.xlsx')
+    df.to_csv(caminho_csv, sep=';', decimal=',', header=False, float_format='%.2f')
+    df.rename_axis('data').to_excel(caminho_xlsx)
+    return df, caminho_csv, caminho_xlsx
+
+
+def ler_xlsx(caminho):
+    df = pd.read_excel(caminho)
+    df['data'] = pd.to_datetime(df['data'], format='%Y-%m-%d')
+    return df.set_index('data')
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == '__main__':
+    estacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    copias = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        df, caminho_csv, caminho_xlsx = montar_exportacao(diretorio, estacoes, copias)
+        print(f'{len(df)} linhas x {estacoes} estações')
+
+        via_xlsx, tempo_xlsx = cronometrar(ler_xlsx, caminho_xlsx)
+        via_csv, tempo_csv = cronometrar(ler_csv_br, caminho_csv, list(df.columns))
+
+        np.testing.assert_allclose(via_csv.to_numpy(), via_xlsx.to_numpy())
+        print(f'xlsx (read_excel): {tempo_xlsx * 1000:10.1f} ms')
+        print(f'csv  (ler_csv_br): {tempo_csv * 1000:10.1f} ms   ({tempo_xlsx / tempo_csv:.0f}x mais rápido)')
@@ -0,0 +1,141 @@
+"""Tamanho das respostas e tempo até o primeiro gráfico do testeapp.py.
+
+Compara o testeapp.py da versão de referência (por padrão o primeiro commit
+do repositório: um callback único que devolve as seis figuras completas, com
+layout, em uma resposta) com os callbacks por gráfico atuais, que enviam só
+'data' via Patch. O "depois" simula uma carga de página: os seis callbacks
+saem juntos, como o navegador os dispara, e o primeiro gráfico é o primeiro
+callback a terminar. As requisições passam pelo servidor Flask do Dash
+(test_client), sem rede.
+
+Antes de medir, confere que um intervalo sem dados (anos após a série)
+responde com gráficos vazios em vez de erro.
+
+Uso: python benchmarks/bench_dashboard.py [intervalo] [--base COMMIT] [--repeticoes N]
+"""
+import argparse
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+app_ns = runpy.run_path(os.path.join(RAIZ, 'testeapp.py'), run_name='bench')
+app = app_ns['app']
+GRAFICOS = app_ns['GRAFICOS']
+TRACOS_ZOOM = app_ns['TRACOS_ZOOM']
+
+# Anos depois do fim da série, selecionáveis quando a série é atualizada
+INTERVALO_VAZIO = '2050-2060'
+
+
+def limpar_caches():
+    for dados in GRAFICOS.values():
+        dados.cache_clear()
+
+
+def corpo_grafico(id_grafico, intervalo):
+    return {
+        'output': f'{id_grafico}.figure',
+        'outputs': {'id': id_grafico, 'property': 'figure'},
+        'inputs': [{'id': 'ano-dropdown', 'property': 'value', 'value': intervalo}]
+                  + ([{'id': id_grafico, 'property': 'relayoutData', 'value': None}] if id_grafico in TRACOS_ZOOM else []),
+        'changedPropIds': ['ano-dropdown.value'],
+        'state': [],
+    }
+
+
+def corpo_unico(intervalo):
+    # Formato do antigo atualizar_graficos: uma requisição com as seis saídas
+    saidas = [{'id': id_grafico, 'property': 'figure'} for id_grafico in GRAFICOS]
+    return {
+        'output': '..' + '...'.join(f'{id_grafico}.figure' for id_grafico in GRAFICOS) + '..',
+        'outputs': saidas,
+        'inputs': [{'id': 'ano-dropdown', 'property': 'value', 'value': intervalo}],
+        'changedPropIds': ['ano-dropdown.value'],
+        'state': [],
+    }
+
+
+def requisitar(cliente, corpo):
+    inicio = time.perf_counter()
+    resposta = cliente.post('/_dash-update-component', json=corpo)
+    assert resposta.status_code == 200, resposta.status_code
+    return time.perf_counter() - inicio, len(resposta.data)
+
+
+def commit_base():
+    saida = subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return saida.stdout.split()[0]
+
+
+def carregar_base(commit):
+    # O testeapp.py da referência, executado como estava (lê as planilhas e calcula o SPEI por conta própria)
+    codigo = subprocess.run(['git', 'show', f'{commit}:testeapp.py'], cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False, encoding='utf-8') as arquivo:
+        arquivo.write(codigo)
+    try:
+        return runpy.run_path(arquivo.name, run_name='bench_base')['app']
+    finally:
+        os.remove(arquivo.name)
+
+
+def carga_da_pagina(intervalo):
+    """Dispara os seis callbacks ao mesmo tempo; retorna {id: (término desde o início, bytes)}."""
+    def um_grafico(id_grafico):
+        cliente = app.server.test_client()
+        _, tamanho = requisitar(cliente, corpo_grafico(id_grafico, intervalo))
+        return id_grafico, time.perf_counter() - inicio, tamanho
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(len(GRAFICOS)) as executor:
+        resultados = list(executor.map(um_grafico, GRAFICOS))
+    return {id_grafico: (termino, tamanho) for id_grafico, termino, tamanho in resultados}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tamanho das respostas e tempo até o primeiro gráfico.')
+    parser.add_argument('intervalo', nargs='?', default='1981-2022')
+    parser.add_argument('--base', help='commit de referência (padrão: o primeiro do repositório)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='medidas por cenário (mediana)')
+    args = parser.parse_args()
+    intervalo = args.intervalo
+
+    # Intervalo sem nenhum mês de dados: todos os gráficos devem responder (vazios)
+    cliente = app.server.test_client()
+    for id_grafico in GRAFICOS:
+        requisitar(cliente, corpo_grafico(id_grafico, INTERVALO_VAZIO))
+
+    base = args.base or commit_base()
+    cliente_base = carregar_base(base).server.test_client()
+    requisitar(cliente_base, corpo_unico(intervalo))  # aquecimento
+    medidas_base = [requisitar(cliente_base, corpo_unico(intervalo)) for _ in range(args.repeticoes)]
+    tempo_antes = statistics.median(tempo for tempo, _ in medidas_base)
+    bytes_antes = medidas_base[0][1]
+
+    print(f'intervalo {intervalo}, mediana de {args.repeticoes} medidas')
+    print(f'  antes ({base[:7]}, 1 callback, 6 figuras): {bytes_antes / 1024:8.1f} KiB, '
+          f'primeiro gráfico após {tempo_antes * 1000:7.1f} ms')
+
+    for estado in ('frio', 'quente'):
+        cargas = []
+        for _ in range(args.repeticoes):
+            if estado == 'frio':
+                limpar_caches()
+            cargas.append(carga_da_pagina(intervalo))
+        print(f'  depois [{estado}] (6 callbacks simultâneos, Patch):')
+        for id_grafico in GRAFICOS:
+            termino = statistics.median(carga[id_grafico][0] for carga in cargas)
+            print(f'    {id_grafico:26s} {cargas[0][id_grafico][1] / 1024:8.1f} KiB  pronto em {termino * 1000:7.1f} ms')
+        total = sum(tamanho for _, tamanho in cargas[0].values())
+        primeiro = statistics.median(min(termino for termino, _ in carga.values()) for carga in cargas)
+        ultimo = statistics.median(max(termino for termino, _ in carga.values()) for carga in cargas)
+        print(f'    total {total / 1024:8.1f} KiB, primeiro gráfico após {primeiro * 1000:7.1f} ms, '
+              f'todos após {ultimo * 1000:7.1f} ms')
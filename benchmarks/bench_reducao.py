@@ -0,0 +1,41 @@
+"""Tamanho do traço e tempo de redução (min-max e LTTB) de séries longas de SPEI,
+como as diárias ou de várias estações concatenadas.
+
+Uso: python benchmarks/bench_reducao.py [pontos]
+"""
+import json
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from processamento import PONTOS_GRAFICO, reduzir_serie
+
+
+def tamanho_traco(serie):
+    traco = {'x': serie.index, 'y': serie.to_numpy()}
+    return len(json.dumps(traco, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+if __name__ == '__main__':
+    pontos = int(sys.argv[1]) if len(sys.argv) > 1 else 42 * 365
+    rng = np.random.default_rng(0)
+    # Série diária autocorrelacionada, com a escala típica do SPEI
+    valores = np.convolve(rng.normal(size=pontos + 29), np.ones(30) / np.sqrt(30), mode='valid')
+    # Diária por padrão; horária quando os pontos não cabem no intervalo de datas do pandas
+    frequencia = 'D' if pontos < 100_000 else 'h'
+    serie = pd.Series(valores, index=pd.date_range('1981-01-01', periods=pontos, freq=frequencia))
+
+    print(f'série completa: {pontos} pontos, {tamanho_traco(serie) / 1024:.1f} KiB')
+    for metodo in ('minmax', 'lttb'):
+        inicio = time.perf_counter()
+        reduzida = reduzir_serie(serie, PONTOS_GRAFICO, metodo)
+        tempo = time.perf_counter() - inicio
+        print(f'{metodo:7s} {len(reduzida):6d} pontos, {tamanho_traco(reduzida) / 1024:7.1f} KiB, '
+              f'{tempo * 1000:6.1f} ms, mínimo preservado: {reduzida.min() == serie.min()}')
@@ -0,0 +1,78 @@
+"""Memória (PSS somado) dos workers do gunicorn com e sem preload_app.
+
+PSS divide as páginas compartilhadas entre os processos que as usam, então a
+soma mostra a memória real do conjunto. Requer gunicorn e Linux (/proc).
+
+Uso: python benchmarks/bench_workers.py [workers] [porta]
+"""
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def filhos(pid):
+    saida = subprocess.run(['pgrep', '-P', str(pid)], capture_output=True, text=True).stdout
+    return [int(filho) for filho in saida.split()]
+
+
+def memoria(pid):
+    pss = rss = 0
+    with open(f'/proc/{pid}/smaps_rollup') as arquivo:
+        for linha in arquivo:
+            if linha.startswith('Pss:'):
+                pss += int(linha.split()[1])
+            elif linha.startswith('Rss:'):
+                rss += int(linha.split()[1])
+    return pss * 1024, rss * 1024
+
+
+def medir(configuracao, workers, porta, espera_workers):
+    ambiente = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f'127.0.0.1:{porta}')
+    mestre = subprocess.Popen(['gunicorn', '-c', configuracao, 'wsgi:server'], cwd=RAIZ, env=ambiente,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    inicio = time.perf_counter()
+    try:
+        while len(filhos(mestre.pid)) < workers or not _pronto(porta):
+            time.sleep(0.5)
+        pronto = time.perf_counter() - inicio
+        # Sem preload cada worker carrega por conta própria depois do fork
+        time.sleep(espera_workers)
+        medidas = [memoria(pid) for pid in [mestre.pid] + filhos(mestre.pid)]
+        return pronto, sum(pss for pss, _ in medidas), sum(rss for _, rss in medidas)
+    finally:
+        mestre.send_signal(signal.SIGTERM)
+        mestre.wait(timeout=60)
+
+
+def _pronto(porta):
+    try:
+        urllib.request.urlopen(f'http://127.0.0.1:{porta}/pronto', timeout=2).read()
+        return True
+    except OSError:
+        return False
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    porta = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    configuracao = os.path.join(RAIZ, 'gunicorn.conf.py')
+
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as sem_preload:
+        sem_preload.write(f'exec(open({configuracao!r}).read())\npreload_app = False\n')
+
+    try:
+        for nome, arquivo, n, espera in (
+            ('preload, 1 worker', configuracao, 1, 2),
+            (f'preload, {workers} workers', configuracao, workers, 2),
+            (f'sem preload, {workers} workers', sem_preload.name, workers, 60),
+        ):
+            pronto, pss, rss = medir(arquivo, n, porta, espera)
+            print(f'{nome:26s} PSS {pss / 2**20:7.0f} MiB   RSS {rss / 2**20:7.0f} MiB   /pronto após {pronto:5.1f} s')
+    finally:
+        os.remove(sem_preload.name)
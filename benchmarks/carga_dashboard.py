@@ -0,0 +1,310 @@
+"""Teste de carga dos callbacks dos dashboards (testeapp.py e dados/app.py).
+
+Simula usuários trocando o intervalo e o ano nos dropdowns: cada "troca"
+dispara o callback de opções do ano-dropdown e todos os callbacks que
+dependem dele, como o navegador faria. Dois modos:
+
+  processo  requisições pelo test_client do Flask, no mesmo processo (sem rede)
+  http      requisições HTTP contra um servidor iniciado localmente
+            (servidor de desenvolvimento com threads ou, com --gunicorn, o
+            gunicorn.conf.py do projeto)
+
+Relata p50/p95/p99 por callback e no total, vazão e RSS do processo que
+atende, e acrescenta o resultado a benchmarks/resultados/carga.jsonl junto
+com o commit atual, para comparar versões. Termina com código 1 se alguma
+requisição falhar (por exemplo os callbacks ainda incompletos de dados/app.py).
+
+Uso:
+  python benchmarks/carga_dashboard.py [--app testeapp|dados] [--modo processo|http]
+                                       [--concorrencia 8] [--trocas 200] [--gunicorn]
+  python benchmarks/carga_dashboard.py --comparar
+"""
+import argparse
+import json
+import os
+import random
+import runpy
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+import numpy as np
+
+APPS = {
+    'testeapp': os.path.join(RAIZ, 'testeapp.py'),
+    'dados': os.path.join(RAIZ, 'dados', 'app.py'),
+}
+ARQUIVO_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados', 'carga.jsonl')
+
+# Proporção de usuários em cada tamanho de intervalo do intervalo-dropdown
+MISTURA_INTERVALOS = {'5': 0.5, '10': 0.35, 'all': 0.15}
+
+
+def carregar_app(nome):
+    return runpy.run_path(APPS[nome], run_name='carga')
+
+
+def _saidas(chave):
+    # '..a.figure...b.figure..' (várias saídas) ou 'a.figure' (uma saída)
+    multiplas = chave.startswith('..')
+    partes = chave.strip('.').split('...') if multiplas else [chave]
+    saidas = [dict(zip(('id', 'property'), parte.rsplit('.', 1))) for parte in partes]
+    return saidas if multiplas else saidas[0]
+
+
+def montar_requisicoes(app):
+    """Corpos das requisições de cada callback, com os valores a preencher na hora."""
+    callbacks = []
+    for chave, callback in app.callback_map.items():
+        entradas = [(entrada['id'], entrada['property']) for entrada in callback['inputs']]
+        if ('intervalo-dropdown', 'value') in entradas:
+            gatilho = 'intervalo'
+        elif ('ano-dropdown', 'value') in entradas:
+            gatilho = 'ano'
+        else:
+            continue
+        callbacks.append({'chave': chave, 'saidas': _saidas(chave), 'entradas': entradas, 'gatilho': gatilho})
+    return callbacks
+
+
+def corpo(callback, intervalo, ano):
+    valores = {('intervalo-dropdown', 'value'): intervalo, ('ano-dropdown', 'value'): ano}
+    return {
+        'output': callback['chave'],
+        'outputs': callback['saidas'],
+        'inputs': [{'id': id_, 'property': prop, 'value': valores.get((id_, prop))} for id_, prop in callback['entradas']],
+        'changedPropIds': ['intervalo-dropdown.value' if callback['gatilho'] == 'intervalo' else 'ano-dropdown.value'],
+        'state': [],
+    }
+
+
+def sortear_trocas(opcoes_do_intervalo, trocas, semente):
+    aleatorio = random.Random(semente)
+    tamanhos, pesos = zip(*MISTURA_INTERVALOS.items())
+    sorteadas = []
+    for _ in range(trocas):
+        intervalo = aleatorio.choices(tamanhos, pesos)[0]
+        sorteadas.append((intervalo, aleatorio.choice(opcoes_do_intervalo(intervalo))['value']))
+    return sorteadas
+
+
+def rss_bytes(pid='self'):
+    with open(f'/proc/{pid}/status') as arquivo:
+        for linha in arquivo:
+            if linha.startswith('VmRSS:'):
+                return int(linha.split()[1]) * 1024
+    return 0
+
+
+def executar(enviar, callbacks, trocas, concorrencia):
+    """Dispara as trocas em 'concorrencia' threads; retorna latências por callback e erros."""
+    latencias = {callback['chave']: [] for callback in callbacks}
+    erros = []
+    trava = threading.Lock()
+
+    def uma_troca(troca):
+        intervalo, ano = troca
+        for callback in callbacks:
+            inicio = time.perf_counter()
+            status = enviar(corpo(callback, intervalo, ano))
+            duracao = time.perf_counter() - inicio
+            with trava:
+                if status in (200, 204):
+                    latencias[callback['chave']].append(duracao)
+                else:
+                    erros.append((callback['chave'], status))
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concorrencia) as executor:
+        list(executor.map(uma_troca, trocas))
+    return latencias, erros, time.perf_counter() - inicio
+
+
+def enviar_processo(app):
+    locais = threading.local()
+
+    def enviar(dados):
+        if not hasattr(locais, 'cliente'):
+            locais.cliente = app.server.test_client()
+        return locais.cliente.post('/_dash-update-component', json=dados).status_code
+
+    return enviar
+
+
+def enviar_http(url):
+    def enviar(dados):
+        requisicao = urllib.request.Request(url + '/_dash-update-component', data=json.dumps(dados).encode('utf-8'),
+                                            headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(requisicao, timeout=60) as resposta:
+                resposta.read()
+                return resposta.status
+        except urllib.error.HTTPError as erro:
+            return erro.code
+
+    return enviar
+
+
+def iniciar_servidor(nome, porta, gunicorn):
+    if gunicorn:
+        ambiente = dict(os.environ, SPEI_APP=nome, BIND=f'127.0.0.1:{porta}')
+        comando = ['gunicorn', '-c', os.path.join(RAIZ, 'gunicorn.conf.py'), 'wsgi:server']
+    else:
+        ambiente = dict(os.environ)
+        comando = [sys.executable, os.path.abspath(__file__), '--servir', '--app', nome, '--porta', str(porta)]
+    processo = subprocess.Popen(comando, cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{porta}'
+    limite = time.time() + 300
+    while time.time() < limite:
+        try:
+            urllib.request.urlopen(url + '/_dash-layout', timeout=2).read()
+            return processo, url
+        except OSError:
+            if processo.poll() is not None:
+                raise RuntimeError('o servidor terminou antes de responder')
+            time.sleep(0.5)
+    processo.kill()
+    raise RuntimeError('o servidor não respondeu em 300 s')
+
+
+def rss_servidor(processo):
+    # Soma o mestre e os workers (gunicorn) ou só o processo (servidor com threads)
+    pids = [processo.pid] + [int(pid) for pid in subprocess.run(
+        ['pgrep', '-P', str(processo.pid)], capture_output=True, text=True).stdout.split()]
+    return sum(rss_bytes(pid) for pid in pids)
+
+
+def commit_atual():
+    try:
+        saida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True, text=True, check=True)
+        sujo = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=RAIZ, capture_output=True, text=True).stdout
+        return saida.stdout.strip() + ('+' if sujo.strip() else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecido'
+
+
+def resumo(latencias):
+    valores = np.asarray(latencias) * 1000
+    if len(valores) == 0:
+        return {'n': 0}
+    p50, p95, p99 = np.percentile(valores, [50, 95, 99])
+    return {'n': int(len(valores)), 'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3)}
+
+
+def comparar():
+    if not os.path.exists(ARQUIVO_RESULTADOS):
+        print('nenhum resultado salvo ainda')
+        return
+    with open(ARQUIVO_RESULTADOS) as arquivo:
+        resultados = [json.loads(linha) for linha in arquivo if linha.strip()]
+    print(f'{"commit":10s} {"app":9s} {"modo":14s} {"conc":>4s} {"p50 ms":>8s} {"p95 ms":>8s} {"p99 ms":>8s} {"req/s":>8s} {"RSS MiB":>8s} {"erros":>6s}')
+    for r in resultados:
+        total = r['total']
+        print(f'{r["commit"]:10s} {r["app"]:9s} {r["modo"]:14s} {r["concorrencia"]:4d} {total.get("p50_ms", 0):8.2f} '
+              f'{total.get("p95_ms", 0):8.2f} {total.get("p99_ms", 0):8.2f} {r["vazao_req_s"]:8.1f} '
+              f'{r["rss_bytes"] / 2**20:8.0f} {r["erros"]:6d}')
+
+
+def _opcoes_por_callback(modulo):
+    # dados/app.py não separa as opções em uma função; usa o próprio callback
+    def opcoes(intervalo):
+        return modulo['atualizar_ano_dropdown'](intervalo)[0]
+    return opcoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app', choices=sorted(APPS), default='testeapp')
+    parser.add_argument('--modo', choices=('processo', 'http'), default='processo')
+    parser.add_argument('--concorrencia', type=int, default=8)
+    parser.add_argument('--trocas', type=int, default=200, help='trocas de intervalo/ano simuladas')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--porta', type=int, default=8766)
+    parser.add_argument('--gunicorn', action='store_true', help='no modo http, sobe o gunicorn em vez do servidor com threads')
+    parser.add_argument('--nao-salvar', action='store_true')
+    parser.add_argument('--comparar', action='store_true', help='mostra os resultados salvos e sai')
+    parser.add_argument('--servir', action='store_true', help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.comparar:
+        comparar()
+        return
+
+    modulo = carregar_app(argumentos.app)
+    app = modulo['app']
+    if argumentos.servir:
+        from werkzeug.serving import make_server
+        make_server('127.0.0.1', argumentos.porta, app.server, threaded=True).serve_forever()
+        return
+
+    callbacks = montar_requisicoes(app)
+    trocas = sortear_trocas(modulo['opcoes_do_intervalo'] if 'opcoes_do_intervalo' in modulo else _opcoes_por_callback(modulo),
+                            argumentos.trocas, argumentos.semente)
+
+    processo = None
+    if argumentos.modo == 'processo':
+        # Os erros entram na contagem; o traceback de cada um só poluiria a saída
+        app.server.logger.disabled = True
+        enviar = enviar_processo(app)
+    else:
+        processo, url = iniciar_servidor(argumentos.app, argumentos.porta, argumentos.gunicorn)
+        enviar = enviar_http(url)
+
+    try:
+        # Uma passada curta de aquecimento, fora da medida
+        executar(enviar, callbacks, trocas[:min(10, len(trocas))], 1)
+        latencias, erros, duracao = executar(enviar, callbacks, trocas, argumentos.concorrencia)
+        rss = rss_bytes() if processo is None else rss_servidor(processo)
+    finally:
+        if processo is not None:
+            processo.send_signal(signal.SIGTERM)
+            processo.wait(timeout=60)
+
+    todas = [valor for valores in latencias.values() for valor in valores]
+    resultado = {
+        'commit': commit_atual(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'app': argumentos.app,
+        'modo': argumentos.modo + ('+gunicorn' if argumentos.gunicorn and argumentos.modo == 'http' else ''),
+        'concorrencia': argumentos.concorrencia,
+        'trocas': argumentos.trocas,
+        'semente': argumentos.semente,
+        'total': resumo(todas),
+        'callbacks': {chave: resumo(valores) for chave, valores in latencias.items()},
+        'vazao_req_s': round(len(todas) / duracao, 1),
+        'rss_bytes': rss,
+        'erros': len(erros),
+    }
+
+    print(f'{argumentos.app} / {resultado["modo"]} / concorrência {argumentos.concorrencia} / {argumentos.trocas} trocas')
+    for chave, medidas in resultado['callbacks'].items():
+        if medidas['n']:
+            print(f'  {chave[:60]:60s} p50 {medidas["p50_ms"]:7.2f}  p95 {medidas["p95_ms"]:7.2f}  p99 {medidas["p99_ms"]:7.2f} ms')
+    total = resultado['total']
+    if total['n']:
+        print(f'  total: p50 {total["p50_ms"]:.2f} ms, p95 {total["p95_ms"]:.2f} ms, p99 {total["p99_ms"]:.2f} ms')
+    print(f'  vazão {resultado["vazao_req_s"]} req/s, RSS {rss / 2**20:.0f} MiB, erros {len(erros)}')
+    if erros:
+        print(f'  primeiro erro: {erros[0]}')
+
+    if not argumentos.nao_salvar:
+        os.makedirs(os.path.dirname(ARQUIVO_RESULTADOS), exist_ok=True)
+        with open(ARQUIVO_RESULTADOS, 'a') as arquivo:
+            arquivo.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+
+    # As latências só cobrem respostas 200/204: com erros, a medida não vale como resultado
+    if erros:
+        sys.exit(f'{len(erros)} requisições com erro; percentis sem significado')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Gera conjuntos sintéticos com a forma das planilhas do TerraClimate para
+testes de desempenho (ETP, precipitação e TMAX; xlsx por estação e CSV
+brasileiro com todas as estações).
+
+--escala escolhe um tamanho em relação ao conjunto atual (1 estação, 42 anos
+mensais = 504 valores por variável): 1; 100 (100 estações mensais); 10000
+(330 estações diárias em 42 anos, ~10.044x). --estacoes, --anos e --diario
+substituem cada dimensão da escala escolhida. A mesma --semente gera sempre os mesmos
+arquivos; a configuração usada fica em parametros.json.
+
+Para apontar os scripts para o conjunto gerado, use os arquivos de
+<destino>/estacao_00000/ no lugar dos de dados/.
+
+Uso: python benchmarks/gerar_dados_sinteticos.py destino [--escala 1|100|10000]
+         [--estacoes N] [--anos M] [--diario] [--falhas 0.02] [--semente 0]
+         [--individuais K] [--sem-xlsx]
+"""
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+from processamento.sintetico import ANO_INICIAL, ANOS_ATUAIS, ESCALAS_SINTETICAS, gerar_series, gravar_conjunto
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos no formato do TerraClimate.')
+    parser.add_argument('destino')
+    parser.add_argument('--escala', type=int, choices=sorted(ESCALAS_SINTETICAS), default=1)
+    parser.add_argument('--estacoes', type=int, help='número de estações (substitui o da escala)')
+    parser.add_argument('--anos', type=int, help=f'anos de dados (padrão da escala: {ANOS_ATUAIS})')
+    parser.add_argument('--ano-inicial', type=int, default=ANO_INICIAL)
+    parser.add_argument('--diario', action='store_true', help='valores diários em vez de mensais')
+    parser.add_argument('--falhas', type=float, default=0.0, help='fração de valores ausentes')
+    parser.add_argument('--duracao-falha', type=float, default=3, help='duração média de cada falha, em passos')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--individuais', type=int, help='estações com pasta própria (padrão: todas)')
+    parser.add_argument('--sem-xlsx', action='store_true', help='grava só os CSVs')
+    args = parser.parse_args()
+
+    escala = ESCALAS_SINTETICAS[args.escala]
+    parametros = {
+        'estacoes': args.estacoes or escala['estacoes'],
+        'anos': args.anos or escala['anos'],
+        'ano_inicial': args.ano_inicial,
+        'frequencia': 'diaria' if args.diario else escala['frequencia'],
+        'falhas': args.falhas,
+        'duracao_falha': args.duracao_falha,
+        'semente': args.semente,
+    }
+
+    inicio = time.perf_counter()
+    series = gerar_series(**parametros)
+    geracao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    formatos = ('csv',) if args.sem_xlsx else ('csv', 'xlsx')
+    gravados = gravar_conjunto(args.destino, series, individuais=args.individuais, formatos=formatos, parametros=parametros)
+    gravacao = time.perf_counter() - inicio
+
+    valores = sum(df.size for df in series.values())
+    tamanho = sum(os.path.getsize(caminho) for caminho in gravados)
+    print(f"{parametros['estacoes']} estações x {len(series['PRP'])} passos ({parametros['frequencia']}), "
+          f'{valores:,} valores ({len(series["PRP"]) * parametros["estacoes"] / (ANOS_ATUAIS * 12):,.0f}x o conjunto atual)')
+    print(f'geração {geracao:.2f} s, gravação {gravacao:.2f} s, '
+          f'{len(gravados)} arquivos, {tamanho / 2 ** 20:.1f} MiB em {args.destino}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import sys
+
+import plotly.graph_objs as go
+from processamento import estatisticas_mensais_por_periodo, extrair_dados, spei_em_cache, tracos_caixa
+
+# Caminhos dos arquivos de ETP e PRP
+file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
+file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
+
+# Períodos padrão: as quatro décadas e o período de referência 1981-2010.
+# Outros períodos podem ser passados na linha de comando:
+#   python boxplot_periodos.py 1981-1990 1991-2020
+PERIODOS = [(1981, 1990), (1991, 2000), (2001, 2010), (2011, 2020), (1981, 2010)]
+
+# Nomes dos meses em pt-BR
+nomes_meses = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+               'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+
+# Nome da imagem de cada período; a última década mantém o nome usado na dissertação
+def nome_arquivo(periodo):
+    if periodo == '2011-2020':
+        return 'boxplot_spei_mes_ultima_decada_ajustado_ptbr_gray.png'
+    inicio, fim = periodo.split('-')
+    return f'boxplot_spei_mes_{inicio}_a_{fim}_ajustado_ptbr_gray.png'
+
+
+# Criando o gráfico boxplot de um período a partir das estatísticas (uma caixa por mês)
+def figura_periodo(estatisticas):
+    fig = go.Figure(tracos_caixa(
+        estatisticas,
+        nomes=[nomes_meses[mes - 1] for mes in estatisticas.index],  # Usando os nomes dos meses em pt-BR
+        marker=dict(color='gray'),  # Remover a cor de preenchimento
+        line=dict(color='gray'),  # Definir a cor da linha das caixas como cinza
+        fillcolor='rgba(0,0,0,0)'  # Deixar o preenchimento da caixa transparente
+    ))
+
+    # Configurações do layout
+    fig.update_layout(
+        yaxis_title='SPEI',  # Rótulo do eixo Y para SPEI
+        yaxis=dict(
+            range=[-3, 3],  # Ajustando o intervalo do eixo Y de -3 a 3
+            showgrid=True,  # Mostrar grid no eixo Y
+            gridcolor='lightgray',  # Cor mais clara para a grade
+            gridwidth=0.5,  # Espessura da grade mais fina
+        ),
+        font=dict(family="Arial, sans-serif", size=12, color="black", weight="bold"),  # Fonte para título e rótulos
+        width=1500,  # Largura do gráfico ajustada para ABNT
+        height=800,  # Altura ajustada
+        template='plotly_white',  # Estilo claro para o gráfico
+        showlegend=False,  # Não mostrar legenda
+        xaxis=dict(
+            tickangle=45,  # Girar os rótulos para melhor legibilidade
+            showgrid=True,  # Mostrar grid no eixo X
+        ),
+        margin=dict(l=50, r=50, t=20, b=20)  # Margens ajustadas
+    )
+    return fig
+
+
+periodos = PERIODOS
+if __name__ == '__main__' and len(sys.argv) > 1:
+    periodos = [tuple(int(ano) for ano in argumento.split('-')) for argumento in sys.argv[1:]]
+
+# Extração dos dados e cálculo do SPEI
+dados_1 = extrair_dados(file_path_etp, file_path_prp, acumulado=1)
+spei_1 = spei_em_cache(dados_1['dados'])
+
+# Estatísticas de todos os períodos e meses em uma única passada
+estatisticas = estatisticas_mensais_por_periodo(spei_1, periodos)
+
+# Uma figura por período, todas a partir das mesmas estatísticas
+for periodo, estatisticas_periodo in estatisticas.groupby(level='periodo', sort=False):
+    fig = figura_periodo(estatisticas_periodo.droplevel('periodo'))
+    fig.write_image(nome_arquivo(periodo), width=2000, height=1200, scale=2)
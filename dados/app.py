@@ -1,80 +1,38 @@
 import dash
 import os
+import sys
 from dash import Input, Output, dcc, html
-import spei as si
 import pandas as pd
 import plotly.graph_objs as go
 import dash_bootstrap_components as dbc
 
-# Função para extrair dados (sem alterações)
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
+# Permite importar o pacote processamento ao executar a partir de dados/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
+from processamento import balanco_hidrico, carregar_conjunto, etp_prp, construir_indice, spei_em_cache, instrumentar, medir_etapa, registrar_metricas
+from processamento.cliente import MODO_CLIENTE, registrar_modo_cliente
 
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-
-    return df_preparado
-
-# Função para extrair dados somente de ETP e precipitação (sem alterações)
-def extrair_etp_prp(path_etp, path_prp):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'ETP'})
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'Precipitação'})
-
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-
-    df_etp['data'] = pd.to_datetime(df_etp['data'], format='%Y-%m-%d')
-    df_prp['data'] = pd.to_datetime(df_prp['data'], format='%Y-%m-%d')
-
-    df_merged = pd.merge(df_etp, df_prp, on='data', how='inner')
-    df_merged.set_index('data', inplace=True)
-
-    return df_merged
-
-# Caminhos dos arquivos (sem alterações)
+# Caminhos dos arquivos
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
 file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
+file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
 
-# Extração dos dados e cálculo do SPEI (sem alterações)
-dados_1 = extrair_dados(file_path_etp, file_path_prp, 1)
-df_etp_prp = extrair_etp_prp(file_path_etp, file_path_prp)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
+# Extração dos dados e cálculo do SPEI: cada planilha é lida uma única vez e o
+# balanço hídrico e a visão ETP/Precipitação derivam do mesmo frame
+with medir_etapa('carga'):
+    conjunto = carregar_conjunto(file_path_etp, file_path_prp, file_path_tmax)
+    dados_1 = balanco_hidrico(conjunto, 1)
+    df_etp_prp = etp_prp(conjunto)
+with medir_etapa('spei'):
+    spei_1 = spei_em_cache(dados_1['dados'])
+# Contagens por categoria acumuladas por ano: a porcentagem de qualquer intervalo sai em O(1)
+with medir_etapa('categorias'):
+    indice_spei = construir_indice(spei_1)
 
 # Função para filtrar os anos (sem alterações)
 def filtrar_por_ano(spei, ano_inicial, ano_final):
     return spei[(spei.index.year >= ano_inicial) & (spei.index.year <= ano_final)]
 
-# Função para categorizar o SPEI com as novas categorias
-def categorizar_spei(spei_value):
-    if spei_value >= 2.00:
-        return 'Umidade extrema'
-    elif 1.50 <= spei_value < 2.00:
-        return 'Umidade severa'
-    elif 1.00 <= spei_value < 1.50:
-        return 'Umidade moderada'
-    elif 0 <= spei_value < 1.00:
-        return 'Umidade fraca'
-    elif -0.99 <= spei_value < 0:
-        return 'Seca fraca'
-    elif -1.50 <= spei_value < -1.00:
-        return 'Seca moderada'
-    elif -1.99 <= spei_value < -1.50:
-        return 'Seca severa'
-    else:
-        return 'Seca extrema'
-
 # Enhanced color palette
 COLOR_PALETTE = {
     'background': '#f4f4f4',
@@ -154,6 +112,9 @@ app = dash.Dash(__name__,
                     {"name": "viewport", "content": "width=device-width, initial-scale=1"}
                 ])
 
+# Latência, bytes por callback e acertos de cache em /metrics (com SPEI_METRICAS=1)
+registrar_metricas(app)
+
 app.layout = dbc.Container(
     [
         # Header with icon
@@ -262,6 +223,7 @@ app.layout = dbc.Container(
      Output('ano-dropdown', 'value')],
     Input('intervalo-dropdown', 'value')
 )
+@instrumentar('callback', 'ano-dropdown')
 def atualizar_ano_dropdown(intervalo):
     anos_disponiveis = list(range(1981, 2023))  # Supondo que os dados vão até 2022
     opcoes = []
@@ -290,30 +252,34 @@ def atualizar_ano_dropdown(intervalo):
 
     return opcoes, valor_default
 
-@app.callback(
-    [Output('spei-graph', 'figure'),
-     Output('barras-empilhadas-graph', 'figure'),
-     Output('media-mensal-graph', 'figure'),
-     Output('histograma-graph', 'figure'),
-     Output('scatter-graph', 'figure'),
-     Output('boxplot-graph', 'figure')],
-    Input('ano-dropdown', 'value')
-)
-def atualizar_graficos(intervalo):
-    if not intervalo:  # Se não houver intervalo selecionado
-        raise dash.exceptions.PreventUpdate
+# Com SPEI_MODO_CLIENTE=1 a série vai uma vez para o navegador e a troca de
+# intervalo é resolvida lá, sem passar pelo servidor
+if MODO_CLIENTE:
+    registrar_modo_cliente(app, spei_1, indice_spei, COLOR_PALETTE['categories'])
+else:
+    @app.callback(
+        [Output('spei-graph', 'figure'),
+         Output('barras-empilhadas-graph', 'figure'),
+         Output('media-mensal-graph', 'figure'),
+         Output('histograma-graph', 'figure'),
+         Output('scatter-graph', 'figure'),
+         Output('boxplot-graph', 'figure')],
+        Input('ano-dropdown', 'value')
+    )
+    @instrumentar('callback', 'graficos')
+    def atualizar_graficos(intervalo):
+        if not intervalo:  # Se não houver intervalo selecionado
+            raise dash.exceptions.PreventUpdate
 
-    if intervalo == '1981-2022':
-        ano_inicial, ano_final = 1981, 2022
-    else:
-        ano_inicial, ano_final = map(int, intervalo.split('-'))
+        if intervalo == '1981-2022':
+            ano_inicial, ano_final = 1981, 2022
+        else:
+            ano_inicial, ano_final = map(int, intervalo.split('-'))
 
-    spei_filtrado = filtrar_por_ano(spei_1, ano_inicial, ano_final)
-    categorias = spei_filtrado.apply(categorizar_spei)
-    dados_ano = spei_filtrado.groupby(spei_filtrado.index.year).apply(lambda x: x.apply(categorizar_spei).value_counts(normalize=True) * 100).unstack(fill_value=0)
+        spei_filtrado = filtrar_por_ano(spei_1, ano_inicial, ano_final)
 
-    # [The rest of the graph creation code remains the same as in the previous script]
-    # ... (copy the graph creation code from the previous script)
+        # [The rest of the graph creation code remains the same as in the previous script]
+        # ... (copy the graph creation code from the previous script)
 
 if __name__ == "__main__":
     app.run_server(debug=True, host='127.0.0.1', port=int(os.environ.get('PORT', 8050)))
\ No newline at end of file
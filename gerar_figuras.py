@@ -0,0 +1,52 @@
+"""Gera todas as figuras estáticas da dissertação de uma vez.
+
+Os scripts de SCRIPTS_FIGURAS rodam em um único processo: as planilhas e o
+SPEI são lidos e calculados uma vez só, e as imagens são gravadas no fim por
+um kaleido aquecido em cada processo do pool (um por núcleo, por padrão).
+
+A construção é incremental (ver construir_figuras): só rodam os scripts cujo
+código ou planilhas mudaram e só são exportadas as imagens cuja figura mudou.
+--forcar refaz tudo.
+
+Uso: python gerar_figuras.py [--processos N] [--destino pasta] [--forcar] [--listar] [script ...]
+"""
+import argparse
+import os
+import time
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from processamento import SCRIPTS_FIGURAS, arquivos_finais, coletar_figuras, construir_figuras
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera as figuras estáticas da dissertação.')
+    parser.add_argument('scripts', nargs='*', help='scripts a rodar (padrão: todos)')
+    parser.add_argument('--processos', type=int, help='processos de exportação (padrão: núcleos da máquina)')
+    parser.add_argument('--destino', help='pasta das imagens (padrão: a de cada script)')
+    parser.add_argument('--forcar', action='store_true', help='ignora o manifesto e refaz todas as figuras')
+    parser.add_argument('--listar', action='store_true', help='só monta as figuras e lista os arquivos')
+    args = parser.parse_args()
+    scripts = args.scripts or SCRIPTS_FIGURAS
+
+    if not args.listar:
+        inicio = time.perf_counter()
+        construcao = construir_figuras(scripts, args.processos, args.destino, forcar=args.forcar)
+        print(f"{len(construcao['executados'])} de {len(scripts)} scripts executados, "
+              f"{len(construcao['exportadas'])} imagens gravadas em {time.perf_counter() - inicio:.2f} s")
+        for arquivo in construcao['exportadas']:
+            print(f'  {arquivo}')
+        return
+
+    inicio = time.perf_counter()
+    figuras = coletar_figuras(scripts, destino=args.destino)
+    montagem = time.perf_counter() - inicio
+    finais = {id(figura) for figura in arquivos_finais(figuras)}
+    print(f'{len(figuras)} figuras montadas em {montagem:.2f} s ({len(finais)} arquivos)')
+    for figura in figuras:
+        substituida = '' if id(figura) in finais else '  (substituída por um script posterior)'
+        print(f"  {figura['script']} -> {figura['arquivo']}{substituida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,6 @@
 import pandas as pd
-import spei as si
 import plotly.graph_objs as go
-
-# Função para extrair dados (com base no seu código)
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    # Leitura dos arquivos ETP e PRP
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-    
-    # Mesclando as duas tabelas pelo campo 'data'
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-    
-    # Calculando o balanço hídrico acumulado
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-    
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-    
-    return df_preparado
+from processamento import extrair_dados, spei_em_cache
 
 # Caminhos dos arquivos de ETP e PRP
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
@@ -32,7 +8,7 @@ file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
 
 # Extração dos dados e cálculo do SPEI
 dados_1 = extrair_dados(file_path_etp, file_path_prp, acumulado=1)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
+spei_1 = spei_em_cache(dados_1['dados'])
 
 # A série temporal de datas do DataFrame de entrada
 datas = dados_1.index
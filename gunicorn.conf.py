@@ -0,0 +1,47 @@
+# Configuração de produção: gunicorn -c gunicorn.conf.py wsgi:server
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 8050)}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# Carrega planilhas, SPEI e figuras uma vez no mestre; os workers herdam a
+# memória por copy-on-write
+preload_app = True
+
+# Métricas (SPEI_METRICAS=1): cada worker grava o seu registro neste diretório e
+# /metrics, em qualquer worker, soma todos. Definido antes da carga do app,
+# que lê a variável ao importar processamento.metricas; um por servidor
+os.environ.setdefault('SPEI_METRICAS_DIR', os.path.join(tempfile.gettempdir(), f'spei_metricas_{os.getpid()}'))
+
+# Arquivo criado quando o mestre terminou a carga (para orquestradores que
+# verificam prontidão pelo sistema de arquivos); a rota /pronto cobre o HTTP
+arquivo_pronto = os.environ.get('SPEI_ARQUIVO_PRONTO')
+
+
+def on_starting(server):
+    from processamento import metricas
+    metricas.limpar_registros()
+
+
+def when_ready(server):
+    server.log.info('Dados do SPEI carregados no mestre; iniciando os workers')
+    # O que o mestre mediu na carga entra uma vez só, no registro dele
+    from processamento import metricas
+    metricas.gravar_registro()
+    if arquivo_pronto:
+        with open(arquivo_pronto, 'w') as arquivo:
+            arquivo.write(str(os.getpid()))
+
+
+def post_fork(server, worker):
+    from processamento import metricas
+    metricas.iniciar_worker()
+
+
+def on_exit(server):
+    if arquivo_pronto and os.path.exists(arquivo_pronto):
+        os.remove(arquivo_pronto)
+    shutil.rmtree(os.environ['SPEI_METRICAS_DIR'], ignore_errors=True)
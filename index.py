@@ -1,53 +1,19 @@
 import dash
 import os
 from dash import Input, Output, dcc, html
-import spei as si
 import pandas as pd
 import plotly.graph_objs as go
 import dash_bootstrap_components as dbc
+from processamento import balanco_hidrico, carregar_conjunto, etp_prp, spei_em_cache
 
-# Função para extrair dados (sem alterações)
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-
-    return df_preparado
-
-# Função para extrair dados somente de ETP e precipitação (sem alterações)
-def extrair_etp_prp(path_etp, path_prp):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'ETP'})
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'Precipitação'})
-
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-
-    df_etp['data'] = pd.to_datetime(df_etp['data'], format='%Y-%m-%d')
-    df_prp['data'] = pd.to_datetime(df_prp['data'], format='%Y-%m-%d')
-
-    df_merged = pd.merge(df_etp, df_prp, on='data', how='inner')
-    df_merged.set_index('data', inplace=True)
-
-    return df_merged
-
-# Caminhos dos arquivos (sem alterações)
+# Caminhos dos arquivos
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
 file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
-
-# Extração dos dados e cálculo do SPEI (sem alterações)
-dados_1 = extrair_dados(file_path_etp, file_path_prp, 1)
-df_etp_prp = extrair_etp_prp(file_path_etp, file_path_prp)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
\ No newline at end of file
+file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
+
+# Extração dos dados e cálculo do SPEI: cada planilha é lida uma única vez e o
+# balanço hídrico e a visão ETP/Precipitação derivam do mesmo frame
+conjunto = carregar_conjunto(file_path_etp, file_path_prp, file_path_tmax)
+dados_1 = balanco_hidrico(conjunto, 1)
+df_etp_prp = etp_prp(conjunto)
+spei_1 = spei_em_cache(dados_1['dados'])
\ No newline at end of file
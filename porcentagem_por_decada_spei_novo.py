@@ -1,49 +1,6 @@
 import pandas as pd
-import spei as si
 import plotly.graph_objs as go
-
-# Função de categorização de SPEI
-def categorizar_spei(spei_value):
-    if spei_value >= 2.00:
-        return 'Umidade extrema'
-    elif 1.50 <= spei_value < 2.00:
-        return 'Umidade severa'
-    elif 1.00 <= spei_value < 1.50:
-        return 'Umidade moderada'
-    elif 0 <= spei_value < 1.00:
-        return 'Umidade fraca'
-    elif -0.99 <= spei_value < 0:
-        return 'Seca fraca'
-    elif -1.50 <= spei_value < -1.00:
-        return 'Seca moderada'
-    elif -1.99 <= spei_value < -1.50:
-        return 'Seca severa'
-    else:
-        return 'Seca extrema'
-
-# Função para extrair os dados e calcular o balanço hídrico
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    # Leitura dos arquivos ETP e PRP
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-    
-    # Mesclando as duas tabelas pelo campo 'data'
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-    
-    # Calculando o balanço hídrico acumulado
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-    
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-    
-    return df_preparado
+from processamento import DECADAS, agregar_intervalos, extrair_dados, intervalos_anuais, spei_em_cache
 
 # Caminhos dos arquivos de ETP e PRP
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
@@ -51,45 +8,19 @@ file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
 
 # Extração dos dados e cálculo do SPEI
 dados_1 = extrair_dados(file_path_etp, file_path_prp, acumulado=1)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
-
-# Categorizar os valores de SPEI e criar uma coluna com as categorias
-categorias = [categorizar_spei(spei) for spei in spei_1]
-df_spei = pd.DataFrame({'SPEI': spei_1, 'Categoria': categorias})
-df_spei['data'] = dados_1.index
+spei_1 = spei_em_cache(dados_1['dados'])
 
 # Definir os intervalos de tempo
-intervalos = [(1981, 1990), (1991, 2000), (2001, 2010), (2011, 2020)]
+intervalos = DECADAS
 
 # Função para calcular a porcentagem de cada categoria por intervalo
-def calcular_porcentagem_por_intervalo(df, intervalos):
-    # Lista de todas as categorias
-    categorias = ['Umidade extrema', 'Umidade severa', 'Umidade moderada', 'Umidade fraca', 
-                  'Seca fraca', 'Seca moderada', 'Seca severa', 'Seca extrema']
-    
-    porcentagens = []
-    
-    for inicio, fim in intervalos:
-        # Filtra os dados para o intervalo
-        df_intervalo = df[(df['data'].dt.year >= inicio) & (df['data'].dt.year <= fim)]
-        
-        # Conta a ocorrência de cada categoria
-        contagem_categorias = df_intervalo['Categoria'].value_counts(normalize=True) * 100
-        
-        # Preenche as categorias ausentes com 0%
-        for categoria in categorias:
-            if categoria not in contagem_categorias:
-                contagem_categorias[categoria] = 0
-        
-        # Adiciona o intervalo e as porcentagens à lista
-        porcentagens.append({'Intervalo': f'{inicio}-{fim}', **contagem_categorias.to_dict()})
-    
-    # Converte a lista em DataFrame
-    df_porcentagens = pd.DataFrame(porcentagens)
-    return df_porcentagens
+def calcular_porcentagem_por_intervalo(spei, intervalos):
+    porcentagens = agregar_intervalos(spei, *intervalos_anuais(intervalos), categorias='spei')['porcentagem']
+    df = porcentagens.unstack('categoria').rename_axis(index='Intervalo', columns=None)
+    return df.reset_index().astype({'Intervalo': str})
 
 # Calcular a porcentagem de cada categoria para os intervalos definidos
-df_porcentagens = calcular_porcentagem_por_intervalo(df_spei, intervalos)
+df_porcentagens = calcular_porcentagem_por_intervalo(spei_1, intervalos)
 
 # Exemplo de como você pode visualizar a tabela de porcentagens por intervalo
 print(df_porcentagens)
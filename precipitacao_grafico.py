@@ -3,22 +3,7 @@ from dash import Input, Output, dcc, html
 import pandas as pd
 import plotly.graph_objs as go
 import dash_bootstrap_components as dbc
-
-# Função para extrair dados de precipitação (sem alterações)
-def extrair_etp_prp(path_etp, path_prp):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'ETP'})
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'Precipitação'})
-
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-
-    df_etp['data'] = pd.to_datetime(df_etp['data'], format='%Y-%m-%d')
-    df_prp['data'] = pd.to_datetime(df_prp['data'], format='%Y-%m-%d')
-
-    df_merged = pd.merge(df_etp, df_prp, on='data', how='inner')
-    df_merged.set_index('data', inplace=True)
-
-    return df_merged
+from processamento import climatologia, extrair_etp_prp
 
 # Caminhos dos arquivos (sem alterações)
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
@@ -32,7 +17,7 @@ df_etp_prp['mes'] = df_etp_prp.index.month
 df_etp_prp['ano'] = df_etp_prp.index.year
 
 # Calculando a média de precipitação por mês (para o período total)
-media_mensal = df_etp_prp.groupby('mes')['Precipitação'].mean()
+media_mensal = climatologia(df_etp_prp['Precipitação'], ('media',))['media']
 
 # Preparar os dados para o gráfico
 meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
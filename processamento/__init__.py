@@ -0,0 +1,37 @@
+"""Rotinas compartilhadas de leitura e processamento dos dados TerraClimate."""
+
+from .cache import ler_planilha, limpar_cache
+from .csv_br import ler_csv_br
+from .conjunto import balanco_hidrico, carregar_conjunto, etp_prp
+from .multiescala import ESCALAS_PADRAO, acumular_balanco, calcular_spei_multiescala
+from .categorias import CATEGORIAS_SPEI, LIMITES_SPEI, categorizar_spei, codigos_spei
+from .referencia import (
+    PERIODO_REFERENCIA_PADRAO,
+    ajustar_parametros,
+    aplicar_parametros,
+    atualizar_spei,
+    carregar_parametros,
+    congelar_parametros,
+)
+from .calculo import calcular_spei
+from .reducao import PONTOS_GRAFICO, indices_lttb, indices_minmax, reduzir_serie
+from .caixas import estatisticas_caixa, estatisticas_mensais_por_periodo, tracos_caixa
+from .histograma import BORDAS_HISTOGRAMA, contar_histograma, traco_histograma
+from .indice import (
+    IndiceAnual,
+    construir_indice,
+    contagens_intervalo,
+    porcentagens_intervalo,
+    porcentagens_por_ano,
+    resumo_intervalo,
+)
+from .cache_spei import chave_spei, spei_em_cache
+from .lote import acumular_lote, calcular_spei_lote
+from .metricas import METRICAS_ATIVAS, instrumentar, medir_etapa, registrar_cache, registrar_metricas
+from .sintetico import ESCALAS_SINTETICAS, gerar_series, gravar_conjunto
+from .renderizacao import SCRIPTS_FIGURAS, arquivos_finais, coletar_figuras, exportar_figuras
+from .construcao import MANIFESTO_FIGURAS, construir_figuras
+from .climatologia import ESTATISTICAS_CLIMATOLOGIA, climatologia
+from .intervalos import DECADAS, agregar_intervalos, intervalos_anuais
+from .eventos import COLUNAS_EVENTOS, LIMIAR_SECA, detectar_eventos, formatar_eventos, traco_eventos
+from .extracao import extrair_dados, extrair_etp_prp, extrair_tmax
@@ -0,0 +1,130 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from .csv_br import ler_serie_csv_br
+
+# Versão do formato gravado no cache; incrementar invalida todos os arquivos antigos
+VERSAO_CACHE = 1
+
+# Diretório do cache: por padrão uma pasta .cache ao lado da planilha de origem
+DIRETORIO_CACHE = os.environ.get('SPEI_CACHE_DIR')
+
+
+def hash_conteudo(caminho, tamanho_bloco=1 << 20):
+    """Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def caminho_cache(caminho):
+    """Retorna o arquivo .npz do cache correspondente a uma planilha de origem."""
+    caminho = os.path.abspath(caminho)
+    diretorio = DIRETORIO_CACHE or os.path.join(os.path.dirname(caminho), '.cache')
+    chave = hashlib.sha1(caminho.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(diretorio, f'{os.path.basename(caminho)}.{chave}.npz')
+
+
+def _ler_excel_terraclimate(caminho):
+    # Layout exportado pelo TerraClimate: cabeçalho com o nome da variável,
+    # uma linha de descrição e depois pares (data, valor)
+    df = pd.read_excel(caminho)
+    titulo = df.columns[0]
+    descricao = df.iloc[0, 0] if len(df) else ''
+    df = df.iloc[1:]
+    datas = pd.to_datetime(df.iloc[:, 0], format='%Y-%m-%d').to_numpy(dtype='datetime64[ns]')
+    valores = pd.to_numeric(df.iloc[:, 1]).to_numpy(dtype='float64')
+    return titulo, str(descricao), datas, valores
+
+
+def _ler_fonte(caminho):
+    # Planilhas xlsx/xls usam o layout do TerraClimate; CSVs seguem o formato 'data;valor' brasileiro
+    if os.path.splitext(caminho)[1].lower() == '.csv':
+        return ler_serie_csv_br(caminho)
+    return _ler_excel_terraclimate(caminho)
+
+
+def _ler_cache(arquivo_cache):
+    try:
+        with np.load(arquivo_cache, allow_pickle=False) as npz:
+            if int(npz['versao']) != VERSAO_CACHE:
+                return None
+            return {nome: npz[nome] for nome in npz.files}
+    except (OSError, ValueError, KeyError):
+        # Arquivo ausente, truncado ou de outro formato: trata como falta no cache
+        return None
+
+
+def _gravar_cache(arquivo_cache, **campos):
+    os.makedirs(os.path.dirname(arquivo_cache), exist_ok=True)
+    temporario = f'{arquivo_cache}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        np.savez(arquivo, versao=VERSAO_CACHE, **campos)
+    # Substituição atômica para que outro processo nunca leia um cache pela metade
+    os.replace(temporario, arquivo_cache)
+
+
+def _montar_frame(titulo, descricao, datas, valores):
+    df = pd.DataFrame({'data': datas, 'valor': valores})
+    df.attrs['titulo'] = str(titulo)
+    df.attrs['descricao'] = str(descricao)
+    return df
+
+
+def ler_planilha(caminho, usar_cache=True):
+    """Lê uma série TerraClimate (data, valor) servindo do cache colunar quando possível.
+
+    Aceita as planilhas xlsx/xls exportadas pelo TerraClimate e os CSVs
+    'AAAA-MM-DD;256,00' de uma estação (ver csv_br.ler_csv_br).
+
+    O cache é validado pelo caminho, mtime e tamanho do arquivo; se o mtime
+    mudou mas o conteúdo (SHA-256) é o mesmo, o cache é reaproveitado.
+    Retorna um DataFrame com as colunas 'data' (datetime64) e 'valor' (float64).
+    """
+    if not usar_cache:
+        return _montar_frame(*_ler_fonte(caminho))
+
+    estado = os.stat(caminho)
+    arquivo_cache = caminho_cache(caminho)
+    cache = _ler_cache(arquivo_cache)
+
+    if cache is not None:
+        if int(cache['mtime_ns']) == estado.st_mtime_ns and int(cache['tamanho']) == estado.st_size:
+            return _montar_frame(cache['titulo'], cache['descricao'], cache['datas'], cache['valores'])
+
+        conteudo = hash_conteudo(caminho)
+        if str(cache['sha256']) == conteudo:
+            # Arquivo apenas "tocado": atualiza os metadados sem reprocessar a planilha
+            cache['mtime_ns'] = estado.st_mtime_ns
+            cache['tamanho'] = estado.st_size
+            cache.pop('versao')
+            _gravar_cache(arquivo_cache, **cache)
+            return _montar_frame(cache['titulo'], cache['descricao'], cache['datas'], cache['valores'])
+    else:
+        conteudo = hash_conteudo(caminho)
+
+    titulo, descricao, datas, valores = _ler_fonte(caminho)
+    _gravar_cache(
+        arquivo_cache,
+        titulo=np.array(titulo),
+        descricao=np.array(descricao),
+        datas=datas,
+        valores=valores,
+        mtime_ns=np.array(estado.st_mtime_ns, dtype='int64'),
+        tamanho=np.array(estado.st_size, dtype='int64'),
+        sha256=np.array(conteudo),
+    )
+    return _montar_frame(titulo, descricao, datas, valores)
+
+
+def limpar_cache(caminho):
+    """Remove o cache de uma planilha, se existir."""
+    try:
+        os.remove(caminho_cache(caminho))
+    except FileNotFoundError:
+        pass
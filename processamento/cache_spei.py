@@ -0,0 +1,78 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import scipy
+import spei as si
+from scipy.stats import fisk
+
+from .calculo import calcular_spei
+
+# Diretório dos resultados de SPEI; segue SPEI_CACHE_DIR quando definido
+DIRETORIO_CACHE_SPEI = os.path.join(
+    os.environ.get('SPEI_CACHE_DIR') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados', '.cache'),
+    'spei',
+)
+
+# Tamanho máximo do cache; os resultados usados há mais tempo são removidos primeiro
+LIMITE_CACHE_SPEI = int(float(os.environ.get('SPEI_CACHE_LIMITE_MB', 256)) * 1024 * 1024)
+
+
+def chave_spei(balanco, escala=1, dist=fisk, periodo_referencia=None):
+    """Hash que identifica um resultado de SPEI: dados de entrada, escala,
+    distribuição, período de referência e versões do spei/scipy (que mudam o ajuste)."""
+    sha = hashlib.sha256()
+    sha.update(pd.DatetimeIndex(balanco.index).asi8.tobytes())
+    sha.update(np.ascontiguousarray(balanco.to_numpy(dtype='float64')).tobytes())
+    sha.update(repr((escala, getattr(dist, 'name', repr(dist)), periodo_referencia)).encode('utf-8'))
+    sha.update(f'spei={si.__version__};scipy={scipy.__version__}'.encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _podar_cache(diretorio, limite_bytes):
+    # LRU por tamanho: o mtime de cada arquivo é atualizado a cada acerto
+    arquivos = []
+    for entrada in os.scandir(diretorio):
+        if entrada.name.endswith('.npz'):
+            estado = entrada.stat()
+            arquivos.append((estado.st_mtime_ns, estado.st_size, entrada.path))
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite_bytes:
+            break
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+
+
+def spei_em_cache(balanco, escala=1, dist=fisk, periodo_referencia=None,
+                  diretorio=None, limite_bytes=None):
+    """Versão memoizada em disco de calcular_spei.
+
+    Um segundo processo (ou um worker reiniciado) com a mesma entrada recebe a
+    série idêntica bit a bit, sem reajustar a distribuição.
+    """
+    diretorio = diretorio or DIRETORIO_CACHE_SPEI
+    limite_bytes = LIMITE_CACHE_SPEI if limite_bytes is None else limite_bytes
+    arquivo = os.path.join(diretorio, chave_spei(balanco, escala, dist, periodo_referencia) + '.npz')
+
+    try:
+        with np.load(arquivo, allow_pickle=False) as npz:
+            resultado = pd.Series(npz['valores'], index=pd.DatetimeIndex(npz['datas'], name=balanco.index.name), dtype=float)
+        os.utime(arquivo)
+        return resultado
+    except (OSError, ValueError, KeyError):
+        pass
+
+    resultado = calcular_spei(balanco, escala, dist, periodo_referencia)
+
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = f'{arquivo}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as saida:
+        np.savez(saida, datas=resultado.index.to_numpy(dtype='datetime64[ns]'), valores=resultado.to_numpy(dtype='float64'))
+    os.replace(temporario, arquivo)
+    _podar_cache(diretorio, limite_bytes)
+    return resultado
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+# Estatísticas numéricas de cada caixa, na ordem do DataFrame de estatisticas_caixa
+COLUNAS_CAIXA = ('n', 'q1', 'mediana', 'q3', 'limite_inferior', 'limite_superior', 'media', 'desvio_padrao')
+
+
+def _quantil_ordenado(ordenados, inicio, n, p):
+    # Método #10 de Langford (posição n*p + 0.5, interpolação linear), o mesmo
+    # que o plotly.js usa com quartilemethod='linear'
+    posicao = np.clip(n * p + 0.5, 1, n) - 1
+    abaixo = np.floor(posicao).astype('int64')
+    acima = np.minimum(abaixo + 1, n - 1)
+    fracao = posicao - abaixo
+    return ordenados[inicio + abaixo] * (1 - fracao) + ordenados[inicio + acima] * fracao
+
+
+# Função para calcular as estatísticas de boxplot de todos os grupos de uma vez
+def estatisticas_caixa(valores, grupos):
+    """Quartis, bigodes, média, desvio padrão e outliers por grupo, em uma única passada.
+
+    'valores' e 'grupos' têm o mesmo tamanho (por exemplo o SPEI e o ano ou o
+    mês de cada valor); NaN é ignorado. Os bigodes vão até o valor mais
+    extremo dentro de 1,5 x IQR, como no plotly. O desvio padrão é o
+    populacional, o mesmo que o plotly.js calcula com boxmean='sd'.
+    Retorna um DataFrame indexado pelo grupo, com a lista de outliers na
+    coluna 'outliers'.
+    """
+    valores = np.asarray(valores, dtype='float64')
+    grupos = np.asarray(grupos)
+    validos = ~np.isnan(valores)
+    valores, grupos = valores[validos], grupos[validos]
+    if len(valores) == 0:
+        # Nenhum valor (anos sem dados): sem grupos, e o reduceat abaixo não aceita vazio
+        vazio = pd.DataFrame(np.empty((0, len(COLUNAS_CAIXA))), columns=list(COLUNAS_CAIXA), index=pd.Index(grupos, name='grupo'))
+        return vazio.astype({'n': 'int64'}).assign(outliers=pd.Series(dtype=object))
+
+    rotulos, codigos = np.unique(grupos, return_inverse=True)
+    ordem = np.lexsort((valores, codigos))
+    ordenados, codigos = valores[ordem], codigos[ordem]
+    n = np.bincount(codigos, minlength=len(rotulos))
+    inicio = np.concatenate(([0], np.cumsum(n)[:-1]))
+
+    q1 = _quantil_ordenado(ordenados, inicio, n, 0.25)
+    mediana = _quantil_ordenado(ordenados, inicio, n, 0.5)
+    q3 = _quantil_ordenado(ordenados, inicio, n, 0.75)
+    media = np.bincount(codigos, weights=ordenados) / n
+    desvio = np.sqrt(np.bincount(codigos, weights=(ordenados - media[codigos]) ** 2) / n)
+
+    iqr = q3 - q1
+    dentro = (ordenados >= (q1 - 1.5 * iqr)[codigos]) & (ordenados <= (q3 + 1.5 * iqr)[codigos])
+    limite_inferior = np.fmin.reduceat(np.where(dentro, ordenados, np.nan), inicio)
+    limite_superior = np.fmax.reduceat(np.where(dentro, ordenados, np.nan), inicio)
+    outliers = np.split(np.where(dentro, np.nan, ordenados), inicio[1:])
+
+    return pd.DataFrame({
+        'n': n,
+        'q1': q1,
+        'mediana': mediana,
+        'q3': q3,
+        'limite_inferior': limite_inferior,
+        'limite_superior': limite_superior,
+        'media': media,
+        'desvio_padrao': desvio,
+        'outliers': [grupo[~np.isnan(grupo)] for grupo in outliers],
+    }, index=pd.Index(rotulos, name='grupo'))
+
+
+# Função para calcular as caixas mensais de vários períodos em uma única passada
+def estatisticas_mensais_por_periodo(serie, periodos):
+    """Estatísticas de boxplot por (período, mês) de uma série mensal indexada por data.
+
+    'periodos' é uma lista de pares (ano_inicial, ano_final), inclusivos, que
+    podem se sobrepor (as décadas e 1981-2010, por exemplo). Cada período é
+    um slice da série ordenada e todos os grupos (período, mês) vão de uma
+    vez para estatisticas_caixa. Retorna o mesmo DataFrame, indexado por
+    ('periodo', 'mes'), com o período no formato 'AAAA-AAAA'.
+    """
+    serie = serie if serie.index.is_monotonic_increasing else serie.sort_index()
+    anos = serie.index.year.to_numpy()
+    meses = serie.index.month.to_numpy()
+    rotulos = [f'{inicio}-{fim}' for inicio, fim in periodos]
+
+    inicios = np.searchsorted(anos, [inicio for inicio, _ in periodos], side='left')
+    fins = np.searchsorted(anos, [fim for _, fim in periodos], side='right')
+    posicoes = np.concatenate([np.arange(i0, i1) for i0, i1 in zip(inicios, fins)])
+    periodo = np.repeat(np.arange(len(periodos)), fins - inicios)
+
+    # Código único por (período, mês), para um único agrupamento
+    estatisticas = estatisticas_caixa(serie.to_numpy(dtype='float64')[posicoes], periodo * 12 + meses[posicoes] - 1)
+    codigos = estatisticas.index.to_numpy()
+    estatisticas.index = pd.MultiIndex.from_arrays(
+        [np.asarray(rotulos, dtype=object)[codigos // 12], codigos % 12 + 1],
+        names=['periodo', 'mes'],
+    )
+    return estatisticas
+
+
+def tracos_caixa(estatisticas, nomes=None, **estilo):
+    """Um go.Box com todas as caixas a partir das estatísticas pré-calculadas.
+
+    O navegador não recebe mais as amostras, só cinco números, média e
+    desvio por caixa; os outliers vão em um go.Scatter à parte. 'nomes'
+    substitui os rótulos do eixo x (por padrão o índice de 'estatisticas');
+    'estilo' é repassado ao go.Box (marker, line, fillcolor...).
+    """
+    nomes = [str(nome) for nome in (estatisticas.index if nomes is None else nomes)]
+    caixa = go.Box(
+        x=nomes,
+        q1=estatisticas['q1'].to_numpy(),
+        median=estatisticas['mediana'].to_numpy(),
+        q3=estatisticas['q3'].to_numpy(),
+        lowerfence=estatisticas['limite_inferior'].to_numpy(),
+        upperfence=estatisticas['limite_superior'].to_numpy(),
+        mean=estatisticas['media'].to_numpy(),
+        sd=estatisticas['desvio_padrao'].to_numpy(),
+        boxmean='sd',  # Exibe a média e o desvio padrão
+        showlegend=False,
+        **estilo
+    )
+    contagem = estatisticas['outliers'].map(len).to_numpy(dtype='int64')
+    pontos = go.Scatter(
+        x=np.repeat(nomes, contagem),
+        y=np.concatenate(estatisticas['outliers'].to_list()) if contagem.sum() else [],
+        mode='markers',
+        marker=dict(color=estilo.get('marker', {}).get('color', 'gray'), size=4),
+        showlegend=False,
+        hoverinfo='y',
+    )
+    return [caixa, pontos]
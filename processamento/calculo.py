@@ -0,0 +1,25 @@
+import spei as si
+from scipy.stats import fisk
+
+from .multiescala import acumular_balanco
+from .referencia import ajustar_parametros, aplicar_parametros
+
+
+def _spei_periodo_referencia(serie, dist, periodo_referencia):
+    # Mesmo procedimento do si.spei (um ajuste por mês do calendário), mas os
+    # parâmetros vêm só dos anos do período de referência
+    return aplicar_parametros(serie, ajustar_parametros(serie, dist, periodo_referencia), dist)
+
+
+# Função para calcular o SPEI de um balanço hídrico mensal
+def calcular_spei(balanco, escala=1, dist=fisk, periodo_referencia=None):
+    """Calcula o SPEI do balanço hídrico P - ETP na escala pedida (em meses).
+
+    Com escala=1 e sem período de referência o resultado é exatamente o de
+    si.spei(balanco). 'periodo_referencia' = (ano_inicial, ano_final) restringe
+    o ajuste da distribuição a esses anos.
+    """
+    serie = balanco if escala == 1 else acumular_balanco(balanco, [escala])[escala].dropna()
+    if periodo_referencia is None:
+        return si.spei(serie, dist=dist)
+    return _spei_periodo_referencia(serie, dist, periodo_referencia)
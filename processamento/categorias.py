@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+# Classes do SPEI, da mais úmida para a mais seca; o código int8 é a posição nesta tupla
+CATEGORIAS_SPEI = (
+    'Umidade extrema',
+    'Umidade severa',
+    'Umidade moderada',
+    'Umidade fraca',
+    'Seca fraca',
+    'Seca moderada',
+    'Seca severa',
+    'Seca extrema',
+)
+
+# Limites inferiores (fechados) de cada classe, em ordem crescente. Os intervalos
+# são contíguos: [-2, -1.5) é 'Seca severa', [-1, 0) é 'Seca fraca' etc., sem as
+# lacunas de -1.00 a -0.99 e de -2.00 a -1.99 da antiga cadeia de if/elif.
+LIMITES_SPEI = np.array([-2.0, -1.5, -1.0, 0.0, 1.0, 1.5, 2.0])
+
+# Código usado para valores ausentes (NaN)
+CODIGO_AUSENTE = -1
+
+
+def codigos_spei(valores):
+    """Classifica valores de SPEI em códigos int8 (posição em CATEGORIAS_SPEI).
+
+    Aceita arrays de qualquer forma (por exemplo tempo x estações); NaN vira -1.
+    """
+    valores = np.asarray(valores, dtype='float64')
+    # Cada limite ultrapassado desce uma classe a partir de 'Seca extrema' (7);
+    # sete comparações em int8 saem bem mais baratas que searchsorted/digitize
+    codigos = np.full(valores.shape, len(LIMITES_SPEI), dtype='int8')
+    for limite in LIMITES_SPEI:
+        codigos -= (valores >= limite).view('int8')
+    codigos[np.isnan(valores)] = CODIGO_AUSENTE
+    return codigos
+
+
+# Função para categorizar o SPEI (vetorizada)
+def categorizar_spei(valores):
+    """Retorna um pandas.Categorical ordenado com a classe de cada valor de SPEI."""
+    codigos = codigos_spei(valores).ravel()
+    return pd.Categorical.from_codes(codigos, categories=list(CATEGORIAS_SPEI), ordered=True)
@@ -0,0 +1,247 @@
+import json
+import os
+
+import numpy as np
+import plotly
+from dash import Input, Output, State, dcc
+
+from .caixas import estatisticas_caixa
+from .categorias import CATEGORIAS_SPEI, codigos_spei
+from .eventos import COLUNAS_EVENTOS, formatar_eventos, traco_eventos
+from .histograma import BORDAS_HISTOGRAMA, contar_histograma
+
+# Liga o modo em que o navegador filtra os dados sem voltar ao servidor
+MODO_CLIENTE = os.environ.get('SPEI_MODO_CLIENTE', '').lower() in ('1', 'true', 'sim')
+
+# Identificador do dcc.Store com a série compacta
+ID_DADOS_CLIENTE = 'spei-dados-cliente'
+
+# Gráficos atualizados no navegador; os ids são os mesmos em testeapp.py e dados/app.py
+GRAFICOS_CLIENTE = (
+    'spei-graph',
+    'barras-empilhadas-graph',
+    'media-mensal-graph',
+    'histograma-graph',
+    'scatter-graph',
+    'boxplot-graph',
+)
+
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+
+# Função para montar a versão compacta da série que vai uma única vez para o navegador
+def _lista(valores):
+    # NaN não existe em JSON: vira null
+    return [None if np.isnan(valor) else valor for valor in np.round(np.asarray(valores, dtype='float64'), 4).tolist()]
+
+
+def _caixas_por_ano(spei, anos_indice):
+    # As mesmas caixas do boxplot do servidor (estatisticas_caixa por ano), uma
+    # posição por ano do índice; anos sem dados ficam com n = 0
+    estatisticas = estatisticas_caixa(spei.to_numpy(dtype='float64'), spei.index.year.to_numpy())
+    estatisticas = estatisticas.reindex(anos_indice)
+    caixas = {coluna: _lista(estatisticas[coluna]) for coluna in
+              ('q1', 'mediana', 'q3', 'limite_inferior', 'limite_superior', 'media', 'desvio_padrao')}
+    caixas['n'] = estatisticas['n'].fillna(0).astype('int64').tolist()
+    caixas['outliers'] = [[] if not isinstance(pontos, np.ndarray) else _lista(pontos) for pontos in estatisticas['outliers']]
+    return caixas
+
+
+def dados_para_navegador(spei, indice, cores):
+    """Série de SPEI, códigos de categoria e contagens por ano em listas JSON.
+
+    'inicio_ano' guarda a posição do primeiro mês de cada ano, de modo que o
+    filtro por intervalo no navegador é um simples slice. O histograma e o
+    boxplot vão pré-calculados por ano (contagens nas BORDAS_HISTOGRAMA e as
+    estatísticas de estatisticas_caixa), como no modo servidor; o navegador
+    só soma as contagens e escolhe as caixas do intervalo.
+    """
+    anos = spei.index.year.to_numpy()
+    brutos = spei.to_numpy(dtype='float64')
+    valores = np.round(brutos, 4)
+    # Índice sem anos (série vazia ou só NaN): um único limite, e todo intervalo fica vazio
+    limites = np.append(indice.anos, indice.anos[-1] + 1) if len(indice.anos) else np.zeros(1, dtype='int64')
+    inicio_ano = np.searchsorted(anos, limites)
+    return {
+        'ano_inicial': int(limites[0]),
+        'inicio_ano': inicio_ano.tolist(),
+        'datas': spei.index.strftime('%Y-%m-%d').tolist(),
+        'meses': spei.index.month.to_numpy().tolist(),
+        'spei': [None if np.isnan(valor) else valor for valor in valores.tolist()],
+        'codigos': codigos_spei(valores).tolist(),
+        'contagens_ano': np.diff(indice.contagens, axis=0).tolist(),
+        'bordas_histograma': BORDAS_HISTOGRAMA.tolist(),
+        'histograma_ano': [contar_histograma(brutos[i0:i1]).tolist() for i0, i1 in zip(inicio_ano[:-1], inicio_ano[1:])],
+        'caixas_ano': _caixas_por_ano(spei, indice.anos),
+        'categorias': list(CATEGORIAS_SPEI),
+        'cores': [cores[categoria] for categoria in CATEGORIAS_SPEI],
+        'nomes_meses': MESES,
+    }
+
+
+# Função para montar os eventos de seca que vão junto com a série
+def eventos_para_navegador(eventos, cores):
+    """Eventos de seca (saída de detectar_eventos) com o traço e as linhas da tabela já prontos.
+
+    O navegador só escolhe os eventos que tocam o intervalo (pelos anos de
+    início e fim) e reordena as linhas pela severidade, como o modo servidor.
+    """
+    return {
+        'ano_inicio': eventos['inicio'].dt.year.tolist(),
+        'ano_fim': eventos['fim'].dt.year.tolist(),
+        'severidade': eventos['severidade'].tolist(),
+        # Listas JSON simples (datas em texto), que o navegador filtra posição a posição
+        'traco': json.loads(json.dumps(traco_eventos(eventos, cores).to_plotly_json(), cls=plotly.utils.PlotlyJSONEncoder)),
+        'colunas': list(COLUNAS_EVENTOS.values()),
+        'linhas': formatar_eventos(eventos).to_numpy().tolist(),
+    }
+
+
+# Trecho comum: converte o valor do dropdown em posições [i0, i1) da série
+_JS_PERIODO = '''
+    if (!intervalo || !dados) { return window.dash_clientside.no_update; }
+    var anos = intervalo.split('-').map(Number);
+    var n = dados.inicio_ano.length - 1;
+    var a0 = Math.min(Math.max(anos[0] - dados.ano_inicial, 0), n);
+    var a1 = Math.min(Math.max(anos[1] - dados.ano_inicial + 1, a0), n);
+    var i0 = dados.inicio_ano[a0], i1 = dados.inicio_ano[a1];
+    var layout = (figura && figura.layout) || {};
+'''
+
+_JS_TRACOS = {
+    'spei-graph': '''
+    var tracos = [{type: 'scatter', mode: 'lines', x: dados.datas.slice(i0, i1), y: dados.spei.slice(i0, i1),
+                   name: 'SPEI de ' + anos[0] + ' a ' + (anos[1] + 1), line: {color: 'gray', width: 2}}];
+''',
+    'barras-empilhadas-graph': '''
+    var contagens = dados.contagens_ano.slice(a0, a1), x = [], totais = [];
+    contagens.forEach(function(linha, i) {
+        var total = linha.reduce(function(a, b) { return a + b; }, 0);
+        if (total > 0) { x.push(dados.ano_inicial + a0 + i); totais.push([linha, total]); }
+    });
+    var tracos = dados.categorias.map(function(categoria, c) {
+        return {type: 'bar', x: x, y: totais.map(function(t) { return t[0][c] / t[1] * 100; }),
+                name: categoria, marker: {color: dados.cores[c]}};
+    });
+''',
+    'media-mensal-graph': '''
+    var soma = new Array(12).fill(0), conta = new Array(12).fill(0);
+    for (var i = i0; i < i1; i++) {
+        if (dados.spei[i] !== null) { soma[dados.meses[i] - 1] += dados.spei[i]; conta[dados.meses[i] - 1] += 1; }
+    }
+    var tracos = [{type: 'bar', x: dados.nomes_meses, y: soma.map(function(s, m) { return conta[m] ? s / conta[m] : null; }),
+                   name: 'Média Mensal de SPEI', marker: {color: 'gray', opacity: 0.7}}];
+''',
+    'histograma-graph': '''
+    // Soma as contagens dos anos e, como traco_histograma, deixa de fora as classes vazias das pontas
+    var bordas = dados.bordas_histograma, contagens = new Array(bordas.length - 1).fill(0);
+    dados.histograma_ano.slice(a0, a1).forEach(function(linha) {
+        linha.forEach(function(c, k) { contagens[k] += c; });
+    });
+    var k0 = contagens.findIndex(function(c) { return c > 0; }), k1 = k0;
+    contagens.forEach(function(c, k) { if (c > 0) { k1 = k + 1; } });
+    var x = [], y = [], larguras = [];
+    for (var k = Math.max(k0, 0); k < k1; k++) {
+        larguras.push(bordas[k + 1] - bordas[k]);
+        x.push(bordas[k] + larguras[larguras.length - 1] / 2);
+        y.push(contagens[k]);
+    }
+    var tracos = [{type: 'bar', x: x, y: y, width: larguras, marker: {color: 'gray', opacity: 0.75}}];
+''',
+    'scatter-graph': '''
+    var tracos = [{type: 'scatter', mode: 'markers', x: dados.datas.slice(i0, i1), y: dados.spei.slice(i0, i1),
+                   marker: {color: 'gray', size: 7, opacity: 0.8}}];
+''',
+    'boxplot-graph': '''
+    // Caixas pré-calculadas por ano, desenhadas como em tracos_caixa (go.Box + outliers à parte)
+    var c = dados.caixas_ano, nomes = [], xo = [], yo = [];
+    var campos = ['q1', 'mediana', 'q3', 'limite_inferior', 'limite_superior', 'media', 'desvio_padrao'], v = {};
+    campos.forEach(function(campo) { v[campo] = []; });
+    for (var a = a0; a < a1; a++) {
+        if (!c.n[a]) { continue; }
+        var nome = String(dados.ano_inicial + a);
+        nomes.push(nome);
+        campos.forEach(function(campo) { v[campo].push(c[campo][a]); });
+        c.outliers[a].forEach(function(valor) { xo.push(nome); yo.push(valor); });
+    }
+    var tracos = [
+        {type: 'box', x: nomes, q1: v.q1, median: v.mediana, q3: v.q3, lowerfence: v.limite_inferior,
+         upperfence: v.limite_superior, mean: v.media, sd: v.desvio_padrao, boxmean: 'sd', showlegend: false,
+         marker: {color: 'gray'}},
+        {type: 'scatter', x: xo, y: yo, mode: 'markers', marker: {color: 'gray', size: 4}, showlegend: false, hoverinfo: 'y'}
+    ];
+''',
+}
+
+
+# Eventos que tocam o intervalo: posições em 'sel', na ordem cronológica
+_JS_EVENTOS = '''
+    var ev = dados.eventos, sel = [];
+    ev.ano_inicio.forEach(function(ano, i) { if (ev.ano_fim[i] >= anos[0] && ano <= anos[1]) { sel.push(i); } });
+    function escolher(lista) { return sel.map(function(i) { return lista[i]; }); }
+'''
+
+_JS_GRAFICO_EVENTOS = '''
+    var t = ev.traco;
+    var tracos = [Object.assign({}, t, {
+        x: escolher(t.x), y: escolher(t.y), width: escolher(t.width), customdata: escolher(t.customdata),
+        marker: Object.assign({}, t.marker, {color: escolher(t.marker.color)}), type: 'bar'
+    })];
+    return {data: tracos, layout: layout};
+'''
+
+# Mesmo componente que dbc.Table.from_dataframe monta no servidor
+_JS_TABELA_EVENTOS = '''
+    function html(tipo, filhos, props) {
+        return {type: tipo, namespace: 'dash_html_components', props: Object.assign({children: filhos}, props || {})};
+    }
+    if (!sel.length) { return html('P', 'Nenhum evento de seca no intervalo.', {style: {margin: '10px 0'}}); }
+    // Os mais severos primeiro; o sort do JS é estável, como o kind='stable' do servidor
+    sel.sort(function(i, j) { return ev.severidade[j] - ev.severidade[i]; });
+    var cabecalho = html('Thead', [html('Tr', ev.colunas.map(function(coluna) { return html('Th', coluna, {colSpan: 1}); }))]);
+    var corpo = html('Tbody', escolher(ev.linhas).map(function(linha) {
+        return html('Tr', linha.map(function(valor) { return html('Td', valor); }));
+    }));
+    return {type: 'Table', namespace: 'dash_bootstrap_components',
+            props: {children: [cabecalho, corpo], striped: true, hover: true, size: 'sm', style: {fontSize: '13px'}}};
+'''
+
+
+def registrar_modo_cliente(app, spei, indice, cores, eventos=None):
+    """Acrescenta o dcc.Store ao layout do app e registra callbacks clientside para os seis gráficos.
+
+    A série vai para o navegador junto com a página; trocar o intervalo no
+    ano-dropdown não gera mais requisições ao servidor. Os callbacks mantêm o
+    layout atual de cada gráfico e só substituem os traços. Com 'eventos'
+    (saída de detectar_eventos), o gráfico 'eventos-graph' e a tabela
+    'eventos-tabela' também são filtrados no navegador.
+    """
+    dados = dados_para_navegador(spei, indice, cores)
+    if eventos is not None:
+        dados['eventos'] = eventos_para_navegador(eventos, cores)
+    app.layout.children.append(dcc.Store(id=ID_DADOS_CLIENTE, data=dados))
+    for id_grafico in GRAFICOS_CLIENTE:
+        app.clientside_callback(
+            'function(intervalo, dados, figura) {' + _JS_PERIODO + _JS_TRACOS[id_grafico]
+            + '    return {data: tracos, layout: layout};\n}',
+            Output(id_grafico, 'figure'),
+            Input('ano-dropdown', 'value'),
+            State(ID_DADOS_CLIENTE, 'data'),
+            State(id_grafico, 'figure'),
+        )
+    if eventos is None:
+        return
+    app.clientside_callback(
+        'function(intervalo, dados, figura) {' + _JS_PERIODO + _JS_EVENTOS + _JS_GRAFICO_EVENTOS + '}',
+        Output('eventos-graph', 'figure'),
+        Input('ano-dropdown', 'value'),
+        State(ID_DADOS_CLIENTE, 'data'),
+        State('eventos-graph', 'figure'),
+    )
+    app.clientside_callback(
+        # 'figura' fica indefinida: a tabela não tem layout a preservar
+        'function(intervalo, dados, figura) {' + _JS_PERIODO + _JS_EVENTOS + _JS_TABELA_EVENTOS + '}',
+        Output('eventos-tabela', 'children'),
+        Input('ano-dropdown', 'value'),
+        State(ID_DADOS_CLIENTE, 'data'),
+    )
@@ -0,0 +1,155 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Estatísticas disponíveis, além dos percentis ('p10', 'p90'...)
+ESTATISTICAS_CLIMATOLOGIA = ('n', 'minimo', 'maximo', 'media', 'desvio_padrao', 'soma')
+
+# Resultados guardados em memória, compartilhados por scripts e apps no mesmo processo
+LIMITE_CACHE_CLIMATOLOGIA = 64
+_cache = OrderedDict()
+
+
+def _chave(dados, *parametros):
+    sha = hashlib.sha256()
+    sha.update(pd.DatetimeIndex(dados.index).asi8.tobytes())
+    sha.update(np.ascontiguousarray(dados.to_numpy(dtype='float64')).tobytes())
+    sha.update(repr((getattr(dados, 'name', None), list(getattr(dados, 'columns', [])), parametros)).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _reduzir(blocos, inicio, estatisticas, percentis):
+    # 'blocos' tem as linhas agrupadas (um grupo após o outro) e uma coluna por série
+    ausentes = np.isnan(blocos)
+    n = np.add.reduceat(~ausentes, inicio, axis=0)
+    soma = np.add.reduceat(np.where(ausentes, 0.0, blocos), inicio, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = soma / n
+        resultado = {'n': n, 'soma': soma, 'media': media}
+        if 'minimo' in estatisticas:
+            resultado['minimo'] = np.fmin.reduceat(blocos, inicio, axis=0)
+        if 'maximo' in estatisticas:
+            resultado['maximo'] = np.fmax.reduceat(blocos, inicio, axis=0)
+        if 'desvio_padrao' in estatisticas:
+            tamanhos = np.diff(np.append(inicio, len(blocos)))
+            desvios = np.where(ausentes, 0.0, blocos - np.repeat(media, tamanhos, axis=0))
+            # Amostral (ddof=1), como o .std() do pandas
+            resultado['desvio_padrao'] = np.sqrt(np.add.reduceat(desvios ** 2, inicio, axis=0) / (n - 1))
+
+    if percentis:
+        fins = np.append(inicio[1:], len(blocos))
+        fracoes = np.asarray(percentis, dtype='float64')[:, None] / 100
+        valores = np.empty((len(percentis), len(inicio), blocos.shape[1]))
+        for g, (i0, i1) in enumerate(zip(inicio, fins)):
+            # Todas as séries do grupo de uma vez: o sort deixa os NaN no fim de
+            # cada coluna e a interpolação linear usa só os n[g] válidos (como o pandas)
+            ordenados = np.sort(blocos[i0:i1], axis=0)
+            posicao = fracoes * np.maximum(n[g] - 1, 0)
+            abaixo = np.floor(posicao).astype('int64')
+            acima = np.minimum(abaixo + 1, np.maximum(n[g] - 1, 0))
+            fracao = posicao - abaixo
+            valores[:, g] = (
+                np.take_along_axis(ordenados, abaixo, axis=0) * (1 - fracao)
+                + np.take_along_axis(ordenados, acima, axis=0) * fracao
+            )
+            valores[:, g, n[g] == 0] = np.nan
+        for p, percentil in enumerate(percentis):
+            resultado[f'p{percentil:g}'] = valores[p]
+    return resultado
+
+
+# Função para calcular estatísticas por mês do calendário (ou por ano) em uma única passada agrupada
+def climatologia(dados, estatisticas=('minimo', 'media', 'maximo'), percentis=(), periodos=None, por='mes'):
+    """Climatologia de uma série ou de um DataFrame com várias séries (estações, variáveis).
+
+    'dados' é indexado por data; as linhas são ordenadas uma única vez por
+    grupo e cada estatística sai de um reduceat sobre todas as colunas ao
+    mesmo tempo, de modo que centenas de estações custam quase o mesmo que
+    uma. 'estatisticas' vem de ESTATISTICAS_CLIMATOLOGIA; 'percentis' (0 a
+    100) viram colunas 'p10', 'p90'...; NaN é ignorado. 'por' é 'mes' (1 a
+    12, sempre os doze meses) ou 'ano'. 'periodos' é uma lista de pares
+    (ano_inicial, ano_final), inclusivos e possivelmente sobrepostos, que
+    acrescenta o nível 'periodo' ('AAAA-AAAA') ao índice.
+
+    Para uma Series as colunas são as estatísticas; para um DataFrame, um
+    MultiIndex (coluna original, estatística). Resultados repetidos vêm de
+    um cache em memória; cada chamada recebe a sua cópia.
+    """
+    if por not in ('mes', 'ano'):
+        raise ValueError(f"agrupamento desconhecido: {por!r} (use 'mes' ou 'ano')")
+    desconhecidas = set(estatisticas) - set(ESTATISTICAS_CLIMATOLOGIA)
+    if desconhecidas:
+        raise ValueError(f'estatísticas desconhecidas: {sorted(desconhecidas)} (use {ESTATISTICAS_CLIMATOLOGIA})')
+
+    estatisticas, percentis = tuple(estatisticas), tuple(percentis)
+    periodos = None if periodos is None else tuple(tuple(periodo) for periodo in periodos)
+    chave = _chave(dados, estatisticas, percentis, periodos, por)
+    if chave in _cache:
+        _cache.move_to_end(chave)
+        return _cache[chave].copy()
+
+    serie_unica = isinstance(dados, pd.Series)
+    quadro = dados.to_frame() if serie_unica else dados
+    quadro = quadro if quadro.index.is_monotonic_increasing else quadro.sort_index()
+    valores = quadro.to_numpy(dtype='float64')
+    anos = quadro.index.year.to_numpy()
+    chaves = quadro.index.month.to_numpy() if por == 'mes' else anos
+
+    if periodos is None:
+        posicoes, periodo = np.arange(len(valores)), np.zeros(len(valores), dtype='int64')
+    else:
+        inicios = np.searchsorted(anos, [inicio for inicio, _ in periodos], side='left')
+        fins = np.searchsorted(anos, [fim for _, fim in periodos], side='right')
+        posicoes = np.concatenate([np.arange(i0, i1) for i0, i1 in zip(inicios, fins)] or [np.array([], dtype='int64')])
+        periodo = np.repeat(np.arange(len(periodos)), fins - inicios)
+
+    # Um código por (período, mês ou ano); ordem estável mantém as datas dentro de cada grupo
+    rotulos_chave = np.arange(1, 13) if por == 'mes' else np.unique(anos[posicoes])
+    codigos = periodo * len(rotulos_chave) + np.searchsorted(rotulos_chave, chaves[posicoes])
+    ordem = np.argsort(codigos, kind='stable')
+    codigos = codigos[ordem]
+    blocos = valores[posicoes[ordem]]
+    presentes, inicio = np.unique(codigos, return_index=True)
+
+    reduzidas = _reduzir(blocos, inicio, estatisticas, percentis) if len(blocos) else {}
+    nomes = list(estatisticas) + [f'p{percentil:g}' for percentil in percentis]
+
+    # Grupos sem nenhuma linha (um mês fora do período, por exemplo) ficam com NaN
+    total = len(rotulos_chave) * (1 if periodos is None else len(periodos))
+    completas = {}
+    for nome in nomes:
+        coluna = np.full((total, valores.shape[1]), 0.0 if nome in ('n', 'soma') else np.nan)
+        if len(presentes):
+            coluna[presentes] = reduzidas[nome]
+        completas[nome] = coluna
+
+    nome_chave = 'mes' if por == 'mes' else 'ano'
+    if periodos is None:
+        indice = pd.Index(rotulos_chave, name=nome_chave)
+    else:
+        indice = pd.MultiIndex.from_product([[f'{inicio}-{fim}' for inicio, fim in periodos], rotulos_chave], names=['periodo', nome_chave])
+        if por == 'ano':
+            # Só os anos de cada período
+            pertence = np.zeros(total, dtype=bool)
+            pertence[presentes] = True
+            completas = {nome: coluna[pertence] for nome, coluna in completas.items()}
+            indice = indice[pertence]
+
+    if serie_unica:
+        resultado = pd.DataFrame({nome: completas[nome][:, 0] for nome in nomes}, index=indice)
+        if 'n' in resultado:
+            resultado['n'] = resultado['n'].astype('int64')
+    else:
+        colunas = pd.MultiIndex.from_product([quadro.columns, nomes], names=[quadro.columns.name, 'estatistica'])
+        resultado = pd.DataFrame(
+            np.stack([completas[nome] for nome in nomes], axis=2).reshape(len(indice), -1),
+            index=indice,
+            columns=colunas,
+        )
+
+    _cache[chave] = resultado
+    if len(_cache) > LIMITE_CACHE_CLIMATOLOGIA:
+        _cache.popitem(last=False)
+    return resultado.copy()
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from .cache import ler_planilha
+
+# Caminhos padrão das planilhas de Paragominas
+file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
+file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
+file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
+
+
+def _serie(caminho, nome):
+    df = ler_planilha(caminho)
+    return pd.Series(df['valor'].to_numpy(), index=pd.DatetimeIndex(df['data'], name='data'), name=nome)
+
+
+# Função para carregar ETP, precipitação e TMAX uma única vez em um frame alinhado por data
+def carregar_conjunto(path_etp=file_path_etp, path_prp=file_path_prp, path_tmax=None):
+    """Lê cada planilha uma vez e retorna um DataFrame indexado por 'data'.
+
+    ETP e precipitação são alinhadas pela interseção das datas (como no
+    merge original); TMAX, se informado, é acrescentado nessas mesmas datas.
+    """
+    conjunto = pd.concat([_serie(path_etp, 'ETP'), _serie(path_prp, 'Precipitação')], axis=1, join='inner')
+    if path_tmax is not None:
+        conjunto['TMAX'] = _serie(path_tmax, 'TMAX').reindex(conjunto.index)
+    return conjunto
+
+
+# Balanço hídrico (P - ETP) acumulado, no mesmo formato de extrair_dados
+def balanco_hidrico(conjunto, acumulado=1):
+    balanco = conjunto['Precipitação'] - conjunto['ETP']
+    return balanco.rolling(acumulado).sum().dropna().to_frame('dados')
+
+
+# Visão somente de ETP e precipitação, no mesmo formato de extrair_etp_prp
+def etp_prp(conjunto):
+    return conjunto[['ETP', 'Precipitação']].copy()
@@ -0,0 +1,162 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+
+from .cache import hash_conteudo, ler_planilha
+from .cache_spei import DIRETORIO_CACHE_SPEI
+from .renderizacao import SCRIPTS_FIGURAS, arquivos_finais, coletar_figuras, exportar_figuras
+
+# Versão do formato do manifesto; incrementar força a reconstrução de tudo
+VERSAO_MANIFESTO = 1
+
+# Manifesto da última construção, ao lado do cache de SPEI
+MANIFESTO_FIGURAS = os.path.join(os.path.dirname(DIRETORIO_CACHE_SPEI), 'figuras.json')
+
+
+def hash_codigo():
+    """SHA-256 do código do pacote processamento; mudar o código refaz todas as figuras."""
+    sha = hashlib.sha256()
+    for caminho in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        sha.update(os.path.basename(caminho).encode('utf-8'))
+        sha.update(hash_conteudo(caminho).encode('ascii'))
+    return sha.hexdigest()
+
+
+def hash_serie(caminho):
+    """SHA-256 da série lida (datas e valores), que ignora mudanças só de formatação do arquivo."""
+    df = ler_planilha(caminho)
+    sha = hashlib.sha256()
+    sha.update(df['data'].to_numpy(dtype='datetime64[ns]').view('int64').tobytes())
+    sha.update(np.ascontiguousarray(df['valor'].to_numpy(dtype='float64')).tobytes())
+    return sha.hexdigest()
+
+
+def hash_figura(figura):
+    """SHA-256 da especificação da figura (traços, layout e opções de exportação)."""
+    texto = json.dumps([figura['figura'], figura['opcoes']], cls=PlotlyJSONEncoder, sort_keys=True)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _ler_manifesto(caminho):
+    try:
+        with open(caminho, encoding='utf-8') as arquivo:
+            manifesto = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    return manifesto if manifesto.get('versao') == VERSAO_MANIFESTO else None
+
+
+def _gravar_manifesto(caminho, manifesto):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f'{caminho}.{os.getpid()}.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def _estado_fontes(caminhos, anteriores):
+    # Arquivo -> hash do conteúdo -> hash da série; a série só é relida se o conteúdo mudou
+    fontes = {}
+    for caminho in caminhos:
+        if not os.path.exists(caminho):
+            continue
+        conteudo = hash_conteudo(caminho)
+        anterior = anteriores.get(caminho, {})
+        serie = anterior['serie'] if anterior.get('sha256') == conteudo else hash_serie(caminho)
+        fontes[caminho] = {'sha256': conteudo, 'serie': serie}
+    return fontes
+
+
+def _imagem_intacta(arquivo, imagens):
+    registro = imagens.get(arquivo)
+    return registro is not None and os.path.exists(arquivo) and hash_conteudo(arquivo) == registro['sha256']
+
+
+# Função para reconstruir só as figuras cujas entradas mudaram
+def construir_figuras(scripts=SCRIPTS_FIGURAS, processos=None, destino=None, forcar=False, manifesto=MANIFESTO_FIGURAS):
+    """Construção incremental das figuras estáticas, como um make.
+
+    Cada etapa é identificada pelo hash do seu conteúdo:
+    planilha (SHA-256 do arquivo) -> série lida (datas e valores) -> SPEI
+    (chave de spei_em_cache) -> script (código do script e do pacote e séries
+    que ele leu) -> especificação da figura (JSON) -> imagem (SHA-256 do PNG).
+
+    Um script só roda de novo se o seu código, o do pacote ou alguma série
+    que ele leu na construção anterior mudou, ou se alguma imagem dele sumiu
+    ou foi alterada; uma imagem só é exportada se a especificação mudou.
+    Planilhas apenas regravadas, com a mesma série, não refazem nada;
+    'forcar' ignora o manifesto e refaz tudo.
+    Retorna um dict com os scripts executados e as imagens exportadas.
+    """
+    anterior = None if forcar else _ler_manifesto(manifesto)
+    anterior = anterior or {'versao': VERSAO_MANIFESTO, 'codigo': None, 'fontes': {}, 'scripts': {}, 'imagens': {}}
+    codigo = hash_codigo()
+    entradas = {caminho for registro in anterior['scripts'].values() for caminho in registro['entradas']}
+    fontes = _estado_fontes(sorted(entradas), anterior['fontes'])
+
+    def desatualizado(script):
+        registro = anterior['scripts'].get(script)
+        if registro is None or registro['sha256'] != hash_conteudo(script) or anterior['codigo'] != codigo:
+            return True
+        if any(caminho not in fontes or fontes[caminho]['serie'] != serie for caminho, serie in registro['entradas'].items()):
+            return True
+        return not all(_imagem_intacta(figura['arquivo'], anterior['imagens']) for figura in registro['figuras'])
+
+    executar = [script for script in scripts if desatualizado(script)]
+    dependencias = {}
+    novas = coletar_figuras(executar, destino=destino, dependencias=dependencias) if executar else []
+
+    # Fontes lidas pela primeira vez nesta construção
+    fontes.update(_estado_fontes(sorted(set().union(*dependencias.values()) - set(fontes)), anterior['fontes']))
+
+    registros = {script: anterior['scripts'][script] for script in scripts if script not in executar}
+    for script in executar:
+        registros[script] = {
+            'sha256': hash_conteudo(script),
+            'entradas': {caminho: fontes[caminho]['serie'] for caminho in sorted(dependencias.get(script, ()))},
+            'figuras': [],
+        }
+    for figura in novas:
+        figura['spec'] = hash_figura(figura)
+        registros[figura['script']]['figuras'].append({'arquivo': figura['arquivo'], 'spec': figura['spec']})
+
+    # Ordem original dos scripts: quando dois gravam o mesmo arquivo, vale o último
+    frescas = {id(figura) for figura in novas}
+    todas = []
+    for script in scripts:
+        if script in executar:
+            todas.extend(figura for figura in novas if figura['script'] == script)
+        else:
+            todas.extend(dict(figura, script=script) for figura in registros[script]['figuras'])
+    finais = arquivos_finais(todas)
+
+    exportar = [
+        figura for figura in finais
+        if id(figura) in frescas and not (
+            anterior['imagens'].get(figura['arquivo'], {}).get('spec') == figura['spec']
+            and _imagem_intacta(figura['arquivo'], anterior['imagens'])
+        )
+    ]
+    exportadas = exportar_figuras(exportar, processos) if exportar else []
+
+    imagens = {}
+    for figura in finais:
+        arquivo = figura['arquivo']
+        if arquivo in exportadas or arquivo not in anterior['imagens']:
+            if os.path.exists(arquivo):
+                imagens[arquivo] = {'spec': figura['spec'], 'sha256': hash_conteudo(arquivo)}
+        else:
+            imagens[arquivo] = dict(anterior['imagens'][arquivo], spec=figura['spec'])
+
+    _gravar_manifesto(manifesto, {
+        'versao': VERSAO_MANIFESTO,
+        'codigo': codigo,
+        'fontes': fontes,
+        'scripts': {**anterior['scripts'], **registros},
+        'imagens': {**anterior['imagens'], **imagens},
+    })
+    return {'executados': executar, 'exportadas': exportadas}
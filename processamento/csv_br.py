@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Linhas lidas por bloco; mantém a memória limitada em exportações grandes
+TAMANHO_BLOCO = 1_000_000
+
+
+def ler_csv_br(caminho, nomes=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê um CSV sem cabeçalho no formato 'AAAA-MM-DD;256,00[;...]' (vírgula decimal).
+
+    A primeira coluna é a data e as demais são valores, uma coluna por
+    estação. O arquivo é lido em blocos pelo parser C do pandas e cada bloco
+    vira diretamente arrays datetime64/float64, sem trabalho Python por linha.
+    Linhas sem data (como o ';' final das exportações) são descartadas.
+    Retorna um DataFrame indexado por 'data'.
+    """
+    blocos = pd.read_csv(
+        caminho,
+        sep=';',
+        decimal=',',
+        header=None,
+        dtype={0: 'string'},
+        engine='c',
+        chunksize=tamanho_bloco,
+    )
+
+    datas, valores = [], []
+    for bloco in blocos:
+        coluna_data = bloco.pop(0)
+        validas = coluna_data.notna().to_numpy()
+        datas.append(pd.to_datetime(coluna_data[validas], format='%Y-%m-%d').to_numpy(dtype='datetime64[ns]'))
+        valores.append(bloco.to_numpy(dtype='float64')[validas])
+
+    if not datas:
+        raise ValueError(f'{caminho}: arquivo CSV vazio')
+
+    datas = np.concatenate(datas)
+    valores = np.concatenate(valores)
+    if nomes is None:
+        nomes = list(range(valores.shape[1]))
+    elif len(nomes) != valores.shape[1]:
+        raise ValueError(f'{caminho}: {valores.shape[1]} colunas de valores, mas {len(nomes)} nomes informados')
+
+    return pd.DataFrame(valores, index=pd.DatetimeIndex(datas, name='data'), columns=nomes)
+
+
+def ler_serie_csv_br(caminho):
+    """Lê um CSV de uma única estação e retorna (titulo, descricao, datas, valores)."""
+    df = ler_csv_br(caminho)
+    if df.shape[1] != 1:
+        raise ValueError(f'{caminho}: {df.shape[1]} estações no arquivo; use ler_csv_br para arquivos com várias estações')
+    # O CSV não tem cabeçalho, então o nome do arquivo faz o papel de título
+    titulo = os.path.splitext(os.path.basename(caminho))[0]
+    return titulo, '', df.index.to_numpy(), df.iloc[:, 0].to_numpy()
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+from .categorias import categorizar_spei
+
+# Limiar da teoria de corridas: um evento de seca é uma sequência de meses com SPEI abaixo dele
+LIMIAR_SECA = -1.0
+
+# Colunas da tabela de eventos do dashboard, na ordem exibida
+COLUNAS_EVENTOS = {
+    'inicio': 'Início',
+    'fim': 'Fim',
+    'duracao': 'Duração (meses)',
+    'severidade': 'Severidade',
+    'intensidade_media': 'Intensidade média',
+    'pico': 'Pico',
+    'tempo_entre_eventos': 'Meses desde o evento anterior',
+}
+
+
+# Função para detectar eventos de seca (teoria de corridas) em uma ou várias séries de uma vez
+def detectar_eventos(spei, limiar=LIMIAR_SECA, duracao_minima=1):
+    """Eventos de seca: sequências contíguas de valores abaixo de 'limiar'.
+
+    'spei' é uma Series ou um DataFrame indexado por data, com uma coluna por
+    escala (saída de calcular_spei_multiescala) ou por célula de grade. As
+    corridas saem de uma codificação run-length de todas as colunas juntas
+    (diferença da máscara com uma borda falsa em cada coluna), sem laço
+    sobre meses ou colunas; NaN interrompe uma corrida.
+
+    Para cada evento retorna: início e fim (último mês abaixo do limiar),
+    duração (em passos da série), severidade (soma de |SPEI| no evento),
+    intensidade média (severidade / duração), pico (menor SPEI) e a data do
+    pico, e o tempo desde o início do evento anterior da mesma coluna
+    ('tempo_entre_eventos', em passos; NaN no primeiro). Eventos mais curtos
+    que 'duracao_minima' são descartados antes desse cálculo.
+    """
+    serie_unica = isinstance(spei, pd.Series)
+    quadro = spei.to_frame() if serie_unica else spei
+    datas = quadro.index
+    n_datas, n_colunas = quadro.shape
+    # Coluna por coluna, em sequência: o evento nunca atravessa de uma coluna para a outra
+    valores = quadro.to_numpy(dtype='float64').T
+
+    abaixo = np.zeros((n_colunas, n_datas + 2), dtype='int8')
+    abaixo[:, 1:-1] = valores < limiar
+    variacao = np.diff(abaixo, axis=1)
+    coluna, inicio = np.nonzero(variacao == 1)
+    _, fim = np.nonzero(variacao == -1)
+    duracao = fim - inicio
+
+    # Posição de cada mês de evento na matriz achatada e o evento a que pertence
+    mascara = abaixo[:, 1:-1].astype(bool).ravel()
+    posicoes = np.flatnonzero(mascara)
+    amostra = valores.ravel()[posicoes]
+    evento = np.repeat(np.arange(len(inicio)), duracao)
+    deslocamentos = np.cumsum(duracao) - duracao
+
+    severidade = np.add.reduceat(np.abs(amostra), deslocamentos) if len(inicio) else np.zeros(0)
+    # Menor valor de cada evento: ordena por (evento, valor) e pega o primeiro de cada um
+    ordem = np.lexsort((amostra, evento))
+    pico_posicao = posicoes[ordem[deslocamentos]] % max(n_datas, 1)
+    pico = amostra[ordem[deslocamentos]]
+
+    manter = duracao >= duracao_minima
+    coluna, inicio, fim, duracao = coluna[manter], inicio[manter], fim[manter], duracao[manter]
+    severidade, pico, pico_posicao = severidade[manter], pico[manter], pico_posicao[manter]
+
+    # Tempo de início a início dentro da mesma coluna
+    entre = np.full(len(inicio), np.nan)
+    mesma_coluna = np.zeros(len(inicio), dtype=bool)
+    mesma_coluna[1:] = coluna[1:] == coluna[:-1]
+    entre[1:][mesma_coluna[1:]] = (inicio[1:] - inicio[:-1])[mesma_coluna[1:]]
+
+    eventos = pd.DataFrame({
+        'inicio': datas[inicio],
+        'fim': datas[fim - 1],
+        'duracao': duracao,
+        'severidade': severidade,
+        'intensidade_media': severidade / np.maximum(duracao, 1),
+        'pico': pico,
+        'data_pico': datas[pico_posicao],
+        'tempo_entre_eventos': entre,
+    })
+    if not serie_unica:
+        eventos.insert(0, quadro.columns.name or 'coluna', quadro.columns[coluna])
+    return eventos
+
+
+def formatar_eventos(eventos):
+    """Eventos de uma série mensal prontos para exibir: datas 'mm/AAAA', números com duas casas
+    e '-' no primeiro intervalo entre eventos, com os nomes de COLUNAS_EVENTOS, na ordem recebida."""
+    return eventos[list(COLUNAS_EVENTOS)].assign(
+        inicio=eventos['inicio'].dt.strftime('%m/%Y'),
+        fim=eventos['fim'].dt.strftime('%m/%Y'),
+        severidade=eventos['severidade'].round(2),
+        intensidade_media=eventos['intensidade_media'].round(2),
+        pico=eventos['pico'].round(2),
+        tempo_entre_eventos=eventos['tempo_entre_eventos'].map(lambda meses: '-' if pd.isna(meses) else int(meses)),
+    ).rename(columns=COLUNAS_EVENTOS)
+
+
+def traco_eventos(eventos, cores, **estilo):
+    """go.Bar com um evento por barra: centrada no evento, largura igual à duração e altura igual à severidade.
+
+    Supõe uma série mensal (o evento vai até o fim do mês de 'fim'); a cor é a
+    da categoria do pico, em 'cores' (categoria -> cor).
+    """
+    duracao = eventos['fim'] + pd.offsets.MonthBegin(1) - eventos['inicio']  # Meses inteiros
+    return go.Bar(
+        x=eventos['inicio'] + duracao / 2,
+        y=eventos['severidade'],
+        width=duracao.dt.total_seconds() * 1000,  # Largura em milissegundos no eixo de datas
+        marker=dict(color=[cores[categoria] for categoria in categorizar_spei(eventos['pico'].to_numpy())],
+                    line=dict(color='white', width=0.5)),
+        customdata=np.column_stack([
+            eventos['inicio'].dt.strftime('%m/%Y'),
+            eventos['fim'].dt.strftime('%m/%Y'),
+            eventos['duracao'],
+            eventos['pico'].round(2),
+        ]),
+        hovertemplate='%{customdata[0]} a %{customdata[1]}<br>Duração: %{customdata[2]} meses'
+                      '<br>Severidade: %{y:.2f}<br>Pico: %{customdata[3]}<extra></extra>',
+        name='Eventos de seca',
+        **estilo
+    )
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from .cache import ler_planilha
+from .conjunto import balanco_hidrico, carregar_conjunto, etp_prp
+
+
+# Função para extrair dados e calcular o balanço hídrico acumulado
+def extrair_dados(path_etp, path_prp, acumulado=1):
+    return balanco_hidrico(carregar_conjunto(path_etp, path_prp), acumulado)
+
+
+# Função para extrair dados somente de ETP e precipitação
+def extrair_etp_prp(path_etp, path_prp):
+    return etp_prp(carregar_conjunto(path_etp, path_prp))
+
+
+# Função para extrair dados de temperatura máxima
+def extrair_tmax(path_tmax):
+    df = ler_planilha(path_tmax)
+    df_tmax = pd.DataFrame({'data': df['data'], 'TMAX': df['valor']})
+    df_tmax['Ano'] = df_tmax['data'].dt.year
+    df_tmax['Mes'] = df_tmax['data'].dt.month
+    return df_tmax
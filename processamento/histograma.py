@@ -0,0 +1,36 @@
+import numpy as np
+import plotly.graph_objs as go
+
+# Classes de 0,25 de -5 a 5: todos os limites das categorias (-2, -1.5, -1, 0,
+# 1, 1.5, 2) caem em bordas, de modo que nenhuma barra mistura duas categorias
+BORDAS_HISTOGRAMA = np.linspace(-5.0, 5.0, 41)
+
+
+# Função para contar os valores de SPEI em classes fixas
+def contar_histograma(valores, bordas=BORDAS_HISTOGRAMA):
+    """Contagem de valores por classe [borda_i, borda_i+1), fechada à esquerda como as categorias.
+
+    Aceita arrays de qualquer forma (várias escalas ou estações entram juntas
+    na mesma distribuição); NaN é ignorado e valores fora das bordas vão para
+    a primeira ou a última classe. Retorna um array com len(bordas) - 1 contagens.
+    """
+    valores = np.asarray(valores, dtype='float64').ravel()
+    valores = valores[~np.isnan(valores)]
+    classes = np.clip(np.searchsorted(bordas, valores, side='right') - 1, 0, len(bordas) - 2)
+    return np.bincount(classes, minlength=len(bordas) - 1)
+
+
+def traco_histograma(contagens, bordas=BORDAS_HISTOGRAMA, **estilo):
+    """go.Bar com as contagens já calculadas, uma barra por classe encostada na seguinte.
+
+    As classes vazias nas pontas ficam de fora, para o eixo x acompanhar os dados.
+    """
+    ocupadas = np.flatnonzero(contagens)
+    inicio, fim = (ocupadas[0], ocupadas[-1] + 1) if len(ocupadas) else (0, 0)
+    larguras = np.diff(bordas)[inicio:fim]
+    return go.Bar(
+        x=bordas[inicio:fim] + larguras / 2,
+        y=contagens[inicio:fim],
+        width=larguras,
+        **estilo
+    )
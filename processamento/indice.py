@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .categorias import CATEGORIAS_SPEI, codigos_spei
+
+# Somas acumuladas por ano: a linha i guarda o total dos anos anteriores a anos[i],
+# de modo que qualquer intervalo [inicio, fim] sai da diferença de duas linhas
+IndiceAnual = namedtuple('IndiceAnual', ['anos', 'contagens', 'soma', 'soma_quadrados'])
+
+
+# Função para montar o índice de somas prefixadas de uma série de SPEI
+def construir_indice(spei):
+    """Pré-calcula, em um único passe, contagens por categoria e momentos acumulados por ano.
+
+    'spei' é uma série mensal indexada por data. Anos sem dados dentro do
+    período entram com contagem zero, para que o índice seja contínuo.
+    """
+    valores = spei.to_numpy(dtype='float64')
+    anos_serie = spei.index.year.to_numpy()
+    validos = ~np.isnan(valores)
+    # Série vazia ou só com NaN: índice sem anos, e todo intervalo tem contagem zero
+    if not validos.any():
+        anos, linha = np.zeros(0, dtype='int64'), np.zeros(len(valores), dtype='int64')
+    else:
+        anos = np.arange(anos_serie.min(), anos_serie.max() + 1)
+        linha = anos_serie - anos[0]
+
+    contagens = np.zeros((len(anos), len(CATEGORIAS_SPEI)), dtype='int64')
+    np.add.at(contagens, (linha[validos], codigos_spei(valores[validos])), 1)
+    soma = np.bincount(linha[validos], weights=valores[validos], minlength=len(anos))
+    soma_quadrados = np.bincount(linha[validos], weights=valores[validos] ** 2, minlength=len(anos))
+
+    def acumular(por_ano):
+        return np.concatenate((np.zeros((1,) + por_ano.shape[1:], dtype=por_ano.dtype), np.cumsum(por_ano, axis=0)))
+
+    return IndiceAnual(anos, acumular(contagens), acumular(soma), acumular(soma_quadrados))
+
+
+def _linhas(indice, ano_inicial, ano_final):
+    # Intervalo recortado aos anos do índice; vazio quando não há interseção
+    if not len(indice.anos):
+        return 0, 0
+    inicio = int(np.clip(ano_inicial - indice.anos[0], 0, len(indice.anos)))
+    fim = int(np.clip(ano_final - indice.anos[0] + 1, inicio, len(indice.anos)))
+    return inicio, fim
+
+
+def contagens_intervalo(indice, ano_inicial, ano_final):
+    """Número de meses em cada categoria de SPEI entre os anos pedidos (inclusive), em O(1)."""
+    inicio, fim = _linhas(indice, ano_inicial, ano_final)
+    return pd.Series(indice.contagens[fim] - indice.contagens[inicio], index=list(CATEGORIAS_SPEI), name='Contagem')
+
+
+def porcentagens_intervalo(indice, ano_inicial, ano_final):
+    """Porcentagem de meses em cada categoria entre os anos pedidos, em O(1)."""
+    contagens = contagens_intervalo(indice, ano_inicial, ano_final)
+    total = contagens.sum()
+    return (contagens / total * 100 if total else contagens * 0.0).rename('Porcentagem')
+
+
+def resumo_intervalo(indice, ano_inicial, ano_final):
+    """Número de meses, média e desvio padrão amostral do SPEI entre os anos pedidos, em O(1)."""
+    inicio, fim = _linhas(indice, ano_inicial, ano_final)
+    n = int(indice.contagens[fim].sum() - indice.contagens[inicio].sum())
+    soma = indice.soma[fim] - indice.soma[inicio]
+    soma_quadrados = indice.soma_quadrados[fim] - indice.soma_quadrados[inicio]
+    media = soma / n if n else np.nan
+    desvio = np.sqrt(max(soma_quadrados - n * media ** 2, 0.0) / (n - 1)) if n > 1 else np.nan
+    return {'n': n, 'media': media, 'desvio_padrao': desvio}
+
+
+def porcentagens_por_ano(indice, ano_inicial, ano_final):
+    """Tabela ano x categoria com a porcentagem de cada categoria dentro de cada ano.
+
+    Equivale ao crosstab normalizado por linha usado no dashboard; anos sem
+    dados ficam de fora.
+    """
+    inicio, fim = _linhas(indice, ano_inicial, ano_final)
+    contagens = np.diff(indice.contagens[inicio:fim + 1], axis=0)
+    totais = contagens.sum(axis=1)
+    com_dados = totais > 0
+    tabela = pd.DataFrame(contagens[com_dados] / totais[com_dados, None] * 100,
+                          index=indice.anos[inicio:fim][com_dados], columns=list(CATEGORIAS_SPEI))
+    tabela.index.name = 'Ano'
+    return tabela
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from .categorias import CATEGORIAS_SPEI, codigos_spei
+
+# Décadas usadas nos gráficos da dissertação (anos inclusivos)
+DECADAS = ((1981, 1990), (1991, 2000), (2001, 2010), (2011, 2020))
+
+
+def intervalos_anuais(intervalos):
+    """Converte pares (ano_inicial, ano_final) inclusivos e contíguos em (bordas, rótulos).
+
+    [(1981, 1990), (1991, 2000)] vira bordas [1981, 1991, 2001] e rótulos
+    ['1981-1990', '1991-2000'], no formato que agregar_intervalos espera.
+    """
+    intervalos = [tuple(intervalo) for intervalo in intervalos]
+    for (_, fim), (inicio, _) in zip(intervalos, intervalos[1:]):
+        if inicio != fim + 1:
+            raise ValueError(f'intervalos não contíguos: {fim} e {inicio}; use bordas explícitas')
+    bordas = [inicio for inicio, _ in intervalos] + [intervalos[-1][1] + 1]
+    return np.array(bordas), [f'{inicio}-{fim}' for inicio, fim in intervalos]
+
+
+def _codigos_categoria(categorias, valores):
+    if categorias is None:
+        return np.zeros(valores.shape, dtype='int64'), None
+    if isinstance(categorias, str) and categorias == 'spei':
+        return codigos_spei(valores).astype('int64'), list(CATEGORIAS_SPEI)
+    codigos = np.asarray(categorias, dtype='int64').reshape(valores.shape)
+    return codigos, None
+
+
+# Função para agregar uma série (ou várias estações) por intervalo e categoria em uma única passada
+def agregar_intervalos(dados, bordas, rotulos=None, categorias=None, nomes_categorias=None):
+    """Contagem, porcentagem, média, desvio padrão, mínimo e máximo por (intervalo, categoria).
+
+    'dados' é uma Series ou um DataFrame (uma coluna por estação) indexado por
+    data. 'bordas' são os limites crescentes dos intervalos, em anos (inteiros)
+    ou em datas: a linha entra no intervalo i se bordas[i] <= chave <
+    bordas[i + 1], e linhas fora de todos os intervalos são ignoradas. A
+    atribuição é um único searchsorted sobre as bordas ordenadas.
+
+    'categorias' é None (sem divisão), 'spei' (classes de CATEGORIAS_SPEI) ou
+    um array de códigos inteiros com a forma de 'dados' (negativo = sem
+    categoria), com os nomes em 'nomes_categorias'. Todas as combinações
+    (estação, intervalo, categoria) viram um só código e cada estatística sai
+    de um bincount/reduceat, sem laço por linha ou por intervalo; NaN é
+    ignorado. A porcentagem é em relação aos valores válidos do intervalo
+    (na mesma estação); o desvio padrão é o amostral.
+
+    Retorna um DataFrame indexado por ('intervalo', 'categoria'), com o nível
+    'estacao' à frente quando 'dados' é um DataFrame e sem 'categoria' quando
+    'categorias' é None. Todas as combinações aparecem, com n = 0 nas vazias.
+    """
+    serie_unica = isinstance(dados, pd.Series)
+    quadro = dados.to_frame() if serie_unica else dados
+    valores = quadro.to_numpy(dtype='float64')
+    bordas = np.asarray(bordas)
+
+    # Chave de cada linha: o ano, ou o próprio instante quando as bordas são datas
+    if np.issubdtype(bordas.dtype, np.integer):
+        chaves = quadro.index.year.to_numpy()
+        rotulos = rotulos or [f'{inicio}-{fim - 1}' for inicio, fim in zip(bordas[:-1], bordas[1:])]
+    else:
+        datas = pd.DatetimeIndex(bordas)
+        rotulos = rotulos or [f'{inicio:%Y-%m-%d} a {fim:%Y-%m-%d}' for inicio, fim in zip(datas[:-1], datas[1:])]
+        bordas = datas.asi8
+        chaves = pd.DatetimeIndex(quadro.index).asi8
+    n_intervalos = len(bordas) - 1
+    intervalo = np.searchsorted(bordas, chaves, side='right') - 1
+
+    codigos, nomes_padrao = _codigos_categoria(categorias, valores)
+    nomes_categorias = nomes_categorias or nomes_padrao or (
+        [] if categorias is None else [str(codigo) for codigo in range(int(codigos.max(initial=-1)) + 1)]
+    )
+    n_categorias = max(len(nomes_categorias), 1)
+    n_estacoes = valores.shape[1]
+
+    validos = (~np.isnan(valores)) & (codigos >= 0) & ((intervalo >= 0) & (intervalo < n_intervalos))[:, None]
+    estacao = np.broadcast_to(np.arange(n_estacoes), valores.shape)
+    grupo = ((estacao * n_intervalos + intervalo[:, None]) * n_categorias + codigos)[validos]
+    amostra = valores[validos]
+    total_grupos = n_estacoes * n_intervalos * n_categorias
+
+    n = np.bincount(grupo, minlength=total_grupos)
+    soma = np.bincount(grupo, weights=amostra, minlength=total_grupos)
+    soma_quadrados = np.bincount(grupo, weights=amostra ** 2, minlength=total_grupos)
+
+    minimo = np.full(total_grupos, np.nan)
+    maximo = np.full(total_grupos, np.nan)
+    if len(grupo):
+        ordem = np.argsort(grupo, kind='stable')
+        presentes, inicio = np.unique(grupo[ordem], return_index=True)
+        minimo[presentes] = np.minimum.reduceat(amostra[ordem], inicio)
+        maximo[presentes] = np.maximum.reduceat(amostra[ordem], inicio)
+
+    totais = n.reshape(-1, n_categorias).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        porcentagem = np.where(np.repeat(totais, n_categorias) > 0, n / np.repeat(totais, n_categorias) * 100, 0.0)
+        media = soma / n
+        desvio = np.sqrt(np.maximum(soma_quadrados - n * media ** 2, 0.0) / (n - 1))
+    media[n == 0] = np.nan
+    desvio[n < 2] = np.nan
+
+    niveis = [pd.CategoricalIndex(rotulos, categories=rotulos, ordered=True)]
+    nomes_niveis = ['intervalo']
+    if categorias is not None:
+        niveis.append(pd.CategoricalIndex(nomes_categorias, categories=nomes_categorias, ordered=True))
+        nomes_niveis.append('categoria')
+    if not serie_unica:
+        niveis.insert(0, quadro.columns)
+        nomes_niveis.insert(0, 'estacao')
+    indice = pd.MultiIndex.from_product(niveis, names=nomes_niveis) if len(niveis) > 1 \
+        else pd.CategoricalIndex(niveis[0], name=nomes_niveis[0])
+
+    return pd.DataFrame({
+        'n': n,
+        'porcentagem': porcentagem,
+        'media': media,
+        'desvio_padrao': desvio,
+        'minimo': minimo,
+        'maximo': maximo,
+    }, index=indice)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from scipy.special import gamma as funcao_gama
+from scipy.stats import norm
+
+# Células processadas por vez; limita a memória a alguns arrays (tempo x bloco)
+TAMANHO_BLOCO = 2000
+
+# Limite da probabilidade acumulada, para que valores fora do suporte da
+# log-logística não virem +-inf (SPEI fica limitado a cerca de +-4,75)
+PROBABILIDADE_MINIMA = 1e-6
+
+
+def acumular_lote(balanco, escala):
+    """Soma móvel ao longo do tempo (eixo 0) de um array tempo x células.
+
+    Janelas que contêm algum NaN resultam em NaN; as primeiras (escala - 1)
+    linhas também.
+    """
+    balanco = np.asarray(balanco, dtype='float64')
+    if escala == 1:
+        return balanco.copy()
+
+    ausentes = np.isnan(balanco)
+    zeros = np.zeros((1,) + balanco.shape[1:])
+    soma = np.concatenate((zeros, np.cumsum(np.where(ausentes, 0.0, balanco), axis=0)))
+    faltas = np.concatenate((zeros, np.cumsum(ausentes, axis=0)))
+
+    acumulado = np.full(balanco.shape, np.nan)
+    acumulado[escala - 1:] = soma[escala:] - soma[:-escala]
+    janela_incompleta = (faltas[escala:] - faltas[:-escala]) > 0
+    acumulado[escala - 1:][janela_incompleta] = np.nan
+    return acumulado
+
+
+def ajustar_loglogistica_pwm(amostra):
+    """Ajusta a log-logística por momentos ponderados por probabilidade (PWM).
+
+    'amostra' é um array (anos x células), com NaN onde não há dado. É o
+    ajuste da formulação original do SPEI (Vicente-Serrano et al., 2010),
+    com solução fechada e portanto vetorizável em todas as células de uma vez.
+    Retorna (alfa, beta, gama), cada um com uma posição por célula.
+    """
+    ordenada = np.sort(amostra, axis=0)  # NaN vai para o fim de cada coluna
+    n = np.sum(~np.isnan(ordenada), axis=0).astype('float64')
+    posicao = np.arange(1, ordenada.shape[0] + 1, dtype='float64')[:, None]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Posição de plotagem F_i = (i - 0.35) / n, apenas para as linhas válidas
+        complemento = np.where(posicao <= n, 1.0 - (posicao - 0.35) / n, 0.0)
+        valores = np.nan_to_num(ordenada)
+        w0 = np.sum(valores, axis=0) / n
+        w1 = np.sum(complemento * valores, axis=0) / n
+        w2 = np.sum(complemento ** 2 * valores, axis=0) / n
+
+        beta = (2 * w1 - w0) / (6 * w1 - w0 - 6 * w2)
+        produto_gama = funcao_gama(1 + 1 / beta) * funcao_gama(1 - 1 / beta)
+        alfa = (w0 - 2 * w1) * beta / produto_gama
+        gama = w0 - alfa * produto_gama
+
+    # Menos de 3 valores não determinam os três parâmetros
+    invalidos = n < 3
+    for parametro in (alfa, beta, gama):
+        parametro[invalidos] = np.nan
+    return alfa, beta, gama
+
+
+def cdf_loglogistica(valores, alfa, beta, gama):
+    """Probabilidade acumulada da log-logística de três parâmetros.
+
+    Com beta < 0 (amostras com assimetria negativa, comuns no balanço hídrico
+    da estação chuvosa) a distribuição é limitada superiormente por gama.
+    """
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        padronizado = (valores - gama) / alfa
+        probabilidade = 1.0 / (1.0 + padronizado ** -beta)
+    # Fora do suporte: abaixo do limite inferior (beta > 0) ou acima do superior (beta < 0)
+    probabilidade = np.where(padronizado <= 0, np.where(beta > 0, 0.0, 1.0), probabilidade)
+    probabilidade = np.clip(probabilidade, PROBABILIDADE_MINIMA, 1 - PROBABILIDADE_MINIMA)
+    return np.where(np.isnan(valores) | np.isnan(alfa), np.nan, probabilidade)
+
+
+def _spei_bloco(bloco, meses):
+    resultado = np.full(bloco.shape, np.nan)
+    for mes in np.unique(meses):
+        linhas = meses == mes
+        amostra = bloco[linhas]
+        alfa, beta, gama = ajustar_loglogistica_pwm(amostra)
+        resultado[linhas] = norm.ppf(cdf_loglogistica(amostra, alfa, beta, gama))
+    return resultado
+
+
+# Função para calcular o SPEI de muitas células (pontos de grade ou estações) de uma vez
+def calcular_spei_lote(balanco, datas, escala=1, tamanho_bloco=TAMANHO_BLOCO):
+    """Calcula o SPEI de um array tempo x células do balanço hídrico P - ETP.
+
+    'datas' é o índice de tempo (DatetimeIndex ou algo conversível) com uma
+    entrada por linha de 'balanco'. A distribuição log-logística é ajustada
+    por mês do calendário com PWM, vetorizado em todas as células; as células
+    são processadas em blocos de 'tamanho_bloco' colunas para manter a memória
+    limitada. Retorna um array float64 com a mesma forma de 'balanco'.
+
+    O ajuste por PWM não é idêntico ao MLE do si.spei, mas segue a definição
+    original do índice; para uma única série prefira calcular_spei.
+    """
+    balanco = np.asarray(balanco, dtype='float64')
+    unidimensional = balanco.ndim == 1
+    if unidimensional:
+        balanco = balanco[:, None]
+
+    meses = pd.DatetimeIndex(datas).month.to_numpy()
+    if len(meses) != balanco.shape[0]:
+        raise ValueError(f'{len(meses)} datas para {balanco.shape[0]} linhas de balanço hídrico')
+
+    resultado = np.empty(balanco.shape)
+    for inicio in range(0, balanco.shape[1], tamanho_bloco):
+        colunas = slice(inicio, inicio + tamanho_bloco)
+        resultado[:, colunas] = _spei_bloco(acumular_lote(balanco[:, colunas], escala), meses)
+
+    return resultado[:, 0] if unidimensional else resultado
@@ -0,0 +1,264 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Liga a coleta de métricas e a rota /metrics; desligada, os decoradores
+# devolvem a própria função e nada é medido
+METRICAS_ATIVAS = os.environ.get('SPEI_METRICAS', '').lower() in ('1', 'true', 'sim')
+
+# Limites (le) dos histogramas, no formato do Prometheus
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LIMITES_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Com o gunicorn (vários workers), cada processo grava o seu registro neste
+# diretório e /metrics soma todos, como o modo multiprocesso do prometheus_client
+DIRETORIO_METRICAS = os.environ.get('SPEI_METRICAS_DIR')
+
+# Intervalo entre gravações do registro de um worker que mediu algo, em segundos
+INTERVALO_GRAVACAO = 1.0
+
+_trava = threading.Lock()
+_histogramas = {}
+_caches = {}
+# Acertos e faltas herdados do mestre no fork, descontados no registro do worker
+_base_caches = {}
+_gravacao = {'alterado': False}
+# Fim do último callback medido na thread: início da serialização da resposta
+_local = threading.local()
+
+
+def observar(metrica, rotulos, valor, limites=LIMITES_LATENCIA):
+    """Acrescenta uma observação ao histograma 'metrica' com os rótulos dados."""
+    chave = (metrica, tuple(sorted(rotulos.items())))
+    with _trava:
+        histograma = _histogramas.get(chave)
+        if histograma is None:
+            histograma = _histogramas[chave] = {'limites': limites, 'contagens': [0] * len(limites), 'soma': 0.0, 'total': 0}
+        for i, limite in enumerate(limites):
+            if valor <= limite:
+                histograma['contagens'][i] += 1
+                break
+        histograma['soma'] += valor
+        histograma['total'] += 1
+        _gravacao['alterado'] = True
+
+
+@contextmanager
+def _cronometro(etapa, nome):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fim = time.perf_counter()
+        observar('spei_latencia_segundos', {'etapa': etapa, 'nome': nome}, fim - inicio)
+        if etapa == 'callback':
+            _local.fim_callback = fim
+
+
+def medir_etapa(etapa, nome=''):
+    """Context manager que registra a duração de uma etapa (carga, spei, categorias...)."""
+    return _cronometro(etapa, nome) if METRICAS_ATIVAS else nullcontext()
+
+
+def instrumentar(etapa, nome=None):
+    """Decorador que registra a latência de cada chamada da função.
+
+    Com as métricas desligadas devolve a função original, sem custo nenhum.
+    """
+    def decorador(funcao):
+        if not METRICAS_ATIVAS:
+            return funcao
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            with _cronometro(etapa, nome or funcao.__name__):
+                return funcao(*args, **kwargs)
+
+        return medida
+
+    return decorador
+
+
+def registrar_cache(nome, funcao):
+    """Expõe acertos e faltas de uma função com functools.lru_cache; lidos só na coleta."""
+    _caches[nome] = funcao
+    return funcao
+
+
+def _escapar(valor):
+    # Formato de texto: barra invertida, aspas e quebra de linha escapadas no valor do rótulo
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(pares):
+    return ','.join(f'{chave}="{_escapar(valor)}"' for chave, valor in pares)
+
+
+def _registro():
+    # Estado deste processo em listas JSON simples
+    with _trava:
+        histogramas = [[metrica, [list(par) for par in rotulos], list(h['limites']), list(h['contagens']), h['soma'], h['total']]
+                       for (metrica, rotulos), h in _histogramas.items()]
+    caches = {}
+    for nome, funcao in _caches.items():
+        info = funcao.cache_info()
+        acertos, faltas = _base_caches.get(nome, (0, 0))
+        caches[nome] = [info.hits - acertos, info.misses - faltas, info.currsize]
+    return {'histogramas': histogramas, 'caches': caches}
+
+
+def gravar_registro():
+    """Grava o registro deste processo em DIRETORIO_METRICAS."""
+    if not DIRETORIO_METRICAS:
+        return
+    os.makedirs(DIRETORIO_METRICAS, exist_ok=True)
+    destino = os.path.join(DIRETORIO_METRICAS, f'metricas_{os.getpid()}.json')
+    temporario = f'{destino}.{threading.get_ident()}.tmp'
+    with open(temporario, 'w') as arquivo:
+        json.dump(_registro(), arquivo)
+    os.replace(temporario, destino)  # Quem lê nunca vê um arquivo pela metade
+
+
+def limpar_registros():
+    """Apaga os registros de uma execução anterior (chamado pelo gunicorn ao iniciar)."""
+    if not DIRETORIO_METRICAS or not os.path.isdir(DIRETORIO_METRICAS):
+        return
+    for nome in os.listdir(DIRETORIO_METRICAS):
+        if nome.startswith('metricas_'):
+            os.remove(os.path.join(DIRETORIO_METRICAS, nome))
+
+
+def _gravar_periodicamente():
+    while True:
+        time.sleep(INTERVALO_GRAVACAO)
+        if _gravacao['alterado']:
+            _gravacao['alterado'] = False
+            gravar_registro()
+
+
+def iniciar_worker():
+    """Chamado logo após o fork: o worker começa do zero, porque o que ele herdou
+    do mestre (carga, SPEI, pré-cálculo) já está no registro do mestre, e passa
+    a gravar o próprio registro a cada INTERVALO_GRAVACAO em que mediu algo."""
+    with _trava:
+        _histogramas.clear()
+    for nome, funcao in _caches.items():
+        info = funcao.cache_info()
+        _base_caches[nome] = (info.hits, info.misses)
+    if DIRETORIO_METRICAS:
+        threading.Thread(target=_gravar_periodicamente, name='metricas', daemon=True).start()
+
+
+def _registros():
+    if not DIRETORIO_METRICAS:
+        return [_registro()]
+    gravar_registro()
+    registros = []
+    for nome in sorted(os.listdir(DIRETORIO_METRICAS)):
+        if not (nome.startswith('metricas_') and nome.endswith('.json')):
+            continue
+        try:
+            with open(os.path.join(DIRETORIO_METRICAS, nome)) as arquivo:
+                registros.append(json.load(arquivo))
+        except (OSError, ValueError):
+            continue  # Removido entre o listdir e a leitura
+    return registros
+
+
+def _somar(registros):
+    # Histogramas e contadores somados entre processos; o tamanho de cada cache
+    # é o do maior processo, já que cada worker tem a sua cópia
+    histogramas = {}
+    caches = {}
+    for registro in registros:
+        for metrica, rotulos, limites, contagens, soma, total in registro['histogramas']:
+            chave = (metrica, tuple(tuple(par) for par in rotulos))
+            histograma = histogramas.setdefault(chave, {'limites': limites, 'contagens': [0] * len(limites), 'soma': 0.0, 'total': 0})
+            histograma['contagens'] = [a + b for a, b in zip(histograma['contagens'], contagens)]
+            histograma['soma'] += soma
+            histograma['total'] += total
+        for nome, (acertos, faltas, itens) in registro['caches'].items():
+            total_acertos, total_faltas, maior = caches.get(nome, (0, 0, 0))
+            caches[nome] = (total_acertos + acertos, total_faltas + faltas, max(maior, itens))
+    return sorted(histogramas.items()), sorted(caches.items())
+
+
+def texto_prometheus():
+    """Todas as métricas no formato de texto do Prometheus (versão 0.0.4).
+
+    Com DIRETORIO_METRICAS, soma os registros de todos os processos (mestre e
+    workers, inclusive os que já terminaram); os dos outros workers podem estar
+    até INTERVALO_GRAVACAO atrasados.
+    """
+    linhas = []
+    histogramas, caches = _somar(_registros())
+
+    tipos_declarados = set()
+    for (metrica, rotulos), histograma in histogramas:
+        if metrica not in tipos_declarados:
+            linhas.append(f'# TYPE {metrica} histogram')
+            tipos_declarados.add(metrica)
+        acumulado = 0
+        for limite, contagem in zip(histograma['limites'], histograma['contagens']):
+            acumulado += contagem
+            linhas.append(f'{metrica}_bucket{{{_rotulos(rotulos + (("le", limite),))}}} {acumulado}')
+        linhas.append(f'{metrica}_bucket{{{_rotulos(rotulos + (("le", "+Inf"),))}}} {histograma["total"]}')
+        linhas.append(f'{metrica}_sum{{{_rotulos(rotulos)}}} {histograma["soma"]}')
+        linhas.append(f'{metrica}_count{{{_rotulos(rotulos)}}} {histograma["total"]}')
+
+    if caches:
+        linhas.append('# TYPE spei_cache_acertos_total counter')
+        linhas.append('# TYPE spei_cache_faltas_total counter')
+        linhas.append('# TYPE spei_cache_itens gauge')
+        for nome, (acertos, faltas, itens) in caches:
+            rotulo = _rotulos((('cache', nome),))
+            linhas.append(f'spei_cache_acertos_total{{{rotulo}}} {acertos}')
+            linhas.append(f'spei_cache_faltas_total{{{rotulo}}} {faltas}')
+            linhas.append(f'spei_cache_itens{{{rotulo}}} {itens}')
+    return '\n'.join(linhas) + '\n'
+
+
+# Função para ligar a coleta por requisição e a rota /metrics a um app Dash
+def registrar_metricas(app):
+    """Mede cada requisição de callback (latência total, serialização e bytes da resposta)
+    e publica /metrics no servidor Flask do app.
+
+    A etapa 'serializar' vai do fim do callback instrumentado até a resposta
+    pronta: é o JSON que o próprio Dash monta. Com o gunicorn, cada worker
+    grava o seu registro em DIRETORIO_METRICAS e /metrics responde com a soma
+    de todos (gunicorn.conf.py define o diretório). Não faz nada com
+    SPEI_METRICAS desligado.
+    """
+    if not METRICAS_ATIVAS:
+        return
+
+    from flask import Response, g, request
+
+    servidor = app.server
+
+    @servidor.before_request
+    def iniciar_medida():
+        g.inicio_metricas = time.perf_counter()
+        _local.fim_callback = None
+
+    @servidor.after_request
+    def registrar_requisicao(resposta):
+        if request.path.endswith('/_dash-update-component') and hasattr(g, 'inicio_metricas'):
+            try:
+                saida = json.loads(request.get_data(cache=True) or b'{}').get('output', '')
+            except ValueError:
+                saida = ''
+            agora = time.perf_counter()
+            rotulos = {'etapa': 'requisicao', 'nome': saida}
+            observar('spei_latencia_segundos', rotulos, agora - g.inicio_metricas)
+            if getattr(_local, 'fim_callback', None) is not None:
+                observar('spei_latencia_segundos', {'etapa': 'serializar', 'nome': saida}, agora - _local.fim_callback)
+            observar('spei_resposta_bytes', rotulos, resposta.calculate_content_length() or 0, LIMITES_BYTES)
+        return resposta
+
+    @servidor.route('/metrics')
+    def metricas():
+        return Response(texto_prometheus(), mimetype='text/plain; version=0.0.4')
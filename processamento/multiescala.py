@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import spei as si
+from scipy.stats import fisk
+
+# Escalas de acumulação (meses) usadas operacionalmente
+ESCALAS_PADRAO = (1, 3, 6, 12, 24)
+
+
+def acumular_balanco(balanco, escalas=ESCALAS_PADRAO):
+    """Soma móvel do balanço hídrico para várias escalas a partir de uma única soma acumulada.
+
+    Retorna um DataFrame indexado por data com uma coluna por escala; os
+    primeiros (escala - 1) valores de cada coluna ficam NaN, como no rolling.
+    """
+    valores = balanco.to_numpy(dtype='float64')
+    soma = np.concatenate(([0.0], np.cumsum(valores)))
+
+    colunas = {}
+    for escala in escalas:
+        acumulado = np.full(len(valores), np.nan)
+        if escala == 1:
+            # Mantém a série original exata (sem o arredondamento da diferença de somas)
+            acumulado[:] = valores
+        elif escala <= len(valores):
+            acumulado[escala - 1:] = soma[escala:] - soma[:-escala]
+        colunas[escala] = acumulado
+
+    df = pd.DataFrame(colunas, index=balanco.index)
+    df.columns.name = 'escala'
+    return df
+
+
+# Função para calcular o SPEI de várias escalas com um único balanço hídrico
+def calcular_spei_multiescala(balanco, escalas=ESCALAS_PADRAO, dist=fisk):
+    """Calcula SPEI-1/3/6/12/24 (ou as escalas pedidas) de uma vez.
+
+    'balanco' é a série mensal P - ETP (por exemplo dados_1['dados']). O
+    balanço é acumulado uma só vez para todas as escalas e cada coluna é
+    ajustada com si.spei. Retorna uma tabela escala x tempo: índice 'data' e
+    uma coluna por escala, com NaN onde a janela ainda não está completa.
+    """
+    acumulados = acumular_balanco(balanco, escalas)
+    resultado = {}
+    for escala in escalas:
+        serie = acumulados[escala].dropna()
+        resultado[escala] = si.spei(serie, dist=dist).reindex(acumulados.index)
+
+    df = pd.DataFrame(resultado, index=acumulados.index)
+    df.columns.name = 'escala'
+    return df
@@ -0,0 +1,78 @@
+import numpy as np
+
+# Pontos por traço que cabem na largura de um gráfico do dashboard
+PONTOS_GRAFICO = 1000
+
+
+def indices_minmax(valores, n_pontos):
+    """Posições do mínimo e do máximo de cada bloco de uma série.
+
+    Divide a série em n_pontos / 2 blocos de tamanho igual e mantém os dois
+    extremos de cada um, além do primeiro e do último ponto. Os picos de seca
+    e de umidade nunca são descartados. Retorna as posições em ordem crescente.
+    """
+    valores = np.asarray(valores, dtype='float64')
+    n = len(valores)
+    if n <= n_pontos:
+        return np.arange(n)
+
+    blocos = max(n_pontos // 2, 1)
+    tamanho = -(-n // blocos)
+    preenchido = np.full(blocos * tamanho, np.nan)
+    preenchido[:n] = valores
+    preenchido = preenchido.reshape(blocos, tamanho)
+
+    # NaN não pode ser escolhido como extremo de um bloco que tem valores
+    minimos = np.argmin(np.where(np.isnan(preenchido), np.inf, preenchido), axis=1)
+    maximos = np.argmax(np.where(np.isnan(preenchido), -np.inf, preenchido), axis=1)
+    inicio = np.arange(blocos) * tamanho
+    indices = np.concatenate(([0, n - 1], inicio + minimos, inicio + maximos))
+    return np.unique(indices[indices < n])
+
+
+def indices_lttb(x, valores, n_pontos):
+    """Posições escolhidas pelo Largest-Triangle-Three-Buckets.
+
+    Preserva melhor a forma visual da curva que o min-max, mas não garante os
+    extremos; 'x' é numérico (datas em int64, por exemplo).
+    """
+    x = np.asarray(x, dtype='float64')
+    valores = np.asarray(valores, dtype='float64')
+    n = len(valores)
+    if n <= n_pontos or n_pontos < 3:
+        return np.arange(n)
+
+    limites = np.linspace(1, n - 1, n_pontos - 1).astype('int64')
+    escolhidos = np.empty(n_pontos, dtype='int64')
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_pontos - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        # Vértice seguinte: média do próximo bloco (ou o último ponto)
+        proximo_fim = limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[fim:proximo_fim].mean() if proximo_fim > fim else x[-1]
+        media_y = np.nanmean(valores[fim:proximo_fim]) if proximo_fim > fim else valores[-1]
+        areas = np.abs(
+            (x[anterior] - media_x) * (valores[inicio:fim] - valores[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - valores[anterior])
+        )
+        anterior = inicio + int(np.nanargmax(areas)) if not np.isnan(areas).all() else inicio
+        escolhidos[i + 1] = anterior
+    return escolhidos
+
+
+# Função para reduzir uma série temporal ao número de pontos que o gráfico consegue mostrar
+def reduzir_serie(serie, n_pontos=PONTOS_GRAFICO, metodo='minmax'):
+    """Retorna a série com no máximo n_pontos pontos ('minmax' ou 'lttb').
+
+    Séries menores que o limite voltam inalteradas.
+    """
+    if len(serie) <= n_pontos:
+        return serie
+    if metodo == 'minmax':
+        indices = indices_minmax(serie.to_numpy(dtype='float64'), n_pontos)
+    elif metodo == 'lttb':
+        indices = indices_lttb(serie.index.asi8, serie.to_numpy(dtype='float64'), n_pontos)
+    else:
+        raise ValueError(f"método de redução desconhecido: {metodo!r} (use 'minmax' ou 'lttb')")
+    return serie.iloc[indices]
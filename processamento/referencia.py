@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import fisk, norm
+
+from .multiescala import acumular_balanco
+
+# Período de referência climatológico padrão (normal da OMM)
+PERIODO_REFERENCIA_PADRAO = (1981, 2010)
+
+
+def ajustar_parametros(serie, dist=fisk, periodo_referencia=PERIODO_REFERENCIA_PADRAO):
+    """Ajusta a distribuição uma vez por mês do calendário nos anos de referência.
+
+    'serie' é o balanço hídrico já acumulado na escala desejada. Retorna um
+    array 12 x (número de parâmetros da distribuição), linha 0 = janeiro; meses
+    sem dados no período ficam NaN. É o mesmo ajuste MLE feito pelo si.spei.
+    """
+    inicio, fim = periodo_referencia
+    valores = serie.to_numpy(dtype='float64')
+    meses = serie.index.month
+    anos = serie.index.year
+    parametros = np.full((12, dist.numargs + 2), np.nan)
+    for mes in range(1, 13):
+        referencia = valores[(meses == mes) & (anos >= inicio) & (anos <= fim)]
+        referencia = referencia[~np.isnan(referencia)]
+        if len(referencia) == 0:
+            continue
+        parametros[mes - 1] = dist.fit(referencia, scale=np.std(referencia), method='MLE')
+    return parametros
+
+
+def aplicar_parametros(serie, parametros, dist=fisk):
+    """Transforma a série acumulada em SPEI com parâmetros já ajustados.
+
+    Custo proporcional ao tamanho de 'serie': não há novo ajuste.
+    """
+    valores = serie.to_numpy(dtype='float64')
+    meses = serie.index.month
+    resultado = np.full(len(valores), np.nan)
+    for mes in np.unique(meses):
+        if np.isnan(parametros[mes - 1]).any():
+            continue
+        do_mes = meses == mes
+        resultado[do_mes] = norm.ppf(dist.cdf(valores[do_mes], *parametros[mes - 1]))
+    return pd.Series(resultado, index=serie.index, dtype=float)
+
+
+def _acumular(balanco, escala):
+    return balanco if escala == 1 else acumular_balanco(balanco, [escala])[escala].dropna()
+
+
+# Parâmetros congelados: ajusta uma vez no período de referência e grava em disco
+def congelar_parametros(balanco, caminho, escala=1, dist=fisk, periodo_referencia=PERIODO_REFERENCIA_PADRAO):
+    """Ajusta os parâmetros do balanço hídrico na escala pedida e grava em 'caminho' (.npz).
+
+    Retorna o array de parâmetros (12 x número de parâmetros).
+    """
+    parametros = ajustar_parametros(_acumular(balanco, escala), dist, periodo_referencia)
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    temporario = f'{caminho}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as saida:
+        np.savez(saida, parametros=parametros, escala=escala, dist=dist.name,
+                 periodo_referencia=np.array(periodo_referencia))
+    os.replace(temporario, caminho)
+    return parametros
+
+
+def carregar_parametros(caminho, dist=fisk):
+    """Lê parâmetros gravados por congelar_parametros.
+
+    Retorna (parametros, escala, periodo_referencia); ValueError se foram
+    ajustados com outra distribuição.
+    """
+    with np.load(caminho, allow_pickle=False) as npz:
+        if str(npz['dist']) != dist.name:
+            raise ValueError(f'{caminho} foi ajustado com {npz["dist"]}, não com {dist.name}')
+        return npz['parametros'], int(npz['escala']), tuple(int(ano) for ano in npz['periodo_referencia'])
+
+
+# Função para estender o SPEI com os meses novos sem reajustar a distribuição
+def atualizar_spei(balanco, spei_anterior, parametros, escala=1, dist=fisk):
+    """Acrescenta a 'spei_anterior' o SPEI dos meses de 'balanco' posteriores a ele.
+
+    Usa os parâmetros congelados, portanto o custo é O(meses novos) e os
+    valores históricos não mudam. Só as últimas (escala - 1) datas anteriores
+    são relidas para completar a janela de acumulação. Com 'spei_anterior'
+    vazio calcula a série inteira.
+    """
+    if len(spei_anterior) == 0:
+        return aplicar_parametros(_acumular(balanco, escala), parametros, dist)
+    ultima = spei_anterior.index[-1]
+    posicao = balanco.index.searchsorted(ultima, side='right')
+    if posicao == len(balanco):
+        return spei_anterior
+    trecho = balanco.iloc[max(posicao - (escala - 1), 0):]
+    novos = aplicar_parametros(_acumular(trecho, escala), parametros, dist)
+    return pd.concat([spei_anterior, novos[novos.index > ultima]])
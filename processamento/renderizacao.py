@@ -0,0 +1,143 @@
+import contextlib
+import io
+import os
+import runpy
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.graph_objs as go
+import plotly.io as pio
+
+from .cache_spei import chave_spei
+
+# Scripts que gravam as figuras estáticas da dissertação, na ordem em que eram rodados.
+# Quando dois scripts gravam o mesmo arquivo, vale o último da lista.
+SCRIPTS_FIGURAS = (
+    'graficoLinha.py',
+    'grafico_baras_seca.py',
+    'Porcentagem_ocorrencia _spei.py',
+    'porcentagem_spei.py',
+    'porcentagem_por_decada_spei.py',
+    'porcentagem_por_decada_spei_novo.py',
+    'boxplot_periodos.py',
+    'temperatura_maxima.py',
+    'temperatura_maxima_mensal.py',
+)
+
+# Funções de processamento compartilhadas pelos scripts; no lote cada resultado é calculado uma vez
+FUNCOES_COMPARTILHADAS = ('extrair_dados', 'extrair_etp_prp', 'extrair_tmax', 'spei_em_cache')
+
+
+def _chave_argumentos(nome, args, kwargs):
+    if nome == 'spei_em_cache':
+        # A série de balanço não é hashável; a chave é a mesma do cache em disco
+        balanco, *resto = args
+        return chave_spei(balanco, *resto, **{k: v for k, v in kwargs.items() if k in ('escala', 'dist', 'periodo_referencia')})
+    return (args, tuple(sorted(kwargs.items())))
+
+
+def _memoizada(nome, funcao, resultados, registrar_leitura):
+    def memoizada(*args, **kwargs):
+        for valor in (*args, *kwargs.values()):
+            if isinstance(valor, (str, os.PathLike)) and os.path.isfile(valor):
+                registrar_leitura(os.fspath(valor))
+        chave = (nome, _chave_argumentos(nome, args, kwargs))
+        if chave not in resultados:
+            resultados[chave] = funcao(*args, **kwargs)
+        # Os scripts acrescentam colunas aos frames; cada um recebe a sua cópia
+        return resultados[chave].copy()
+    return memoizada
+
+
+@contextlib.contextmanager
+def _substituido(objeto, nome, valor):
+    original = getattr(objeto, nome)
+    setattr(objeto, nome, valor)
+    try:
+        yield
+    finally:
+        setattr(objeto, nome, original)
+
+
+# Função para executar os scripts uma vez, no mesmo processo, guardando as figuras em vez de gravá-las
+def coletar_figuras(scripts=SCRIPTS_FIGURAS, destino=None, resultados=None, dependencias=None):
+    """Roda cada script com fig.show() desligado e fig.write_image() interceptado.
+
+    As planilhas, o balanço hídrico e o SPEI são calculados uma única vez e
+    compartilhados por todos os scripts ('resultados' guarda esses
+    intermediários e pode ser reaproveitado entre chamadas). Retorna uma
+    lista de dicts com 'script', 'arquivo', 'figura' (JSON do plotly) e
+    'opcoes' (largura, altura, escala...) de cada imagem, na ordem de
+    gravação; 'destino' troca a pasta dos arquivos. Se 'dependencias' for
+    um dict, recebe o conjunto de planilhas lidas por cada script.
+    """
+    import processamento
+
+    resultados = {} if resultados is None else resultados
+    figuras = []
+    script_atual = [None]
+    dependencias = {} if dependencias is None else dependencias
+
+    def registrar_leitura(caminho):
+        dependencias.setdefault(script_atual[0], set()).add(caminho)
+
+    def gravar(figura, arquivo, *args, **opcoes):
+        if args:
+            opcoes['format'] = args[0]
+        arquivo = os.fspath(arquivo)
+        if destino is not None:
+            arquivo = os.path.join(destino, os.path.basename(arquivo))
+        figuras.append({'script': script_atual[0], 'arquivo': arquivo, 'figura': figura.to_plotly_json(), 'opcoes': opcoes})
+
+    with contextlib.ExitStack() as pilha:
+        pilha.enter_context(_substituido(go.Figure, 'show', lambda figura, *args, **kwargs: None))
+        pilha.enter_context(_substituido(go.Figure, 'write_image', gravar))
+        for nome in FUNCOES_COMPARTILHADAS:
+            funcao = getattr(processamento, nome)
+            pilha.enter_context(_substituido(processamento, nome, _memoizada(nome, funcao, resultados, registrar_leitura)))
+
+        for script in scripts:
+            script_atual[0] = script
+            # Os scripts anunciam os arquivos "salvos"; no lote quem grava é exportar_figuras
+            with contextlib.redirect_stdout(io.StringIO()):
+                runpy.run_path(script, run_name='__figuras__')
+    return figuras
+
+
+def arquivos_finais(figuras):
+    """Mantém só a última figura de cada arquivo, como se os scripts rodassem em sequência."""
+    finais = {}
+    for figura in figuras:
+        finais.pop(figura['arquivo'], None)
+        finais[figura['arquivo']] = figura
+    return list(finais.values())
+
+
+def _aquecer_exportador():
+    # O kaleido mantém um único Chromium vivo por processo; a primeira imagem o inicia
+    pio.to_image(go.Figure(), format='png', width=10, height=10)
+
+
+def _exportar(figura):
+    pio.write_image(figura['figura'], figura['arquivo'], **figura['opcoes'])
+    return figura['arquivo']
+
+
+# Função para gravar as imagens com um exportador aquecido por processo
+def exportar_figuras(figuras, processos=None):
+    """Grava as figuras coletadas em PNG (ou no formato de cada arquivo).
+
+    Com processos=1 tudo sai do processo atual por um único kaleido; com
+    mais, cada processo do pool aquece o seu kaleido uma vez e recebe uma
+    parte das figuras. Retorna os arquivos gravados, na ordem de 'figuras'.
+    """
+    if pio.kaleido.scope is None:
+        raise RuntimeError('a exportação de imagens requer o pacote kaleido (pip install kaleido)')
+    figuras = arquivos_finais(figuras)
+    for pasta in {os.path.dirname(figura['arquivo']) for figura in figuras} - {''}:
+        os.makedirs(pasta, exist_ok=True)
+
+    processos = min(processos or os.cpu_count() or 1, len(figuras))
+    if processos <= 1:
+        return [_exportar(figura) for figura in figuras]
+    with ProcessPoolExecutor(processos, initializer=_aquecer_exportador) as pool:
+        return list(pool.map(_exportar, figuras))
@@ -0,0 +1,193 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# Climatologia mensal (média e desvio de jan a dez) das planilhas de Paragominas, 1981-2022
+CLIMATOLOGIA = {
+    'ETP': (
+        (91.62, 89.95, 91.85, 93.29, 92.17, 89.35, 90.77, 97.19, 104.52, 109.64, 107.04, 101.18),
+        (2.03, 2.05, 1.95, 1.96, 1.79, 1.56, 1.60, 1.88, 2.60, 3.45, 3.86, 3.10),
+    ),
+    'PRP': (
+        (263.31, 311.90, 411.48, 327.38, 210.10, 83.36, 56.81, 43.33, 38.14, 56.62, 86.93, 147.79),
+        (80.87, 69.41, 101.30, 80.82, 82.60, 39.52, 27.65, 24.13, 17.77, 21.75, 59.16, 51.33),
+    ),
+    'TMAX': (
+        (30.68, 30.11, 30.11, 30.66, 31.37, 31.74, 32.09, 32.53, 32.79, 33.09, 32.83, 32.21),
+        (0.60, 0.59, 0.55, 0.55, 0.51, 0.47, 0.45, 0.47, 0.70, 0.81, 0.95, 0.84),
+    ),
+}
+
+# Nome do arquivo, título e unidade de cada variável, como nas exportações do TerraClimate
+VARIAVEIS = {
+    'ETP': ('ETP_HARVREAVES_TERRACLIMATE', 'Hargreaves Potential Evapotranspiration (TerraClimate)', 'mm'),
+    'PRP': ('PRP_TERRACLIMATE', 'Precipitation (TerraClimate)', 'mm'),
+    'TMAX': ('TMAX_TERRACLIMATE', 'Maximum Temperature (TerraClimate)', 'deg C'),
+}
+
+# Tamanho das planilhas atuais: uma estação, 42 anos mensais (504 valores por variável)
+ANO_INICIAL = 1981
+ANOS_ATUAIS = 42
+
+# Escalas em relação ao conjunto atual (504 valores por variável) e os
+# parâmetros de gerar_series que chegam a elas: 100x é uma grade regional
+# mensal; 10000x é uma rede de estações diárias (330 x 15.340 dias, ~10.044x)
+ESCALAS_SINTETICAS = {
+    1: {'estacoes': 1, 'anos': ANOS_ATUAIS, 'frequencia': 'mensal'},
+    100: {'estacoes': 100, 'anos': ANOS_ATUAIS, 'frequencia': 'mensal'},
+    10000: {'estacoes': 330, 'anos': ANOS_ATUAIS, 'frequencia': 'diaria'},
+}
+
+
+def _anomalia_mensal(rng, n_meses, estacoes, persistencia=0.6):
+    # AR(1) mês a mês: secas e anos chuvosos duram várias estações, como na série real
+    ruido = rng.standard_normal((n_meses, estacoes))
+    escala = np.sqrt(1 - persistencia ** 2)
+    # a[i] = persistencia * a[i-1] + escala * ruido[i] como filtro recursivo, todas as
+    # estações de uma vez; o estado inicial faz a[0] = ruido[0]
+    inicial = ((1 - escala) * ruido[:1]) if n_meses else np.zeros((1, estacoes))
+    return lfilter([escala], [1, -persistencia], ruido, axis=0, zi=inicial)[0]
+
+
+def _mascara_falhas(rng, n, estacoes, falhas, duracao_falha):
+    # Falhas em blocos contíguos (estação parada), cobrindo em média a fração 'falhas' da série
+    mascara = np.zeros((n, estacoes), dtype=bool)
+    if falhas <= 0:
+        return mascara
+    n_falhas = rng.poisson(falhas * n / duracao_falha, size=estacoes)
+    # Todas as falhas de todas as estações juntas: +1 no início e -1 no fim de
+    # cada bloco, e a soma acumulada por coluna marca os passos dentro de algum
+    estacao = np.repeat(np.arange(estacoes), n_falhas)
+    inicios = rng.integers(0, n, size=len(estacao))
+    duracoes = rng.geometric(1 / duracao_falha, size=len(estacao))
+    marcas = np.zeros((n + 1, estacoes), dtype='int64')
+    np.add.at(marcas, (inicios, estacao), 1)
+    np.add.at(marcas, (np.minimum(inicios + duracoes, n), estacao), -1)
+    return np.cumsum(marcas[:-1], axis=0) > 0
+
+
+# Função para gerar séries sintéticas de ETP, precipitação e TMAX com a forma das planilhas do TerraClimate
+def gerar_series(estacoes=1, anos=ANOS_ATUAIS, ano_inicial=ANO_INICIAL, frequencia='mensal',
+                 falhas=0.0, duracao_falha=3, semente=0):
+    """Retorna {'ETP': df, 'PRP': df, 'TMAX': df}, cada DataFrame indexado por 'data'
+    com uma coluna por estação ('estacao_00000', ...).
+
+    A sazonalidade segue a climatologia de Paragominas; cada estação recebe um
+    deslocamento próprio e uma anomalia persistente (AR(1)) que deixa a
+    precipitação baixa e a ETP e a TMAX altas nos mesmos meses, de modo que o
+    SPEI tem secas e períodos úmidos plausíveis. 'frequencia' é 'mensal' ou
+    'diaria'; 'falhas' é a fração aproximada de valores ausentes (NaN), em
+    blocos de 'duracao_falha' passos em média. A mesma semente gera sempre os
+    mesmos valores.
+    """
+    if frequencia not in ('mensal', 'diaria'):
+        raise ValueError(f"frequência desconhecida: {frequencia!r} (use 'mensal' ou 'diaria')")
+
+    rng = np.random.default_rng(semente)
+    meses = pd.date_range(f'{ano_inicial}-01-01', periods=anos * 12, freq='MS')
+    mes = meses.month.to_numpy() - 1
+    anomalia = _anomalia_mensal(rng, len(meses), estacoes)
+
+    media, desvio = (np.asarray(valor) for valor in CLIMATOLOGIA['PRP'])
+    variacao = desvio / media
+    fator_chuva = rng.uniform(0.7, 1.3, size=estacoes)
+    # Log-normal com a média e o coeficiente de variação de cada mês do calendário
+    prp = (media[mes] * np.exp(variacao[mes] * anomalia.T - variacao[mes] ** 2 / 2)).T * fator_chuva
+
+    mensais = {'PRP': prp}
+    for nome, deslocamento in (('ETP', 5.0), ('TMAX', 1.5)):
+        media, desvio = (np.asarray(valor) for valor in CLIMATOLOGIA[nome])
+        proprio = rng.standard_normal((len(meses), estacoes))
+        mensais[nome] = (
+            media[mes, None]
+            + desvio[mes, None] * (-0.6 * anomalia + 0.8 * proprio)
+            + rng.uniform(-deslocamento, deslocamento, size=estacoes)
+        )
+    # Aquecimento de cerca de 0,2 °C por década
+    mensais['TMAX'] += 0.02 * (meses.year.to_numpy() - ano_inicial)[:, None]
+
+    if frequencia == 'mensal':
+        datas, series = meses, mensais
+    else:
+        datas = pd.date_range(meses[0], meses[-1] + pd.offsets.MonthEnd(0), freq='D')
+        posicao = (datas.year.to_numpy() - ano_inicial) * 12 + datas.month.to_numpy() - 1
+        dias_no_mes = datas.days_in_month.to_numpy()[:, None]
+        series = {
+            'ETP': mensais['ETP'][posicao] / dias_no_mes * rng.uniform(0.85, 1.15, size=(len(datas), estacoes)),
+            'TMAX': mensais['TMAX'][posicao] + rng.normal(0, 1.0, size=(len(datas), estacoes)),
+        }
+        # Chuva diária intermitente: mais dias de chuva nos meses chuvosos, total mensal preservado em média
+        probabilidade = np.clip(mensais['PRP'][posicao] / 400, 0.1, 0.85)
+        chove = rng.random((len(datas), estacoes)) < probabilidade
+        series['PRP'] = np.where(
+            chove,
+            mensais['PRP'][posicao] / dias_no_mes / probabilidade * rng.exponential(1.0, size=(len(datas), estacoes)),
+            0.0,
+        )
+
+    ausentes = _mascara_falhas(rng, len(datas), estacoes, falhas, duracao_falha)
+    colunas = [f'estacao_{i:05d}' for i in range(estacoes)]
+    indice = pd.DatetimeIndex(datas, name='data')
+    return {
+        nome: pd.DataFrame(np.where(ausentes, np.nan, np.round(valores, 2)), index=indice, columns=colunas)
+        for nome, valores in series.items()
+    }
+
+
+def gravar_csv(caminho, df):
+    """Grava no formato 'AAAA-MM-DD;256,00[;...]' lido por ler_csv_br (uma coluna por estação)."""
+    df.to_csv(caminho, sep=';', decimal=',', header=False, float_format='%.2f', date_format='%Y-%m-%d')
+
+
+def gravar_xlsx(caminho, serie, variavel, local='paragominas'):
+    """Grava uma estação no layout das planilhas do TerraClimate (título, descrição, pares data/valor)."""
+    _, titulo, unidade = VARIAVEIS[variavel]
+    periodo = f'{serie.index[0]:%b %Y} to {serie.index[-1]:%b %Y}'
+    descricao = f'({unidade}) {titulo} at {local}, {periodo}'
+    planilha = pd.DataFrame({
+        titulo: [descricao] + list(serie.index.strftime('%Y-%m-%d')),
+        '': [np.nan] + serie.tolist(),
+    })
+    planilha.to_excel(caminho, index=False)
+
+
+# Função para gravar um conjunto sintético nos layouts que os leitores do projeto esperam
+def gravar_conjunto(diretorio, series, individuais=None, formatos=('csv', 'xlsx'), parametros=None):
+    """Grava 'series' (saída de gerar_series) em 'diretorio'.
+
+    - <diretorio>/<VARIAVEL>.CSV: todas as estações, uma coluna cada (ler_csv_br);
+    - <diretorio>/estacao_NNNNN/<VARIAVEL>.xlsx e .CSV: uma estação por pasta,
+      com os mesmos nomes de dados/, para apontar os scripts para a pasta.
+
+    'individuais' limita quantas estações ganham pasta própria (todas por
+    padrão); 'parametros' vai para parametros.json, para reproduzir o conjunto.
+    Retorna a lista de arquivos gravados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    gravados = []
+    for variavel, df in series.items():
+        nome = VARIAVEIS[variavel][0]
+        if 'csv' in formatos:
+            caminho = os.path.join(diretorio, f'{nome}.CSV')
+            gravar_csv(caminho, df)
+            gravados.append(caminho)
+
+        for coluna in df.columns[:individuais]:
+            pasta = os.path.join(diretorio, coluna)
+            os.makedirs(pasta, exist_ok=True)
+            if 'xlsx' in formatos:
+                caminho = os.path.join(pasta, f'{nome}.xlsx')
+                gravar_xlsx(caminho, df[coluna], variavel, local=coluna)
+                gravados.append(caminho)
+            if 'csv' in formatos:
+                caminho = os.path.join(pasta, f'{nome}.CSV')
+                gravar_csv(caminho, df[[coluna]])
+                gravados.append(caminho)
+
+    if parametros is not None:
+        with open(os.path.join(diretorio, 'parametros.json'), 'w', encoding='utf-8') as arquivo:
+            json.dump(parametros, arquivo, ensure_ascii=False, indent=2)
+    return gravados
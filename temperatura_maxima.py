@@ -2,15 +2,7 @@ import pandas as pd
 import plotly.graph_objs as go
 import plotly.io as pio  # Para salvar a imagem
 import os
-
-# Função para extrair dados de precipitação (sem alterações)
-def extrair_tmax(path_tmax):
-    df_tmax = pd.read_excel(path_tmax, engine='openpyxl').rename(columns={'Maximum Temperature (TerraClimate)': 'data', 'Unnamed: 1': 'TMAX'})
-    df_tmax = df_tmax.iloc[1:].reset_index(drop=True)
-    df_tmax['data'] = pd.to_datetime(df_tmax['data'], format='%Y-%m-%d')
-    df_tmax['Ano'] = df_tmax['data'].dt.year
-    df_tmax['Mes'] = df_tmax['data'].dt.month
-    return df_tmax
+from processamento import DECADAS, agregar_intervalos, extrair_tmax, intervalos_anuais
 
 # Caminho do arquivo de dados
 file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
@@ -18,27 +10,16 @@ file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
 # Extrair os dados
 tmax = extrair_tmax(file_path_tmax)
 
-# Definir os intervalos de tempo (1981-1990, 1991-2000, 2001-2010, 2011-2020)
-intervalos = [(1981, 1990), (1991, 2000), (2001, 2010), (2011, 2020)]
-
-# Calcular as estatísticas de temperatura (mínimo, médio, máximo) para cada intervalo
-estatisticas_intervalos = []
-
-for inicio, fim in intervalos:
-    dados_intervalo = tmax[(tmax['Ano'] >= inicio) & (tmax['Ano'] <= fim)]
-    
-    # Calcular estatísticas (mínimo, médio, máximo) para cada intervalo de 10 anos
-    estatisticas = {
-        'Intervalo': f'{inicio}-{fim}',
-        'Mínimo': dados_intervalo['TMAX'].min(),
-        'Média': dados_intervalo['TMAX'].mean(),
-        'Máximo': dados_intervalo['TMAX'].max()
-    }
-    
-    estatisticas_intervalos.append(estatisticas)
+# Calcular as estatísticas de temperatura (mínimo, médio, máximo) para cada década (1981-1990 a 2011-2020)
+estatisticas = agregar_intervalos(tmax.set_index('data')['TMAX'], *intervalos_anuais(DECADAS))
 
-# Converter para DataFrame
-df_estatisticas = pd.DataFrame(estatisticas_intervalos)
+# Converter para o DataFrame usado no gráfico
+df_estatisticas = pd.DataFrame({
+    'Intervalo': estatisticas.index.astype(str),
+    'Mínimo': estatisticas['minimo'].to_numpy(),
+    'Média': estatisticas['media'].to_numpy(),
+    'Máximo': estatisticas['maximo'].to_numpy(),
+})
 
 # Criar o gráfico de linha
 fig = go.Figure()
@@ -2,15 +2,7 @@ import pandas as pd
 import plotly.graph_objs as go
 import plotly.io as pio
 import os
-
-# Função para extrair dados de temperatura máxima
-def extrair_tmax(path_tmax):
-    df_tmax = pd.read_excel(path_tmax, engine='openpyxl').rename(columns={'Maximum Temperature (TerraClimate)': 'data', 'Unnamed: 1': 'TMAX'})
-    df_tmax = df_tmax.iloc[1:].reset_index(drop=True)
-    df_tmax['data'] = pd.to_datetime(df_tmax['data'], format='%Y-%m-%d')
-    df_tmax['Ano'] = df_tmax['data'].dt.year
-    df_tmax['Mes'] = df_tmax['data'].dt.month
-    return df_tmax
+from processamento import climatologia, extrair_tmax
 
 # Caminho do arquivo de dados
 file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
@@ -18,27 +10,16 @@ file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
 # Extrair os dados
 tmax = extrair_tmax(file_path_tmax)
 
-# Calcular as estatísticas de temperatura (mínimo, média, máximo) para cada mês ao longo dos anos
-estatisticas_mensais = []
-
-for mes in range(1, 13):  # Para cada mês de 1 a 12
-    dados_mes = tmax[tmax['Mes'] == mes]
-    
-    # Calcular as estatísticas (mínimo, média, máximo) para cada mês
-    minimo = dados_mes['TMAX'].min()
-    media = dados_mes['TMAX'].mean()
-    maximo = dados_mes['TMAX'].max()
-    
-    # Adicionar as estatísticas ao array
-    estatisticas_mensais.append({
-        'Mês': mes,
-        'Mínimo': minimo,
-        'Média': media,
-        'Máximo': maximo
-    })
+# Calcular as estatísticas de temperatura (mínimo, média, máximo) de todos os meses em uma única passada
+climatologia_tmax = climatologia(tmax.set_index('data')['TMAX'], ('minimo', 'media', 'maximo'))
 
-# Converter para DataFrame
-df_estatisticas_mensais = pd.DataFrame(estatisticas_mensais)
+# Converter para o DataFrame usado no gráfico
+df_estatisticas_mensais = pd.DataFrame({
+    'Mês': climatologia_tmax.index,
+    'Mínimo': climatologia_tmax['minimo'].to_numpy(),
+    'Média': climatologia_tmax['media'].to_numpy(),
+    'Máximo': climatologia_tmax['maximo'].to_numpy(),
+})
 
 # Inicializar a figura do gráfico
 fig = go.Figure()
@@ -1,66 +1,23 @@
 import pandas as pd
-import spei as si
 import plotly.graph_objs as go
-
-# Função de categorização de SPEI
-def categorizar_spei(spei_value):
-    if spei_value >= 2.00:
-        return 'Umidade extrema'
-    elif 1.50 <= spei_value < 2.00:
-        return 'Umidade severa'
-    elif 1.00 <= spei_value < 1.50:
-        return 'Umidade moderada'
-    elif 0 <= spei_value < 1.00:
-        return 'Umidade fraca'
-    elif -0.99 <= spei_value < 0:
-        return 'Seca fraca'
-    elif -1.50 <= spei_value < -1.00:
-        return 'Seca moderada'
-    elif -1.99 <= spei_value < -1.50:
-        return 'Seca severa'
-    else:
-        return 'Seca extrema'
-
-# Função para extrair os dados e calcular o balanço hídrico
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    # Leitura dos arquivos ETP e PRP
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-    
-    # Mesclando as duas tabelas pelo campo 'data'
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-    
-    # Calculando o balanço hídrico acumulado
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-    
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-    
-    return df_preparado
+from processamento import extrair_dados, categorizar_spei, spei_em_cache
 
 # Função para calcular o SPEI
 def calcular_spei(dados):
-    spei_resultado = si.spei(pd.Series(dados))
+    spei_resultado = spei_em_cache(pd.Series(dados))
     return spei_resultado
 
 # Função para calcular a porcentagem de cada categoria de SPEI por ano
 def calcular_porcentagens_por_ano(spei_values, spei_index):
     # Categorizar os valores de SPEI
-    categorias = [categorizar_spei(spei) for spei in spei_values]
+    categorias = categorizar_spei(spei_values)
     
     # Criar um DataFrame com as categorias
     df_categorias = pd.DataFrame(categorias, columns=['categoria'])
     df_categorias['ano'] = spei_index.year  # Aqui estamos utilizando o índice para extrair o ano
     
     # Calcular a porcentagem de cada categoria por ano
-    porcentagens_ano = df_categorias.groupby(['ano', 'categoria']).size().unstack(fill_value=0)
+    porcentagens_ano = df_categorias.groupby(['ano', 'categoria'], observed=False).size().unstack(fill_value=0)
     porcentagens_ano = porcentagens_ano.div(porcentagens_ano.sum(axis=1), axis=0) * 100
     
     return porcentagens_ano
@@ -100,7 +57,7 @@ def criar_grafico(porcentagens_ano):
     fig.add_trace(go.Bar(
         x=porcentagens_ano.index, 
         y=porcentagens_ano['Seca fraca'], 
-        name='Seca Fraca (-0.99 <= SPEI < 0)', 
+        name='Seca Fraca (-1.00 <= SPEI < 0)', 
         marker=dict(color='#f87171')
     ))
     fig.add_trace(go.Bar(
@@ -112,7 +69,7 @@ def criar_grafico(porcentagens_ano):
     fig.add_trace(go.Bar(
         x=porcentagens_ano.index, 
         y=porcentagens_ano['Seca severa'], 
-        name='Seca Severa (-1.99 <= SPEI < -1.50)', 
+        name='Seca Severa (-2.00 <= SPEI < -1.50)', 
         marker=dict(color='#991b1b')
     ))
     fig.add_trace(go.Bar(
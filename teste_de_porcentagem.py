@@ -1,49 +1,6 @@
 import pandas as pd
-import spei as si
 import plotly.graph_objs as go
-
-# Função de categorização de SPEI
-def categorizar_spei(spei_value):
-    if spei_value >= 2.00:
-        return 'Umidade extrema'
-    elif 1.50 <= spei_value < 2.00:
-        return 'Umidade severa'
-    elif 1.00 <= spei_value < 1.50:
-        return 'Umidade moderada'
-    elif 0 <= spei_value < 1.00:
-        return 'Umidade fraca'
-    elif -0.99 <= spei_value < 0:
-        return 'Seca fraca'
-    elif -1.50 <= spei_value < -1.00:
-        return 'Seca moderada'
-    elif -1.99 <= spei_value < -1.50:
-        return 'Seca severa'
-    else:
-        return 'Seca extrema'
-
-# Função para extrair os dados e calcular o balanço hídrico
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    # Leitura dos arquivos ETP e PRP
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-    
-    # Mesclando as duas tabelas pelo campo 'data'
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-    
-    # Calculando o balanço hídrico acumulado
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-    
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-    
-    return df_preparado
+from processamento import construir_indice, contagens_intervalo, extrair_dados, porcentagens_intervalo, spei_em_cache
 
 # Caminhos dos arquivos de ETP e PRP
 file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
@@ -51,23 +8,17 @@ file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
 
 # Extração dos dados e cálculo do SPEI
 dados_1 = extrair_dados(file_path_etp, file_path_prp, acumulado=1)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
-
-# Categorizar os valores de SPEI e criar uma coluna com as categorias
-categorias = [categorizar_spei(spei) for spei in spei_1]
-df_spei = pd.DataFrame({'SPEI': spei_1, 'Categoria': categorias})
-
-# Contar as ocorrências de cada categoria
-contagem_categorias = df_spei['Categoria'].value_counts()
+spei_1 = spei_em_cache(dados_1['dados'])
 
-# Calcular a porcentagem de cada categoria
-total = len(df_spei)
-porcentagem_categorias = (contagem_categorias / total) * 100
+# Contagem e porcentagem de cada categoria no período inteiro, a partir do índice anual
+indice_spei = construir_indice(spei_1)
+contagem_categorias = contagens_intervalo(indice_spei, spei_1.index.year.min(), spei_1.index.year.max())
+porcentagem_categorias = porcentagens_intervalo(indice_spei, spei_1.index.year.min(), spei_1.index.year.max())
 
-# Criar uma tabela com as porcentagens
+# Criar uma tabela com as porcentagens (da categoria mais frequente para a menos)
 tabela_porcentagem = pd.DataFrame({'Categoria': contagem_categorias.index, 
                                    'Contagem': contagem_categorias.values, 
-                                   'Porcentagem': porcentagem_categorias.values})
+                                   'Porcentagem': porcentagem_categorias.values}).sort_values('Contagem', ascending=False, ignore_index=True)
 
 # Exibir a tabela de porcentagens
 print(tabela_porcentagem)
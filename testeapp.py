@@ -1,84 +1,206 @@
 import dash
 import os
-from dash import Input, Output, dcc, html
-import spei as si
+from dash import Input, Output, Patch, ctx, dcc, html
 import pandas as pd
 import plotly.graph_objs as go
 import plotly.express as px
 import dash_bootstrap_components as dbc
 from datetime import datetime
+from functools import lru_cache
+from processamento import balanco_hidrico, carregar_conjunto, etp_prp, construir_indice, porcentagens_por_ano, reduzir_serie, spei_em_cache, climatologia, detectar_eventos, formatar_eventos, traco_eventos, LIMIAR_SECA, PONTOS_GRAFICO, estatisticas_caixa, tracos_caixa, contar_histograma, traco_histograma, instrumentar, medir_etapa, registrar_cache, registrar_metricas
+from processamento.cliente import MODO_CLIENTE, registrar_modo_cliente
 
-# Função para extrair dados (sem alterações)
-def extrair_dados(path_etp, path_prp, acumulado=1):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'dados'})
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
-
-    df_merged = pd.merge(df_etp, df_prp, on='data', suffixes=('_etp', '_prp'))
-    df_merged['balanco_hidrico'] = df_merged['dados_prp'] - df_merged['dados_etp']
-    df_merged['data'] = pd.to_datetime(df_merged['data'], format='%Y-%m-%d')
-
-    df = pd.DataFrame({'data': df_merged['data'], 'dados': pd.to_numeric(df_merged['balanco_hidrico'])})
-    df.set_index('data', inplace=True)
-
-    df_preparado = pd.DataFrame({'data': df['dados'].rolling(acumulado).sum().dropna().index,
-                                  'dados': df['dados'].rolling(acumulado).sum().dropna().values})
-    df_preparado.set_index('data', inplace=True)
-
-    return df_preparado
-
-# Função para extrair dados somente de ETP e precipitação (sem alterações)
-def extrair_etp_prp(path_etp, path_prp):
-    df_etp = pd.read_excel(path_etp).rename(columns={'Hargreaves Potential Evapotranspiration (TerraClimate)': 'data', 'Unnamed: 1': 'ETP'})
-    df_prp = pd.read_excel(path_prp).rename(columns={'Precipitation (TerraClimate)': 'data', 'Unnamed: 1': 'Precipitação'})
+# Caminhos dos arquivos
+file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
+file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
+file_path_tmax = 'dados/TMAX_TERRACLIMATE.xlsx'
+
+# Extração dos dados e cálculo do SPEI: cada planilha é lida uma única vez e o
+# balanço hídrico e a visão ETP/Precipitação derivam do mesmo frame
+with medir_etapa('carga'):
+    conjunto = carregar_conjunto(file_path_etp, file_path_prp, file_path_tmax)
+    dados_1 = balanco_hidrico(conjunto, 1)
+    df_etp_prp = etp_prp(conjunto)
+with medir_etapa('spei'):
+    spei_1 = spei_em_cache(dados_1['dados'])
+# Contagens por categoria acumuladas por ano: a porcentagem de qualquer intervalo sai em O(1)
+with medir_etapa('categorias'):
+    indice_spei = construir_indice(spei_1)
+# Eventos de seca (teoria de corridas) da série inteira; cada intervalo só filtra a tabela
+with medir_etapa('eventos'):
+    eventos_spei = detectar_eventos(spei_1, LIMIAR_SECA)
+
+# Quantos intervalos de anos mantêm as figuras prontas em memória
+TAMANHO_CACHE_FIGURAS = int(os.environ.get('CACHE_FIGURAS', 64))
 
-    df_etp = df_etp.iloc[1:].reset_index(drop=True)
-    df_prp = df_prp.iloc[1:].reset_index(drop=True)
+# Função para filtrar os anos (sem alterações)
+def filtrar_por_ano(spei, ano_inicial, ano_final):
+    return spei[(spei.index.year >= ano_inicial) & (spei.index.year <= ano_final)]
 
-    df_etp['data'] = pd.to_datetime(df_etp['data'], format='%Y-%m-%d')
-    df_prp['data'] = pd.to_datetime(df_prp['data'], format='%Y-%m-%d')
+# Layouts fixos de cada gráfico: vão para o navegador uma única vez, com a
+# página, e os callbacks atualizam apenas os dados (Patch)
+font_style = dict(family='Arial, sans-serif', size=12, color='black')
+
+LAYOUT_LINHA = go.Layout(
+    xaxis={
+        'title': 'Data',
+        'title_font': dict(color='black', size=14),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',
+    },
+    yaxis={
+        'title': 'SPEI',
+        'range': [-3, 3],
+        'title_font': dict(color='black', size=14),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    font=dict(color='black', size=12),  # Tamanho da fonte,
+    margin=dict(t=40, l=50, r=40, b=50),  # Margens
+    legend=dict(title='Legenda', font=font_style)
+)
 
-    df_merged = pd.merge(df_etp, df_prp, on='data', how='inner')
-    df_merged.set_index('data', inplace=True)
+LAYOUT_BARRAS = go.Layout(
+    barmode='stack',
+    xaxis={
+        'title': 'Ano',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',
+    },
+    yaxis={
+        'title': 'Porcentagem',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    font=dict(color='black', size=12),  # Tamanho da fonte
+    legend=dict(traceorder='normal', font=dict(size=12)),  # Tamanho da fonte da legenda
+    margin=dict(t=20, l=40, r=40, b=40),  # Margens
+    bargap=0.1  # Espaçamento entre as barras
+)
 
-    return df_merged
+LAYOUT_MEDIA_MENSAL = go.Layout(
+    xaxis={
+        'title': 'Meses',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',  # Cor da grade
+    },
+    yaxis={
+        'title': 'SPEI',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    font=dict(color='black', size=12),  # Tamanho da fonte
+    margin=dict(t=20, l=40, r=25, b=40),  # Margens
+)
 
-# Caminhos dos arquivos (sem alterações)
-file_path_etp = 'dados/ETP_HARVREAVES_TERRACLIMATE.xlsx'
-file_path_prp = 'dados/PRP_TERRACLIMATE.xlsx'
+LAYOUT_HISTOGRAMA = go.Layout(
+    xaxis={
+        'title': 'SPEI',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',  # Cor da grade
+    },
+    yaxis={
+        'title': 'Frequência',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey',
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    font=dict(color='black', size=12),  # Tamanho da fonte
+    margin=dict(t=20, l=40, r=25, b=40),  # Margens
+)
 
-# Extração dos dados e cálculo do SPEI (sem alterações)
-dados_1 = extrair_dados(file_path_etp, file_path_prp, 1)
-df_etp_prp = extrair_etp_prp(file_path_etp, file_path_prp)
-spei_1 = si.spei(pd.Series(dados_1['dados']))
+LAYOUT_DISPERSAO = go.Layout(
+    xaxis={
+        'title': 'Data',
+        'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey'  # Cor da grade
+    },
+    yaxis={
+        'title': 'SPEI',
+        'range': [-3, 3],
+        'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey'  # Cor da grade
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    margin=dict(t=20, l=40, r=25, b=40),  # Margens
+    font=dict(color='black', size=12)  # Tamanho da fonte
+)
 
-# Função para filtrar os anos (sem alterações)
-def filtrar_por_ano(spei, ano_inicial, ano_final):
-    return spei[(spei.index.year >= ano_inicial) & (spei.index.year <= ano_final)]
+LAYOUT_BOXPLOT = go.Layout(
+    yaxis={
+        'title': 'SPEI',
+        'range': [-3, 3],
+        'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey'  # Cor da grade
+    },
+    xaxis={
+        'title': 'Ano',
+        'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey'  # Cor da grade
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    margin=dict(t=30, l=40, r=25, b=40),  # Margens
+    font=dict(color='black', size=12)  # Tamanho da fonte
+)
 
-# Função para categorizar o SPEI com as novas categorias
-def categorizar_spei(spei_value):
-    if spei_value >= 2.00:
-        return 'Umidade extrema'
-    elif 1.50 <= spei_value < 2.00:
-        return 'Umidade severa'
-    elif 1.00 <= spei_value < 1.50:
-        return 'Umidade moderada'
-    elif 0 <= spei_value < 1.00:
-        return 'Umidade fraca'
-    elif -0.99 <= spei_value < 0:
-        return 'Seca fraca'
-    elif -1.50 <= spei_value < -1.00:
-        return 'Seca moderada'
-    elif -1.99 <= spei_value < -1.50:
-        return 'Seca severa'
-    else:
-        return 'Seca extrema'
+LAYOUT_EVENTOS = go.Layout(
+    xaxis={
+        'title': 'Data',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey'
+    },
+    yaxis={
+        'title': 'Severidade (soma de |SPEI|)',
+        'title_font': dict(color='black', size=12),
+        'tickfont': dict(color='black', size=12),
+        'showgrid': True,
+        'gridcolor': 'lightgrey'
+    },
+    plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
+    paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
+    margin=dict(t=30, l=50, r=25, b=40),  # Margens
+    font=dict(color='black', size=12),  # Tamanho da fonte
+    bargap=0,
+)
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.FLATLY], title='Variabilidade do clima em Paragominas')
 
+# Latência, bytes por callback e acertos de cache em /metrics (com SPEI_METRICAS=1)
+registrar_metricas(app)
+
 # Definindo variáveis de estilo
 CARD_STYLE = {
     'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)',
@@ -336,7 +458,7 @@ app.layout = dbc.Container(
                         dbc.Card(
                             [
                                 dbc.CardHeader("Análise SPEI", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
-                                dcc.Graph(id="spei-graph", config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                dcc.Graph(id="spei-graph", figure={'data': [], 'layout': LAYOUT_LINHA}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
                             ],
                             className="card-shadow",
                             style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
@@ -345,7 +467,7 @@ app.layout = dbc.Container(
                         dbc.Card(
                             [
                                 dbc.CardHeader("Distribuição de Categorias", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
-                                dcc.Graph(id="barras-empilhadas-graph", config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                dcc.Graph(id="barras-empilhadas-graph", figure={'data': [], 'layout': LAYOUT_BARRAS}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
                             ],
                             className="card-shadow",
                             style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
@@ -354,7 +476,7 @@ app.layout = dbc.Container(
                         dbc.Card(
                             [
                                 dbc.CardHeader("Média Mensal", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
-                                dcc.Graph(id="media-mensal-graph", config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                dcc.Graph(id="media-mensal-graph", figure={'data': [], 'layout': LAYOUT_MEDIA_MENSAL}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
                             ],
                             className="card-shadow",
                             style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
@@ -363,7 +485,7 @@ app.layout = dbc.Container(
                         dbc.Card(
                             [
                                 dbc.CardHeader("Histograma de SPEI", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
-                                dcc.Graph(id="histograma-graph", config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                dcc.Graph(id="histograma-graph", figure={'data': [], 'layout': LAYOUT_HISTOGRAMA}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
                             ],
                             className="card-shadow",
                             style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
@@ -372,7 +494,7 @@ app.layout = dbc.Container(
                         dbc.Card(
                             [
                                 dbc.CardHeader("Dispersão SPEI", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
-                                dcc.Graph(id="scatter-graph", config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                dcc.Graph(id="scatter-graph", figure={'data': [], 'layout': LAYOUT_DISPERSAO}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
                             ],
                             className="card-shadow",
                             style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
@@ -381,7 +503,17 @@ app.layout = dbc.Container(
                         dbc.Card(
                             [
                                 dbc.CardHeader("Boxplot SPEI por Ano", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
-                                dcc.Graph(id="boxplot-graph", config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                dcc.Graph(id="boxplot-graph", figure={'data': [], 'layout': LAYOUT_BOXPLOT}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                            ],
+                            className="card-shadow",
+                            style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
+                        ),
+                        # Card de "Eventos de Seca": cada barra é um evento (largura = duração, altura = severidade)
+                        dbc.Card(
+                            [
+                                dbc.CardHeader(f"Eventos de Seca (SPEI < {LIMIAR_SECA:.1f})", style={'backgroundColor': '#F8F9FA', 'fontWeight': '600'}),
+                                dcc.Graph(id="eventos-graph", figure={'data': [], 'layout': LAYOUT_EVENTOS}, config={'responsive': True}, style={'width': '100%', 'height': '400px'}),
+                                html.Div(id="eventos-tabela", style={'maxHeight': '320px', 'overflowY': 'auto', 'padding': '0 10px'}),
                             ],
                             className="card-shadow",
                             style={'boxShadow': '0 4px 6px rgba(0, 0, 0, 0.1)', 'marginBottom': '20px'}  # Adicionando margem inferior
@@ -401,12 +533,8 @@ app.layout = dbc.Container(
     style={'backgroundColor': '#F4F6F7'}  # Fundo levemente acinzentado
 )
 
-@app.callback(
-    [Output('ano-dropdown', 'options'),
-     Output('ano-dropdown', 'value')],  # Adicionando value aqui
-    Input('intervalo-dropdown', 'value')
-)
-def atualizar_ano_dropdown(intervalo):
+# Opções do ano-dropdown para cada tamanho de intervalo ('5', '10' ou 'all')
+def opcoes_do_intervalo(intervalo):
     anos_disponiveis = list(range(1981, 2023))  # Supondo que os dados vão até 2022
     opcoes = []
     
@@ -429,262 +557,268 @@ def atualizar_ano_dropdown(intervalo):
     elif intervalo == 'all':
         opcoes = [{'label': '1981 a 2022', 'value': '1981-2022'}]
 
+    return opcoes
+
+
+@app.callback(
+    [Output('ano-dropdown', 'options'),
+     Output('ano-dropdown', 'value')],  # Adicionando value aqui
+    Input('intervalo-dropdown', 'value')
+)
+@instrumentar('callback', 'ano-dropdown')
+def atualizar_ano_dropdown(intervalo):
+    opcoes = opcoes_do_intervalo(intervalo)
+
     # Define o value como a primeira opção se houver opções
     valor_default = opcoes[0]['value'] if opcoes else None
 
     return opcoes, valor_default  # Retornando as opções e o valor padrão
 
 
-@app.callback(
-    [Output('spei-graph', 'figure'),
-     Output('barras-empilhadas-graph', 'figure'),
-     Output('media-mensal-graph', 'figure'),
-     Output('histograma-graph', 'figure'),
-     Output('scatter-graph', 'figure'),
-     Output('boxplot-graph', 'figure')],
-    Input('ano-dropdown', 'value')
-)
-def atualizar_graficos(intervalo):
+def periodo_do_intervalo(intervalo):
     if not intervalo:  # Se não houver intervalo selecionado
         raise dash.exceptions.PreventUpdate
 
     if intervalo == '1981-2022':
-        ano_inicial, ano_final = 1981, 2022
-    else:
-        ano_inicial, ano_final = map(int, intervalo.split('-'))
+        return 1981, 2022
+    return tuple(map(int, intervalo.split('-')))
 
-    spei_filtrado = filtrar_por_ano(spei_1, ano_inicial, ano_final)
-    categorias = spei_filtrado.apply(categorizar_spei)
-    dados_ano = spei_filtrado.groupby(spei_filtrado.index.year).apply(lambda x: x.apply(categorizar_spei).value_counts(normalize=True) * 100).unstack(fill_value=0)
 
-    font_style = dict(family='Arial, sans-serif', size=12, color='black')
+def tracos_json(tracos):
+    # Dicionários simples: a cada acerto do cache o Dash só serializa o JSON
+    return [traco.to_plotly_json() for traco in tracos]
+
 
-    # Gráfico de linha SPEI
-    linha_figure = {
-    'data': [
+# Dados de cada gráfico por intervalo de anos, memoizados separadamente: as
+# opções do dropdown são pré-calculadas na inicialização e intervalos novos
+# entram no cache sob demanda
+def tracos_linha(spei_filtrado, ano_inicial, ano_final):
+    # Reduzida à resolução do gráfico mantendo o mínimo e o máximo de cada trecho
+    spei_reduzido = reduzir_serie(spei_filtrado, PONTOS_GRAFICO)
+    return tracos_json([
         go.Scatter(
-            x=spei_filtrado.index,
-            y=spei_filtrado.values,
+            x=spei_reduzido.index,
+            y=spei_reduzido.values,
             mode='lines',
             name=f'SPEI de {ano_inicial} a {ano_final + 1}',
             line=dict(color='gray', width=2)  # Espessura da linha
         )
-    ],
-    'layout': go.Layout(
-        xaxis={
-            'title': 'Data',
-            'title_font': dict(color='black', size=14),
-            'tickfont': dict(color='black', size=12),
-            'showgrid': True,
-            'gridcolor': 'lightgrey',
-        },
-        yaxis={
-            'title': 'SPEI',
-            'range': [-3, 3],
-            'title_font': dict(color='black', size=14),
-            'tickfont': dict(color='black', size=12),
-            'showgrid': True,
-            'gridcolor': 'lightgrey',
-        },
-        plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
-        paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
-        font=dict(color='black', size=12),  # Tamanho da fonte,
-        margin=dict(t=40, l=50, r=40, b=50),  # Margens
-        legend=dict(title='Legenda', font=font_style)
-    )
+    ])
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_linha(ano_inicial, ano_final):
+    return tracos_linha(filtrar_por_ano(spei_1, ano_inicial, ano_final), ano_inicial, ano_final)
+
+
+# Dicionário de cores atualizado
+cores_categorias = {
+    'Umidade extrema': '#1e3a8a',
+    'Umidade severa': '#1d4ed8',
+    'Umidade moderada': '#0ea5e9',
+    'Umidade fraca': '#93c5fd',
+    'Seca fraca': '#fca5a5',
+    'Seca moderada': '#ef4444',
+    'Seca severa': '#b91c1c',
+    'Seca extrema': '#7f1d1d',
 }
 
-    # Dicionário de cores atualizado
-    cores_categorias = {
-        'Umidade extrema': '#1e3a8a',
-        'Umidade severa': '#1d4ed8',
-        'Umidade moderada': '#0ea5e9',
-        'Umidade fraca': '#93c5fd',
-        'Seca fraca': '#fca5a5',
-        'Seca moderada': '#ef4444',
-        'Seca severa': '#b91c1c',
-        'Seca extrema': '#7f1d1d',
-    }
 
-    # Gráfico de barras empilhadas atualizado
-    barras_figure = {
-        'data': [
-            go.Bar(
-                x=dados_ano.index,
-                y=dados_ano.get(categoria, pd.Series([0] * len(dados_ano.index))),
-                name=categoria,
-                marker=dict(color=cores_categorias[categoria])  # Usando as cores atualizadas
-            ) for categoria in [
-                'Umidade extrema',
-                'Umidade severa',
-                'Umidade moderada',
-                'Umidade fraca',
-                'Seca fraca',
-                'Seca moderada',
-                'Seca severa',
-                'Seca extrema',             
-            ]
-        ],
-        'layout': go.Layout(
-            barmode='stack',
-            xaxis={
-                'title': 'Ano',
-                'title_font': dict(color='black', size=12),
-                'tickfont': dict(color='black', size=12),
-                'showgrid': True,
-                'gridcolor': 'lightgrey',
-            },
-            yaxis={
-                'title': 'Porcentagem',
-                'title_font': dict(color='black', size=12),
-                'tickfont': dict(color='black', size=12),
-                'showgrid': True,
-                'gridcolor': 'lightgrey',
-            },
-            plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
-            paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
-            font=dict(color='black', size=12),  # Tamanho da fonte
-            legend=dict(traceorder='normal', font=dict(size=12)),  # Tamanho da fonte da legenda
-            margin=dict(t=20, l=40, r=40, b=40),  # Margens
-            bargap=0.1  # Espaçamento entre as barras
-        )
-    }
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_barras(ano_inicial, ano_final):
+    dados_ano = porcentagens_por_ano(indice_spei, ano_inicial, ano_final)
+    return tracos_json([
+        go.Bar(
+            x=dados_ano.index,
+            y=dados_ano[categoria],
+            name=categoria,
+            marker=dict(color=cores_categorias[categoria])  # Usando as cores atualizadas
+        ) for categoria in cores_categorias
+    ])
+
 
-    # Gráfico de média mensal
-    media_mensal = spei_filtrado.resample('M').mean()
-    media_mensal_por_mes = media_mensal.groupby(media_mensal.index.month).mean()  # Média por mês
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_media_mensal(ano_inicial, ano_final):
+    spei_filtrado = filtrar_por_ano(spei_1, ano_inicial, ano_final)
+    media_mensal_por_mes = climatologia(spei_filtrado, ('media',))['media']  # Média por mês
     meses = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
-    
-    media_mensal_figure = {
-    'data': [
+    return tracos_json([
         go.Bar(
             x=meses,
             y=media_mensal_por_mes.values,
             name='Média Mensal de SPEI',
             marker=dict(color='gray', opacity=0.7)  # Adicionando opacidade
         )
-    ],
-    'layout': go.Layout(
-        xaxis={
-            'title': 'Meses',
-            'title_font': dict(color='black', size=12),
-            'tickfont': dict(color='black', size=12),
-            'showgrid': True,
-            'gridcolor': 'lightgrey',  # Cor da grade
-        },
-        yaxis={
-            'title': 'SPEI',
-            'title_font': dict(color='black', size=12),
-            'tickfont': dict(color='black', size=12),
-            'showgrid': True,
-            'gridcolor': 'lightgrey',
-        },
-        plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
-        paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
-        font=dict(color='black', size=12),  # Tamanho da fonte
-        margin=dict(t=20, l=40, r=25, b=40),  # Margens
-    )
-}
+    ])
 
-    # Gráfico de histograma
-    histograma_figure = {
-        'data': [
-            go.Histogram(
-                x=spei_filtrado.values,
-                marker=dict(color='gray', opacity=0.75)  # Adicionando opacidade
-            )
-        ],
-        'layout': go.Layout(
-            xaxis={
-                'title': 'SPEI',
-                'title_font': dict(color='black', size=12),
-                'tickfont': dict(color='black', size=12),
-                'showgrid': True,
-                'gridcolor': 'lightgrey',  # Cor da grade
-            },
-            yaxis={
-                'title': 'Frequência',
-                'title_font': dict(color='black', size=12),
-                'tickfont': dict(color='black', size=12),
-                'showgrid': True,
-                'gridcolor': 'lightgrey',
-            },
-            plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
-            paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
-            font=dict(color='black', size=12),  # Tamanho da fonte
-            margin=dict(t=20, l=40, r=25, b=40),  # Margens
+
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_histograma(ano_inicial, ano_final):
+    # Contagens em classes fixas alinhadas às categorias: algumas dezenas de
+    # números, qualquer que seja o tamanho da série
+    spei_filtrado = filtrar_por_ano(spei_1, ano_inicial, ano_final)
+    return tracos_json([
+        traco_histograma(
+            contar_histograma(spei_filtrado.values),
+            marker=dict(color='gray', opacity=0.75)  # Adicionando opacidade
         )
-    }
+    ])
 
 
-    # Gráfico de dispersão
-    scatter_figure = {
-    'data': [
+def tracos_dispersao(spei_filtrado, ano_inicial, ano_final):
+    spei_reduzido = reduzir_serie(spei_filtrado, PONTOS_GRAFICO)
+    return tracos_json([
         go.Scatter(
-            x=spei_filtrado.index,
-            y=spei_filtrado.values,
+            x=spei_reduzido.index,
+            y=spei_reduzido.values,
             mode='markers',
             marker=dict(color='gray', size=7, opacity=0.8)  # Aumentando o tamanho e adicionando opacidade
         )
-    ],
-    'layout': go.Layout(
-        xaxis={
-            'title': 'Data',
-            'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
-            'tickfont': dict(color='black', size=12),
-            'showgrid': True,
-            'gridcolor': 'lightgrey'  # Cor da grade
-        },
-        yaxis={
-            'title': 'SPEI',
-            'range': [-3, 3],
-            'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
-            'tickfont': dict(color='black', size=12),
-            'showgrid': True,
-            'gridcolor': 'lightgrey'  # Cor da grade
-        },
-        plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
-        paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
-        margin=dict(t=20, l=40, r=25, b=40),  # Margens
-        font=dict(color='black', size=12)  # Tamanho da fonte
-    )
+    ])
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_dispersao(ano_inicial, ano_final):
+    return tracos_dispersao(filtrar_por_ano(spei_1, ano_inicial, ano_final), ano_inicial, ano_final)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_boxplot(ano_inicial, ano_final):
+    # Quartis, bigodes, média e desvio de todos os anos em uma passada; o
+    # navegador recebe as estatísticas, não as amostras
+    spei_filtrado = filtrar_por_ano(spei_1, ano_inicial, ano_final)
+    estatisticas = estatisticas_caixa(spei_filtrado.values, spei_filtrado.index.year)
+    return tracos_json(tracos_caixa(estatisticas, marker=dict(color='gray')))
+
+
+def eventos_do_periodo(ano_inicial, ano_final):
+    # Eventos que tocam o intervalo, inclusive os que começaram antes ou terminam depois
+    return eventos_spei[(eventos_spei['fim'].dt.year >= ano_inicial) & (eventos_spei['inicio'].dt.year <= ano_final)]
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def dados_eventos(ano_inicial, ano_final):
+    return tracos_json([traco_eventos(eventos_do_periodo(ano_inicial, ano_final), cores_categorias)])
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FIGURAS)
+@instrumentar('figura')
+def tabela_eventos(ano_inicial, ano_final):
+    # Só as linhas (registros simples) ficam no cache; o componente é montado a cada resposta
+    eventos = eventos_do_periodo(ano_inicial, ano_final).sort_values('severidade', ascending=False, kind='stable')
+    return tuple(formatar_eventos(eventos).to_dict('records'))  # Os eventos mais severos primeiro
+
+
+def componente_tabela_eventos(registros):
+    if not registros:
+        return html.P('Nenhum evento de seca no intervalo.', style={'margin': '10px 0'})
+    return dbc.Table.from_dataframe(pd.DataFrame(list(registros)), striped=True, hover=True, size='sm', style={'fontSize': '13px'})
+
+
+# Um callback por gráfico: cada um é respondido (e desenhado) assim que os seus
+# dados ficam prontos, e só 'data' vai pela rede; o layout continua no navegador
+GRAFICOS = {
+    'spei-graph': dados_linha,
+    'barras-empilhadas-graph': dados_barras,
+    'media-mensal-graph': dados_media_mensal,
+    'histograma-graph': dados_histograma,
+    'scatter-graph': dados_dispersao,
+    'boxplot-graph': dados_boxplot,
 }
 
 
-    # Gráfico de boxplot por ano
-    boxplot_figure = {
-        'data': [
-            go.Box(
-                y=spei_filtrado[spei_filtrado.index.year == ano].values,
-                name=str(ano),
-                marker=dict(color='gray'),
-                boxmean='sd'  # Adiciona a média e desvio padrão
-            ) for ano in spei_filtrado.index.year.unique()
-        ],
-        'layout': go.Layout(
-            yaxis={
-                'title': 'SPEI',
-                'range': [-3, 3],
-                'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
-                'tickfont': dict(color='black', size=12),
-                'showgrid': True,
-                'gridcolor': 'lightgrey'  # Cor da grade
-            },
-            xaxis={
-                'title': 'Ano',
-                'title_font': dict(color='black', size=12),  # Tamanho da fonte do título
-                'tickfont': dict(color='black', size=12),
-                'showgrid': True,
-                'gridcolor': 'lightgrey'  # Cor da grade
-            },
-            plot_bgcolor='rgba(255, 255, 255, 1)',  # Fundo do gráfico
-            paper_bgcolor='rgba(255, 255, 255, 1)',  # Fundo da área do gráfico
-            margin=dict(t=30, l=40, r=25, b=40),  # Margens
-            font=dict(color='black', size=12)  # Tamanho da fonte
-        )
+# Séries temporais reduzidas: ao dar zoom, a janela visível é recarregada em resolução total
+TRACOS_ZOOM = {
+    'spei-graph': tracos_linha,
+    'scatter-graph': tracos_dispersao,
+}
+
+
+def janela_do_zoom(relayout):
+    """Intervalo de datas visível após um zoom, ou None quando o eixo x voltou ao automático."""
+    if 'xaxis.range[0]' in relayout:
+        return pd.Timestamp(relayout['xaxis.range[0]']), pd.Timestamp(relayout['xaxis.range[1]'])
+    if 'xaxis.range' in relayout:
+        return tuple(pd.Timestamp(limite) for limite in relayout['xaxis.range'])
+    return None
+
+
+def registrar_callback(id_grafico, dados):
+    @app.callback(Output(id_grafico, 'figure'), Input('ano-dropdown', 'value'))
+    @instrumentar('callback', id_grafico)
+    def atualizar_grafico(intervalo):
+        figura = Patch()
+        figura['data'] = dados(*periodo_do_intervalo(intervalo))
+        figura['layout']['xaxis']['autorange'] = True  # desfaz um zoom do intervalo anterior
+        return figura
+
+    return atualizar_grafico
+
+
+def registrar_callback_zoom(id_grafico, dados, tracos):
+    @app.callback(Output(id_grafico, 'figure'), Input('ano-dropdown', 'value'), Input(id_grafico, 'relayoutData'))
+    @instrumentar('callback', id_grafico)
+    def atualizar_grafico(intervalo, relayout):
+        periodo = periodo_do_intervalo(intervalo)
+        figura = Patch()
+        if ctx.triggered_id != id_grafico:
+            figura['data'] = dados(*periodo)
+            figura['layout']['xaxis']['autorange'] = True  # desfaz um zoom do intervalo anterior
+            return figura
+
+        relayout = relayout or {}
+        janela = janela_do_zoom(relayout)
+        if janela is not None:
+            spei_filtrado = filtrar_por_ano(spei_1, *periodo)
+            figura['data'] = tracos(spei_filtrado[janela[0]:janela[1]], *periodo)
+        elif relayout.get('xaxis.autorange'):
+            figura['data'] = dados(*periodo)
+        else:
+            raise dash.exceptions.PreventUpdate  # redimensionamento, troca de ferramenta etc.
+        return figura
+
+    return atualizar_grafico
+
+
+def precalcular_figuras():
+    for tamanho in ('5', '10', 'all'):
+        for opcao in opcoes_do_intervalo(tamanho):
+            periodo = periodo_do_intervalo(opcao['value'])
+            for dados in GRAFICOS.values():
+                dados(*periodo)
+
+
+# Com SPEI_MODO_CLIENTE=1 a série vai uma vez para o navegador e a troca de
+# intervalo é resolvida lá, sem passar pelo servidor
+if MODO_CLIENTE:
+    registrar_modo_cliente(app, spei_1, indice_spei, cores_categorias, eventos=eventos_spei)
+else:
+    callbacks_graficos = {
+        id_grafico: registrar_callback_zoom(id_grafico, dados, TRACOS_ZOOM[id_grafico]) if id_grafico in TRACOS_ZOOM
+        else registrar_callback(id_grafico, dados)
+        for id_grafico, dados in GRAFICOS.items()
     }
+    for dados in GRAFICOS.values():
+        registrar_cache(dados.__name__, dados)
+    precalcular_figuras()
+
+    # Eventos de seca: gráfico e tabela
+    callback_eventos = registrar_callback('eventos-graph', dados_eventos)
+
+    @app.callback(Output('eventos-tabela', 'children'), Input('ano-dropdown', 'value'))
+    @instrumentar('callback', 'eventos-tabela')
+    def atualizar_tabela_eventos(intervalo):
+        return componente_tabela_eventos(tabela_eventos(*periodo_do_intervalo(intervalo)))
 
-    return linha_figure, barras_figure, media_mensal_figure, histograma_figure, scatter_figure, boxplot_figure 
+    registrar_cache('dados_eventos', dados_eventos)
+    registrar_cache('tabela_eventos', tabela_eventos)
 
 if __name__ == "__main__":
     app.run_server(debug=True, host='127.0.0.1', port=int(os.environ.get('PORT', 8050)))
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from processamento import gerar_series  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def series_sinteticas():
+    # Quatro estações mensais de 1981 a 2022, sempre as mesmas (semente fixa)
+    return gerar_series(estacoes=4, semente=7)
+
+
+@pytest.fixture(scope='session')
+def balanco(series_sinteticas):
+    """Balanço hídrico P - ETP mensal de uma estação sintética, como dados_1['dados']."""
+    return (series_sinteticas['PRP'] - series_sinteticas['ETP']).iloc[:, 0].rename('dados')
+
+
+@pytest.fixture(scope='session')
+def spei(balanco):
+    import spei as si
+    return si.spei(balanco)
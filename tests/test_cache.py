@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from processamento import cache, ler_planilha
+
+
+def _csv(caminho, valores):
+    datas = pd.date_range('1981-01-01', periods=len(valores), freq='MS')
+    linhas = [f'{data:%Y-%m-%d};{valor:.2f}'.replace('.', ',') for data, valor in zip(datas, valores)]
+    caminho.write_text('\n'.join(linhas) + '\n;\n', encoding='utf-8')
+    return datas
+
+
+def test_cache_igual_a_leitura_direta(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'DIRETORIO_CACHE', str(tmp_path / 'cache'))
+    arquivo = tmp_path / 'PRP.csv'
+    _csv(arquivo, np.linspace(0, 300, 24))
+
+    direto = ler_planilha(str(arquivo), usar_cache=False)
+    primeira = ler_planilha(str(arquivo))
+    assert os.path.exists(cache.caminho_cache(str(arquivo)))
+    segunda = ler_planilha(str(arquivo))
+
+    for lido in (primeira, segunda):
+        pd.testing.assert_frame_equal(lido, direto)
+        assert lido.attrs == direto.attrs
+
+
+def test_cache_invalidado_quando_o_conteudo_muda(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'DIRETORIO_CACHE', str(tmp_path / 'cache'))
+    arquivo = tmp_path / 'PRP.csv'
+    _csv(arquivo, np.zeros(12))
+    ler_planilha(str(arquivo))
+
+    _csv(arquivo, np.arange(12.0))
+    estado = os.stat(arquivo)
+    os.utime(arquivo, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+    np.testing.assert_array_equal(ler_planilha(str(arquivo))['valor'], np.arange(12.0))
@@ -0,0 +1,35 @@
+import os
+
+import pandas as pd
+import spei as si
+
+from processamento import chave_spei, spei_em_cache
+
+
+def test_acerto_igual_ao_si_spei(balanco, tmp_path):
+    diretorio = str(tmp_path)
+    calculado = spei_em_cache(balanco, diretorio=diretorio)
+    (arquivo,) = os.listdir(diretorio)
+    lido = spei_em_cache(balanco, diretorio=diretorio)
+
+    pd.testing.assert_series_equal(calculado, si.spei(balanco))
+    pd.testing.assert_series_equal(lido, calculado, check_names=False, check_freq=False)
+    assert arquivo == chave_spei(balanco) + '.npz'
+
+
+def test_chave_muda_com_entrada_e_escala(balanco):
+    alterado = balanco.copy()
+    alterado.iloc[-1] += 0.01
+    chaves = {chave_spei(balanco), chave_spei(alterado), chave_spei(balanco, escala=3), chave_spei(balanco, periodo_referencia=(1981, 2010))}
+    assert len(chaves) == 4
+
+
+def test_poda_remove_os_mais_antigos(balanco, tmp_path):
+    diretorio = str(tmp_path)
+    spei_em_cache(balanco, escala=1, diretorio=diretorio)
+    (arquivo,) = os.listdir(diretorio)
+    # Cabe um resultado, não dois: cada gravação remove o anterior
+    limite = int(os.path.getsize(os.path.join(diretorio, arquivo)) * 1.5)
+    for escala in (3, 6):
+        spei_em_cache(balanco, escala=escala, diretorio=diretorio, limite_bytes=limite)
+    assert os.listdir(diretorio) == [chave_spei(balanco, escala=6) + '.npz']
@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from processamento import estatisticas_caixa, estatisticas_mensais_por_periodo, tracos_caixa
+
+
+def _quantil(ordenados, p):
+    # Método #10 de Langford escrito por extenso: posição n*p + 0.5 (base 1), limitada a [1, n]
+    posicao = min(max(len(ordenados) * p + 0.5, 1), len(ordenados))
+    abaixo = math.floor(posicao)
+    acima = min(abaixo + 1, len(ordenados))
+    fracao = posicao - abaixo
+    return ordenados[abaixo - 1] * (1 - fracao) + ordenados[acima - 1] * fracao
+
+
+def _caixa(amostra):
+    ordenados = sorted(amostra)
+    q1, mediana, q3 = (_quantil(ordenados, p) for p in (0.25, 0.5, 0.75))
+    dentro = [valor for valor in ordenados if q1 - 1.5 * (q3 - q1) <= valor <= q3 + 1.5 * (q3 - q1)]
+    return {
+        'n': len(ordenados),
+        'q1': q1,
+        'mediana': mediana,
+        'q3': q3,
+        'limite_inferior': min(dentro),
+        'limite_superior': max(dentro),
+        'media': np.mean(ordenados),
+        'desvio_padrao': np.std(ordenados),
+        'outliers': [valor for valor in ordenados if valor not in dentro],
+    }
+
+
+def test_igual_ao_calculo_grupo_a_grupo(spei):
+    valores = spei.to_numpy().copy()
+    valores[[3, 50, 51]] = np.nan
+    valores[100] = 8.0  # Outlier garantido
+    grupos = spei.index.year.to_numpy()
+    estatisticas = estatisticas_caixa(valores, grupos)
+
+    for ano, linha in estatisticas.iterrows():
+        amostra = valores[(grupos == ano) & ~np.isnan(valores)]
+        esperado = _caixa(amostra)
+        outliers = esperado.pop('outliers')
+        np.testing.assert_allclose(linha[list(esperado)].to_numpy(dtype='float64'), list(esperado.values()), rtol=1e-12)
+        np.testing.assert_array_equal(linha['outliers'], outliers)
+    assert 8.0 in estatisticas.loc[spei.index[100].year, 'outliers']
+    np.testing.assert_array_equal(estatisticas.index, np.unique(grupos))
+
+
+def test_grupos_pequenos():
+    estatisticas = estatisticas_caixa([5.0, 1.0, 2.0, np.nan], ['a', 'b', 'b', 'c'])
+    assert list(estatisticas.index) == ['a', 'b']
+    np.testing.assert_allclose(estatisticas.loc['a', ['q1', 'mediana', 'q3']].to_numpy(dtype='float64'), [5.0, 5.0, 5.0])
+    np.testing.assert_allclose(estatisticas.loc['b', ['q1', 'mediana', 'q3']].to_numpy(dtype='float64'), [1.0, 1.5, 2.0])
+
+
+def test_sem_valores():
+    estatisticas = estatisticas_caixa([np.nan, np.nan], [1981, 1982])
+    assert estatisticas.empty and estatisticas['n'].dtype == 'int64'
+    caixa, pontos = tracos_caixa(estatisticas)
+    assert len(caixa.x) == 0 and len(pontos.y) == 0
+
+
+def test_periodos_sobrepostos_iguais_a_recortes(spei):
+    periodos = [(1981, 1990), (1981, 2010)]
+    estatisticas = estatisticas_mensais_por_periodo(spei, periodos)
+    for inicio, fim in periodos:
+        recorte = spei[str(inicio):str(fim)].dropna()
+        esperado = estatisticas_caixa(recorte.to_numpy(), recorte.index.month.to_numpy())
+        obtido = estatisticas.loc[f'{inicio}-{fim}']
+        pd.testing.assert_frame_equal(obtido.drop(columns='outliers'), esperado.drop(columns='outliers'), check_names=False, check_index_type=False)
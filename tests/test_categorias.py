@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from processamento import CATEGORIAS_SPEI, categorizar_spei, codigos_spei
+
+
+def _categoria(valor):
+    # Referência escalar: classes contíguas, fechadas à esquerda
+    if np.isnan(valor):
+        return None
+    if valor >= 2:
+        return 'Umidade extrema'
+    if valor >= 1.5:
+        return 'Umidade severa'
+    if valor >= 1:
+        return 'Umidade moderada'
+    if valor >= 0:
+        return 'Umidade fraca'
+    if valor >= -1:
+        return 'Seca fraca'
+    if valor >= -1.5:
+        return 'Seca moderada'
+    if valor >= -2:
+        return 'Seca severa'
+    return 'Seca extrema'
+
+
+def test_igual_a_classificacao_escalar():
+    rng = np.random.default_rng(0)
+    valores = np.concatenate((
+        rng.normal(0, 1.5, 5000),
+        [-2.0, -1.5, -1.0, 0.0, 1.0, 1.5, 2.0, -1.995, -0.995, np.nan, np.inf, -np.inf],
+    ))
+    esperado = [_categoria(valor) for valor in valores]
+    codigos = codigos_spei(valores)
+    assert [CATEGORIAS_SPEI[codigo] if codigo >= 0 else None for codigo in codigos] == esperado
+    assert [None if pd.isna(categoria) else categoria for categoria in categorizar_spei(valores)] == esperado
+
+
+def test_forma_preservada():
+    valores = np.array([[-2.5, np.nan], [0.3, 1.7]])
+    np.testing.assert_array_equal(codigos_spei(valores), [[7, -1], [3, 1]])
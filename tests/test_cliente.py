@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import (
+    CATEGORIAS_SPEI,
+    construir_indice,
+    contagens_intervalo,
+    contar_histograma,
+    detectar_eventos,
+    estatisticas_caixa,
+)
+from processamento.cliente import dados_para_navegador, eventos_para_navegador
+
+CORES = {categoria: f'#{i:06x}' for i, categoria in enumerate(CATEGORIAS_SPEI)}
+
+
+@pytest.fixture(scope='module')
+def dados(spei):
+    return dados_para_navegador(spei, construir_indice(spei), CORES)
+
+
+def _posicoes(dados, ano_inicial, ano_final):
+    # Mesma conta do _JS_PERIODO
+    n = len(dados['inicio_ano']) - 1
+    a0 = min(max(ano_inicial - dados['ano_inicial'], 0), n)
+    a1 = min(max(ano_final - dados['ano_inicial'] + 1, a0), n)
+    return a0, a1
+
+
+@pytest.mark.parametrize('ano_inicial, ano_final', [(1981, 2022), (1991, 1995), (2021, 2022), (1970, 1985), (2050, 2060)])
+def test_dados_por_ano_somam_o_intervalo(spei, dados, ano_inicial, ano_final):
+    a0, a1 = _posicoes(dados, ano_inicial, ano_final)
+    i0, i1 = dados['inicio_ano'][a0], dados['inicio_ano'][a1]
+    recorte = spei[(spei.index.year >= ano_inicial) & (spei.index.year <= ano_final)]
+    assert dados['datas'][i0:i1] == recorte.index.strftime('%Y-%m-%d').tolist()
+
+    contagens = np.sum(dados['contagens_ano'][a0:a1], axis=0) if a1 > a0 else np.zeros(len(CATEGORIAS_SPEI))
+    np.testing.assert_array_equal(contagens, contagens_intervalo(construir_indice(spei), ano_inicial, ano_final))
+    histograma = np.sum(dados['histograma_ano'][a0:a1], axis=0) if a1 > a0 else np.zeros(len(dados['bordas_histograma']) - 1)
+    np.testing.assert_array_equal(histograma, contar_histograma(recorte.to_numpy()))
+
+
+def test_caixas_por_ano_iguais_as_do_servidor(spei, dados):
+    estatisticas = estatisticas_caixa(spei.to_numpy(), spei.index.year.to_numpy())
+    caixas = dados['caixas_ano']
+    np.testing.assert_array_equal(caixas['n'], estatisticas['n'])
+    for coluna in ('q1', 'mediana', 'q3', 'limite_inferior', 'limite_superior', 'media', 'desvio_padrao'):
+        np.testing.assert_allclose(caixas[coluna], estatisticas[coluna], atol=5e-5)
+    json.dumps(dados, allow_nan=False)  # Sem NaN, que o JSON não aceita
+
+
+def test_serie_sem_dados():
+    vazia = pd.Series(np.nan, index=pd.date_range('2000-01-01', periods=12, freq='MS'))
+    dados = dados_para_navegador(vazia, construir_indice(vazia), CORES)
+    assert dados['inicio_ano'] == [0] and dados['histograma_ano'] == []
+    assert _posicoes(dados, 1981, 2022) == (0, 0)
+
+
+def test_eventos_em_json(spei):
+    eventos = detectar_eventos(spei)
+    dados = eventos_para_navegador(eventos, CORES)
+    json.dumps(dados, allow_nan=False)
+    assert len(dados['linhas']) == len(dados['severidade']) == len(dados['traco']['y']) == len(eventos)
+    assert dados['ano_inicio'] == eventos['inicio'].dt.year.tolist()
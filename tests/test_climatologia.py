@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import climatologia
+
+ESTATISTICAS = ('n', 'minimo', 'maximo', 'media', 'desvio_padrao', 'soma')
+
+
+@pytest.fixture(scope='module')
+def tmax(series_sinteticas):
+    dados = series_sinteticas['TMAX'].copy()
+    dados.iloc[5:40, 1] = np.nan
+    return dados
+
+
+def _referencia(serie, chave):
+    grupos = serie.groupby(chave)
+    return pd.DataFrame({
+        'n': grupos.count(),
+        'minimo': grupos.min(),
+        'maximo': grupos.max(),
+        'media': grupos.mean(),
+        'desvio_padrao': grupos.std(),
+        'soma': grupos.sum(),
+        'p10': grupos.quantile(0.1),
+        'p90': grupos.quantile(0.9),
+    })
+
+
+def test_mensal_igual_ao_groupby(tmax):
+    serie = tmax.iloc[:, 1]
+    resultado = climatologia(serie, ESTATISTICAS, percentis=(10, 90))
+    esperado = _referencia(serie, serie.index.month)
+    pd.testing.assert_frame_equal(resultado, esperado, check_names=False, check_index_type=False, check_dtype=False)
+
+
+def test_varias_estacoes_iguais_a_cada_uma(tmax):
+    resultado = climatologia(tmax, ESTATISTICAS, percentis=(50,))
+    for estacao in tmax.columns:
+        sozinha = climatologia(tmax[estacao], ESTATISTICAS, percentis=(50,))
+        np.testing.assert_allclose(resultado[estacao].to_numpy(dtype='float64'), sozinha.to_numpy(dtype='float64'), rtol=1e-12)
+
+
+def test_periodos_sobrepostos_e_por_ano(tmax):
+    serie = tmax.iloc[:, 0]
+    periodos = [(1981, 1990), (1981, 2010)]
+    resultado = climatologia(serie, ('media', 'maximo'), periodos=periodos)
+    for inicio, fim in periodos:
+        recorte = serie[str(inicio):str(fim)]
+        esperado = recorte.groupby(recorte.index.month).agg(['mean', 'max'])
+        np.testing.assert_allclose(resultado.loc[f'{inicio}-{fim}'].to_numpy(), esperado.to_numpy(), rtol=1e-12)
+
+    anual = climatologia(serie, ('media',), por='ano')
+    np.testing.assert_allclose(anual['media'], serie.groupby(serie.index.year).mean(), rtol=1e-12)
+
+
+def test_mes_sem_dados_fica_nan():
+    serie = pd.Series(1.0, index=pd.date_range('2000-01-01', periods=3, freq='MS'))
+    resultado = climatologia(serie, ('n', 'media'))
+    assert list(resultado.index) == list(range(1, 13))
+    assert resultado['n'].tolist() == [1, 1, 1] + [0] * 9
+    assert resultado['media'].iloc[3:].isna().all()
+
+
+def test_copia_independente_do_cache(tmax):
+    primeira = climatologia(tmax.iloc[:, 0])
+    primeira.iloc[0, 0] = -999.0
+    assert climatologia(tmax.iloc[:, 0]).iloc[0, 0] != -999.0
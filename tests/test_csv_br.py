@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import ler_csv_br
+
+
+def _ler_linha_a_linha(caminho):
+    # Referência direta: split por ';' e troca da vírgula decimal
+    datas, valores = [], []
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            campos = linha.strip().split(';')
+            if not campos[0]:
+                continue
+            datas.append(pd.Timestamp(campos[0]))
+            valores.append([float(campo.replace(',', '.')) if campo else np.nan for campo in campos[1:]])
+    return pd.DataFrame(valores, index=pd.DatetimeIndex(datas, name='data'))
+
+
+def test_igual_a_leitura_linha_a_linha(tmp_path):
+    rng = np.random.default_rng(0)
+    datas = pd.date_range('1981-01-01', periods=50, freq='MS')
+    valores = rng.uniform(0, 400, size=(50, 3)).round(2)
+    linhas = [';'.join([f'{data:%Y-%m-%d}'] + [f'{valor:.2f}'.replace('.', ',') for valor in linha])
+              for data, linha in zip(datas, valores)]
+    linhas[10] = linhas[10].rsplit(';', 1)[0] + ';'  # Valor ausente
+    arquivo = tmp_path / 'estacoes.csv'
+    arquivo.write_text('\n'.join(linhas) + '\n;\n', encoding='utf-8')
+
+    # Blocos pequenos para passar por várias iterações do leitor
+    lido = ler_csv_br(str(arquivo), tamanho_bloco=7)
+    pd.testing.assert_frame_equal(lido, _ler_linha_a_linha(arquivo))
+
+
+def test_nomes_com_tamanho_errado(tmp_path):
+    arquivo = tmp_path / 'estacao.csv'
+    arquivo.write_text('1981-01-01;1,5\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        ler_csv_br(str(arquivo), nomes=['a', 'b'])
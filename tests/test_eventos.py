@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from processamento import COLUNAS_EVENTOS, detectar_eventos, formatar_eventos, traco_eventos
+
+DATAS = pd.date_range('2000-01-01', periods=14, freq='MS')
+
+# Três corridas abaixo de -1: posições 1-3, 6 e 9-11 (o -1.0 exato da posição 12 não entra)
+SERIE = pd.Series([0.5, -1.2, -2.0, -1.5, 0.1, -0.8, -1.1, 0.0, 0.3, -1.0001, -3.0, -1.4, -1.0, 0.2], index=DATAS)
+
+
+def _corridas(valores, limiar):
+    # Referência direta: percorre a série mês a mês
+    corridas, atual = [], []
+    for posicao, valor in enumerate(valores):
+        if not np.isnan(valor) and valor < limiar:
+            atual.append(posicao)
+        elif atual:
+            corridas.append(atual)
+            atual = []
+    if atual:
+        corridas.append(atual)
+    return corridas
+
+
+def test_serie_montada_a_mao():
+    eventos = detectar_eventos(SERIE)
+    assert eventos['inicio'].tolist() == [DATAS[1], DATAS[6], DATAS[9]]
+    assert eventos['fim'].tolist() == [DATAS[3], DATAS[6], DATAS[11]]
+    assert eventos['duracao'].tolist() == [3, 1, 3]
+    np.testing.assert_allclose(eventos['severidade'], [4.7, 1.1, 5.4001])
+    np.testing.assert_allclose(eventos['intensidade_media'], [4.7 / 3, 1.1, 5.4001 / 3])
+    np.testing.assert_allclose(eventos['pico'], [-2.0, -1.1, -3.0])
+    assert eventos['data_pico'].tolist() == [DATAS[2], DATAS[6], DATAS[10]]
+    np.testing.assert_array_equal(eventos['tempo_entre_eventos'], [np.nan, 5, 3])
+
+
+def test_duracao_minima_e_nan_interrompem():
+    assert detectar_eventos(SERIE, duracao_minima=2)['inicio'].tolist() == [DATAS[1], DATAS[9]]
+    # Tempo entre eventos conta do evento anterior que sobrou
+    np.testing.assert_array_equal(detectar_eventos(SERIE, duracao_minima=2)['tempo_entre_eventos'], [np.nan, 8])
+
+    com_falha = SERIE.copy()
+    com_falha.iloc[2] = np.nan
+    assert detectar_eventos(com_falha)['duracao'].tolist() == [1, 1, 1, 3]
+
+
+def test_igual_a_varredura_mes_a_mes(spei):
+    valores = spei.to_numpy().copy()
+    valores[::29] = np.nan
+    serie = pd.Series(valores, index=spei.index)
+    for limiar in (-1.0, -0.5, 0.0):
+        eventos = detectar_eventos(serie, limiar)
+        corridas = _corridas(valores, limiar)
+        assert eventos['inicio'].tolist() == [spei.index[corrida[0]] for corrida in corridas]
+        assert eventos['duracao'].tolist() == [len(corrida) for corrida in corridas]
+        np.testing.assert_allclose(eventos['severidade'], [np.abs(valores[corrida]).sum() for corrida in corridas])
+        np.testing.assert_allclose(eventos['pico'], [valores[corrida].min() for corrida in corridas])
+
+
+def test_varias_colunas_nao_se_misturam():
+    # A corrida do fim de 'a' não continua no início de 'b'
+    quadro = pd.DataFrame({'a': SERIE.to_numpy()[::-1], 'b': SERIE.to_numpy()}, index=DATAS)
+    quadro.columns.name = 'escala'
+    eventos = detectar_eventos(quadro)
+    for coluna in quadro.columns:
+        sozinha = detectar_eventos(quadro[coluna])
+        dela = eventos[eventos['escala'] == coluna].drop(columns='escala').reset_index(drop=True)
+        pd.testing.assert_frame_equal(dela, sozinha)
+    assert np.isnan(eventos.loc[eventos['escala'] == 'b', 'tempo_entre_eventos'].iloc[0])
+
+
+def test_sem_eventos():
+    eventos = detectar_eventos(pd.Series([0.5, np.nan, -0.2], index=DATAS[:3]))
+    assert eventos.empty and list(eventos.columns[:2]) == ['inicio', 'fim']
+    assert formatar_eventos(eventos).empty
+
+
+def test_tabela_e_traco():
+    eventos = detectar_eventos(SERIE)
+    tabela = formatar_eventos(eventos)
+    assert list(tabela.columns) == list(COLUNAS_EVENTOS.values())
+    assert tabela.iloc[0].tolist() == ['02/2000', '04/2000', 3, 4.7, 1.57, -2.0, '-']
+
+    cores = {'Seca moderada': 'orange', 'Seca severa': 'red', 'Seca extrema': 'darkred'}
+    traco = traco_eventos(eventos, cores)
+    np.testing.assert_array_equal(traco.y, eventos['severidade'])
+    # Cor da categoria do pico de cada evento
+    assert list(traco.marker.color) == ['red', 'orange', 'darkred']
+    # Barra de fevereiro a abril de 2000: 29 + 31 + 30 dias
+    assert traco.width[0] == 90 * 86400 * 1000
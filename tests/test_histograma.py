@@ -0,0 +1,38 @@
+import numpy as np
+
+from processamento import BORDAS_HISTOGRAMA, LIMITES_SPEI, codigos_spei, contar_histograma, traco_histograma
+
+
+def test_igual_ao_np_histogram_com_pontas_recortadas():
+    rng = np.random.default_rng(1)
+    valores = np.concatenate((rng.normal(0, 1.6, 10000), [-9.0, 7.5, 5.0, np.nan]))
+    contagens = contar_histograma(valores)
+
+    # np.histogram fecha a última classe à direita; recortar em [-5, 5) reproduz as classes fechadas à esquerda
+    recortados = np.clip(valores[~np.isnan(valores)], BORDAS_HISTOGRAMA[0], np.nextafter(BORDAS_HISTOGRAMA[-1], -np.inf))
+    esperado, _ = np.histogram(recortados, bins=BORDAS_HISTOGRAMA)
+    np.testing.assert_array_equal(contagens, esperado)
+    assert contagens.sum() == len(valores) - 1
+
+
+def test_classes_fechadas_a_esquerda_como_as_categorias():
+    # Um valor em cada limite de categoria cai na classe que começa nele
+    contagens = contar_histograma(LIMITES_SPEI)
+    np.testing.assert_array_equal(np.flatnonzero(contagens), np.searchsorted(BORDAS_HISTOGRAMA, LIMITES_SPEI))
+    # Nenhuma classe mistura duas categorias
+    centros = BORDAS_HISTOGRAMA[:-1] + np.diff(BORDAS_HISTOGRAMA) / 2
+    np.testing.assert_array_equal(codigos_spei(BORDAS_HISTOGRAMA[:-1]), codigos_spei(np.nextafter(BORDAS_HISTOGRAMA[1:], -np.inf)))
+    assert len(np.unique(codigos_spei(centros))) == 8
+
+
+def test_varias_escalas_na_mesma_distribuicao():
+    valores = np.array([[0.1, -1.2], [np.nan, 2.4]])
+    np.testing.assert_array_equal(contar_histograma(valores), contar_histograma(valores.ravel()))
+
+
+def test_traco_sem_as_classes_vazias_das_pontas():
+    contagens = contar_histograma([-0.1, 0.3, 0.6])
+    traco = traco_histograma(contagens)
+    np.testing.assert_allclose(traco.x, [-0.125, 0.125, 0.375, 0.625])
+    np.testing.assert_array_equal(traco.y, [1, 0, 1, 1])
+    assert len(traco_histograma(contar_histograma([])).x) == 0
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import (
+    CATEGORIAS_SPEI,
+    categorizar_spei,
+    construir_indice,
+    contagens_intervalo,
+    porcentagens_intervalo,
+    porcentagens_por_ano,
+    resumo_intervalo,
+)
+
+INTERVALOS = [(1981, 2022), (1991, 1995), (2000, 2000), (1970, 1985), (2020, 2030), (2050, 2060), (1995, 1990)]
+
+
+@pytest.fixture(scope='module')
+def spei_com_falhas(spei):
+    # Falhas espalhadas e um ano inteiro sem dados no meio da série
+    serie = spei.copy()
+    serie.iloc[::17] = np.nan
+    serie['1999'] = np.nan
+    return serie
+
+
+def _recorte(serie, ano_inicial, ano_final):
+    anos = serie.index.year
+    return serie[(anos >= ano_inicial) & (anos <= ano_final)].dropna()
+
+
+@pytest.mark.parametrize('ano_inicial, ano_final', INTERVALOS)
+def test_contagens_iguais_ao_value_counts(spei_com_falhas, ano_inicial, ano_final):
+    indice = construir_indice(spei_com_falhas)
+    recorte = _recorte(spei_com_falhas, ano_inicial, ano_final)
+    esperado = pd.Series(categorizar_spei(recorte.to_numpy())).value_counts().reindex(list(CATEGORIAS_SPEI), fill_value=0)
+    np.testing.assert_array_equal(contagens_intervalo(indice, ano_inicial, ano_final), esperado)
+
+    porcentagens = porcentagens_intervalo(indice, ano_inicial, ano_final)
+    np.testing.assert_allclose(porcentagens, esperado / len(recorte) * 100 if len(recorte) else 0.0)
+
+
+@pytest.mark.parametrize('ano_inicial, ano_final', INTERVALOS)
+def test_resumo_igual_a_media_e_desvio(spei_com_falhas, ano_inicial, ano_final):
+    resumo = resumo_intervalo(construir_indice(spei_com_falhas), ano_inicial, ano_final)
+    recorte = _recorte(spei_com_falhas, ano_inicial, ano_final)
+    assert resumo['n'] == len(recorte)
+    np.testing.assert_allclose([resumo['media'], resumo['desvio_padrao']], [recorte.mean(), recorte.std()], rtol=1e-9)
+
+
+def test_porcentagens_por_ano_iguais_ao_crosstab(spei_com_falhas):
+    recorte = _recorte(spei_com_falhas, 1990, 2005)
+    esperado = pd.crosstab(recorte.index.year, categorizar_spei(recorte.to_numpy()), normalize='index', dropna=False) * 100
+    tabela = porcentagens_por_ano(construir_indice(spei_com_falhas), 1990, 2005)
+    assert 1999 not in tabela.index
+    np.testing.assert_array_equal(tabela.index, esperado.index)
+    np.testing.assert_allclose(tabela, esperado.reindex(columns=list(CATEGORIAS_SPEI), fill_value=0.0))
+
+
+def test_serie_sem_dados():
+    vazia = pd.Series([np.nan] * 24, index=pd.date_range('2000-01-01', periods=24, freq='MS'))
+    for serie in (vazia, vazia.iloc[:0]):
+        indice = construir_indice(serie)
+        assert contagens_intervalo(indice, 1981, 2022).sum() == 0
+        assert porcentagens_intervalo(indice, 1981, 2022).sum() == 0
+        assert resumo_intervalo(indice, 1981, 2022)['n'] == 0
+        assert porcentagens_por_ano(indice, 1981, 2022).empty
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import CATEGORIAS_SPEI, DECADAS, agregar_intervalos, categorizar_spei, intervalos_anuais
+
+
+def _referencia(serie, bordas, rotulos):
+    # groupby direto: intervalo por pd.cut nos anos e categoria pelo classificador
+    serie = serie.dropna()
+    intervalo = pd.cut(serie.index.year, bins=bordas, right=False, labels=rotulos)
+    categoria = categorizar_spei(serie.to_numpy())
+    grupos = serie.groupby([intervalo, categoria], observed=False)
+    esperado = pd.DataFrame({
+        'n': grupos.count(),
+        'media': grupos.mean(),
+        'desvio_padrao': grupos.std(),
+        'minimo': grupos.min(),
+        'maximo': grupos.max(),
+    })
+    totais = esperado['n'].groupby(level=0, observed=False).transform('sum')
+    esperado['porcentagem'] = (esperado['n'] / totais * 100).fillna(0.0)
+    return esperado
+
+
+def test_decadas_e_categorias_iguais_ao_groupby(spei):
+    bordas, rotulos = intervalos_anuais(DECADAS)
+    resultado = agregar_intervalos(spei, bordas, rotulos, categorias='spei')
+    esperado = _referencia(spei, bordas, rotulos)
+    assert len(resultado) == len(DECADAS) * len(CATEGORIAS_SPEI)
+    for coluna in ('n', 'porcentagem', 'media', 'desvio_padrao', 'minimo', 'maximo'):
+        np.testing.assert_allclose(resultado[coluna].to_numpy(dtype='float64'), esperado[coluna].to_numpy(dtype='float64'),
+                                   rtol=1e-9, atol=1e-9, err_msg=coluna)
+
+
+def test_varias_estacoes_iguais_a_cada_uma(series_sinteticas):
+    dados = series_sinteticas['PRP'].copy()
+    dados.iloc[:30, 2] = np.nan
+    bordas = [1981, 1995, 2010]
+    resultado = agregar_intervalos(dados, bordas)
+    for estacao in dados.columns:
+        np.testing.assert_allclose(resultado.loc[estacao].to_numpy(dtype='float64'),
+                                   agregar_intervalos(dados[estacao], bordas).to_numpy(dtype='float64'), rtol=1e-9)
+
+
+def test_bordas_em_datas(spei):
+    bordas = pd.to_datetime(['1990-07-01', '2000-01-01', '2000-03-01'])
+    resultado = agregar_intervalos(spei, bordas)
+    primeiro = spei['1990-07-01':'1999-12-31'].dropna()
+    assert resultado['n'].tolist() == [len(primeiro), 2]
+    assert resultado['media'].iloc[0] == pytest.approx(primeiro.mean())
+
+
+def test_intervalos_nao_contiguos():
+    with pytest.raises(ValueError):
+        intervalos_anuais([(1981, 1990), (1992, 2000)])
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import spei as si
+from scipy.stats import fisk
+
+from processamento import acumular_lote, calcular_spei_lote
+from processamento.lote import ajustar_loglogistica_pwm, cdf_loglogistica
+
+
+def test_acumulado_igual_ao_rolling_com_falhas(series_sinteticas):
+    balanco = series_sinteticas['PRP'] - series_sinteticas['ETP']
+    balanco.iloc[[10, 11, 200], [0, 2, 3]] = np.nan
+    for escala in (1, 3, 12):
+        np.testing.assert_allclose(acumular_lote(balanco.to_numpy(), escala), balanco.rolling(escala).sum(), rtol=0, atol=1e-9)
+
+
+def test_pwm_recupera_os_parametros():
+    # Amostras grandes de log-logísticas conhecidas, uma por coluna
+    parametros = [(30.0, 4.0, -50.0), (120.0, 8.0, -200.0), (5.0, 3.0, 10.0)]
+    amostra = np.column_stack([
+        fisk.rvs(beta, loc=gama, scale=alfa, size=20000, random_state=semente)
+        for semente, (alfa, beta, gama) in enumerate(parametros)
+    ])
+    alfa, beta, gama = ajustar_loglogistica_pwm(amostra)
+    esperado = np.array(parametros)
+    np.testing.assert_allclose(alfa, esperado[:, 0], rtol=0.1)
+    np.testing.assert_allclose(beta, esperado[:, 1], rtol=0.1)
+    assert np.all(np.abs(gama - esperado[:, 2]) < 0.1 * esperado[:, 0])
+
+
+def test_cdf_igual_a_do_scipy():
+    valores = np.linspace(-40, 200, 50)
+    alfa, beta, gama = 60.0, 5.0, -45.0
+    np.testing.assert_allclose(
+        cdf_loglogistica(valores, alfa, beta, gama),
+        np.clip(fisk.cdf(valores, beta, loc=gama, scale=alfa), 1e-6, 1 - 1e-6),
+        rtol=1e-9,
+    )
+
+
+def test_pwm_proximo_do_mle_do_si_spei(series_sinteticas):
+    # Ajustes diferentes (PWM x MLE): os valores centrais coincidem e só as caudas se afastam
+    balanco = series_sinteticas['PRP'] - series_sinteticas['ETP']
+    for escala in (1, 12):
+        resultado = calcular_spei_lote(balanco.to_numpy(), balanco.index, escala=escala)
+        for coluna in range(balanco.shape[1]):
+            referencia = si.spei(balanco.iloc[:, coluna].rolling(escala).sum().dropna()).reindex(balanco.index).to_numpy()
+            validos = ~np.isnan(referencia)
+            np.testing.assert_array_equal(np.isnan(resultado[:, coluna]), ~validos)
+            diferenca = np.abs(resultado[validos, coluna] - referencia[validos])
+            assert np.corrcoef(resultado[validos, coluna], referencia[validos])[0, 1] > 0.99
+            assert np.median(diferenca) < 0.05
+
+
+def test_blocos_nao_mudam_o_resultado(series_sinteticas):
+    balanco = (series_sinteticas['PRP'] - series_sinteticas['ETP']).to_numpy()
+    datas = series_sinteticas['PRP'].index
+    inteiro = calcular_spei_lote(balanco, datas, escala=3)
+    # Só a ordem das somas do numpy muda entre um bloco largo e colunas isoladas
+    np.testing.assert_allclose(calcular_spei_lote(balanco, datas, escala=3, tamanho_bloco=1), inteiro, rtol=1e-9)
+    np.testing.assert_allclose(calcular_spei_lote(balanco[:, 1], pd.DatetimeIndex(datas), escala=3), inteiro[:, 1], rtol=1e-9)
@@ -0,0 +1,76 @@
+import functools
+import os
+import re
+
+import numpy as np
+import pytest
+
+from processamento import metricas
+
+
+@pytest.fixture
+def registro_limpo(monkeypatch, tmp_path):
+    # Estado do processo isolado e um diretório de registros só do teste
+    monkeypatch.setattr(metricas, '_histogramas', {})
+    monkeypatch.setattr(metricas, '_caches', {})
+    monkeypatch.setattr(metricas, '_base_caches', {})
+    monkeypatch.setattr(metricas, 'DIRETORIO_METRICAS', str(tmp_path))
+    return tmp_path
+
+
+def _amostras(texto, nome):
+    return {rotulos: float(valor) for rotulos, valor in re.findall(rf'^{nome}\{{(.*)\}} (\S+)$', texto, re.M)}
+
+
+def test_buckets_acumulados_iguais_a_contagem_direta(registro_limpo):
+    valores = np.random.default_rng(0).exponential(0.05, 500)
+    for valor in valores:
+        metricas.observar('spei_latencia_segundos', {'etapa': 'callback', 'nome': 'grafico'}, valor)
+    texto = metricas.texto_prometheus()
+
+    buckets = _amostras(texto, 'spei_latencia_segundos_bucket')
+    for limite in metricas.LIMITES_LATENCIA:
+        assert buckets[f'etapa="callback",nome="grafico",le="{limite}"'] == np.sum(valores <= limite)
+    assert buckets['etapa="callback",nome="grafico",le="+Inf"'] == len(valores)
+    soma = _amostras(texto, 'spei_latencia_segundos_sum')['etapa="callback",nome="grafico"']
+    assert soma == pytest.approx(valores.sum())
+
+
+def test_registros_de_varios_processos_somados(registro_limpo):
+    rotulos = {'etapa': 'callback', 'nome': 'grafico'}
+    # Um "worker" que já gravou o seu registro e outro (este processo) que ainda não
+    for valor in (0.002, 0.2):
+        metricas.observar('spei_latencia_segundos', rotulos, valor)
+    metricas.gravar_registro()
+    os.replace(registro_limpo / f'metricas_{os.getpid()}.json', registro_limpo / 'metricas_1.json')
+    metricas._histogramas.clear()
+    metricas.observar('spei_latencia_segundos', rotulos, 0.02)
+
+    contagens = _amostras(metricas.texto_prometheus(), 'spei_latencia_segundos_count')
+    assert contagens == {'etapa="callback",nome="grafico"': 3}
+
+    metricas.limpar_registros()
+    assert os.listdir(registro_limpo) == []
+
+
+def test_cache_descontado_do_que_veio_do_mestre(registro_limpo, monkeypatch):
+    @functools.lru_cache(maxsize=None)
+    def figura(intervalo):
+        return intervalo
+
+    metricas.registrar_cache('figura', figura)
+    figura('1981-2022'), figura('1981-2022')
+    monkeypatch.setattr(metricas, 'DIRETORIO_METRICAS', None)  # Sem a thread de gravação
+    metricas.iniciar_worker()
+    figura('1981-2022'), figura('1991-2000')
+
+    texto = metricas.texto_prometheus()
+    assert _amostras(texto, 'spei_cache_acertos_total') == {'cache="figura"': 1}
+    assert _amostras(texto, 'spei_cache_faltas_total') == {'cache="figura"': 1}
+    assert _amostras(texto, 'spei_cache_itens') == {'cache="figura"': 2}
+
+
+def test_rotulos_escapados(registro_limpo):
+    metricas.observar('spei_latencia_segundos', {'etapa': 'requisicao', 'nome': 'a"b\\c\nd'}, 0.01)
+    linhas = metricas.texto_prometheus().splitlines()
+    assert 'spei_latencia_segundos_count{etapa="requisicao",nome="a\\"b\\\\c\\nd"} 1' in linhas
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import indices_lttb, indices_minmax, reduzir_serie
+
+
+@pytest.fixture(scope='module')
+def serie_diaria():
+    rng = np.random.default_rng(3)
+    datas = pd.date_range('1981-01-01', periods=15000, freq='D')
+    valores = np.cumsum(rng.normal(0, 0.1, len(datas)))
+    valores[rng.choice(len(datas), 300, replace=False)] = np.nan
+    return pd.Series(valores, index=datas)
+
+
+def test_minmax_mantem_os_extremos_de_cada_bloco(serie_diaria):
+    valores = serie_diaria.to_numpy()
+    indices = indices_minmax(valores, 1000)
+    assert len(indices) <= 1002
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == len(valores) - 1
+
+    # Referência: mínimo e máximo de cada bloco, bloco a bloco
+    tamanho = -(-len(valores) // 500)
+    for inicio in range(0, len(valores), tamanho):
+        bloco = valores[inicio:inicio + tamanho]
+        escolhidos = valores[indices[(indices >= inicio) & (indices < inicio + tamanho)]]
+        assert np.nanmin(bloco) in escolhidos and np.nanmax(bloco) in escolhidos
+    assert np.nanmin(valores) in valores[indices] and np.nanmax(valores) in valores[indices]
+
+
+def test_lttb_mantem_as_pontas_e_um_ponto_por_bloco(serie_diaria):
+    valores = serie_diaria.to_numpy()
+    indices = indices_lttb(serie_diaria.index.asi8, valores, 1000)
+    assert len(indices) == 1000
+    assert indices[0] == 0 and indices[-1] == len(valores) - 1
+    assert np.all(np.diff(indices) > 0)
+    # Cada ponto intermediário sai do seu próprio bloco
+    limites = np.linspace(1, len(valores) - 1, 999).astype('int64')
+    assert np.all((indices[1:-1] >= limites[:-1]) & (indices[1:-1] < limites[1:]))
+
+
+def test_lttb_escolhe_o_maior_triangulo():
+    # Reta com um único pico: o LTTB tem de escolher o pico no bloco dele
+    x = np.arange(100, dtype='float64')
+    valores = np.zeros(100)
+    valores[37] = 10.0
+    assert 37 in indices_lttb(x, valores, 10)
+
+
+def test_serie_curta_volta_inalterada(serie_diaria):
+    curta = serie_diaria.iloc[:500]
+    assert reduzir_serie(curta) is curta
+    np.testing.assert_array_equal(indices_minmax(curta.to_numpy(), 1000), np.arange(500))
+    np.testing.assert_array_equal(indices_lttb(curta.index.asi8, curta.to_numpy(), 1000), np.arange(500))
+
+
+def test_reduzir_serie(serie_diaria):
+    for metodo in ('minmax', 'lttb'):
+        reduzida = reduzir_serie(serie_diaria, 1000, metodo)
+        assert len(reduzida) <= 1002
+        pd.testing.assert_series_equal(reduzida, serie_diaria.loc[reduzida.index])
+    with pytest.raises(ValueError):
+        reduzir_serie(serie_diaria, 1000, 'media')
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import gamma
+
+from processamento import (
+    ajustar_parametros,
+    aplicar_parametros,
+    atualizar_spei,
+    calcular_spei,
+    carregar_parametros,
+    congelar_parametros,
+)
+
+PERIODO_COMPLETO = (1981, 2022)
+
+
+def test_parametros_do_periodo_completo_reproduzem_o_si_spei(balanco, spei):
+    parametros = ajustar_parametros(balanco, periodo_referencia=PERIODO_COMPLETO)
+    pd.testing.assert_series_equal(aplicar_parametros(balanco, parametros), spei, check_names=False, check_freq=False)
+
+
+def test_calcular_spei_sem_referencia_e_o_si_spei(balanco, spei):
+    pd.testing.assert_series_equal(calcular_spei(balanco), spei)
+
+
+def test_periodo_de_referencia_usa_so_os_anos_pedidos(balanco):
+    parametros = ajustar_parametros(balanco, periodo_referencia=(1981, 2010))
+    # O mesmo ajuste feito só com os anos de referência produz a mesma transformação
+    recortado = ajustar_parametros(balanco['1981':'2010'], periodo_referencia=PERIODO_COMPLETO)
+    np.testing.assert_array_equal(parametros, recortado)
+    resultado = calcular_spei(balanco, periodo_referencia=(1981, 2010))
+    pd.testing.assert_series_equal(resultado, aplicar_parametros(balanco, parametros), check_freq=False)
+
+
+@pytest.mark.parametrize('escala', [1, 3])
+def test_atualizacao_igual_ao_calculo_completo(balanco, tmp_path, escala):
+    caminho = str(tmp_path / 'parametros.npz')
+    parametros = congelar_parametros(balanco['1981':'2010'], caminho, escala=escala)
+    lidos, escala_lida, periodo = carregar_parametros(caminho)
+    np.testing.assert_array_equal(lidos, parametros)
+    assert (escala_lida, periodo) == (escala, (1981, 2010))
+
+    completo = atualizar_spei(balanco, pd.Series(dtype=float), parametros, escala)
+    anterior = atualizar_spei(balanco.iloc[:400], pd.Series(dtype=float), parametros, escala)
+    # Dois passos de atualização, o último de um único mês
+    estendido = atualizar_spei(balanco.iloc[:-1], anterior, parametros, escala)
+    estendido = atualizar_spei(balanco, estendido, parametros, escala)
+    pd.testing.assert_series_equal(estendido, completo, check_freq=False, rtol=0, atol=1e-12)
+    assert atualizar_spei(balanco, estendido, parametros, escala) is estendido
+
+
+def test_distribuicao_diferente_e_recusada(balanco, tmp_path):
+    caminho = str(tmp_path / 'parametros.npz')
+    congelar_parametros(balanco, caminho)
+    with pytest.raises(ValueError):
+        carregar_parametros(caminho, dist=gamma)
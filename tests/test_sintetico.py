@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processamento import ESCALAS_SINTETICAS, gerar_series
+from processamento.sintetico import _anomalia_mensal, _mascara_falhas
+
+
+def test_ar1_igual_a_recorrencia_explicita():
+    anomalia = _anomalia_mensal(np.random.default_rng(4), 300, 5, persistencia=0.6)
+    ruido = np.random.default_rng(4).standard_normal((300, 5))
+    esperado = np.empty_like(ruido)
+    esperado[0] = ruido[0]
+    for i in range(1, len(ruido)):
+        esperado[i] = 0.6 * esperado[i - 1] + np.sqrt(1 - 0.6 ** 2) * ruido[i]
+    np.testing.assert_allclose(anomalia, esperado, rtol=0, atol=1e-12)
+
+
+def test_mascara_igual_a_marcacao_bloco_a_bloco():
+    mascara = _mascara_falhas(np.random.default_rng(9), 400, 6, 0.1, 4)
+
+    rng = np.random.default_rng(9)
+    n_falhas = rng.poisson(0.1 * 400 / 4, size=6)
+    estacao = np.repeat(np.arange(6), n_falhas)
+    inicios = rng.integers(0, 400, size=len(estacao))
+    duracoes = rng.geometric(1 / 4, size=len(estacao))
+    esperado = np.zeros((400, 6), dtype=bool)
+    for coluna, inicio, duracao in zip(estacao, inicios, duracoes):
+        esperado[inicio:inicio + duracao, coluna] = True
+    np.testing.assert_array_equal(mascara, esperado)
+
+
+@pytest.mark.parametrize('escala', sorted(ESCALAS_SINTETICAS))
+def test_escalas_no_tamanho_anunciado(escala):
+    parametros = ESCALAS_SINTETICAS[escala]
+    meses = pd.date_range('1981-01-01', periods=parametros['anos'] * 12, freq='MS')
+    passos = len(meses) if parametros['frequencia'] == 'mensal' \
+        else len(pd.date_range(meses[0], meses[-1] + pd.offsets.MonthEnd(0), freq='D'))
+    assert parametros['estacoes'] * passos / 504 == pytest.approx(escala, rel=0.01)
+
+
+def test_mesma_semente_mesmos_valores():
+    primeira = gerar_series(estacoes=3, anos=5, frequencia='diaria', falhas=0.05, semente=11)
+    segunda = gerar_series(estacoes=3, anos=5, frequencia='diaria', falhas=0.05, semente=11)
+    for nome in ('ETP', 'PRP', 'TMAX'):
+        pd.testing.assert_frame_equal(primeira[nome], segunda[nome])
+        assert primeira[nome].shape == (len(pd.date_range('1981-01-01', '1985-12-31')), 3)
+    assert not primeira['PRP'].equals(gerar_series(estacoes=3, anos=5, frequencia='diaria', semente=12)['PRP'])
+
+
+def test_fracao_de_falhas_e_forma_mensal():
+    series = gerar_series(estacoes=50, falhas=0.1, semente=2)
+    prp = series['PRP']
+    assert prp.shape == (504, 50) and prp.index.name == 'data'
+    assert 0.07 < prp.isna().to_numpy().mean() < 0.13
+    # Chuva, ETP e TMAX falham juntas (estação parada)
+    np.testing.assert_array_equal(prp.isna(), series['TMAX'].isna())
+    assert (prp.stack() >= 0).all()
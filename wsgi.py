@@ -0,0 +1,57 @@
+"""Ponto de entrada de produção dos dashboards (WSGI).
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Com preload_app (gunicorn.conf.py) este módulo é importado uma única vez no
+processo mestre: as planilhas são lidas, o SPEI é ajustado e as figuras são
+pré-calculadas antes do fork, e os workers herdam esses arrays por
+copy-on-write em vez de refazer tudo. SPEI_APP escolhe o dashboard
+('testeapp', padrão, ou 'dados' para dados/app.py).
+"""
+import gc
+import importlib.util
+import os
+import time
+
+from flask import jsonify
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# Os apps usam caminhos relativos ('dados/...') para as planilhas
+os.chdir(RAIZ)
+
+APPS = {
+    'testeapp': os.path.join(RAIZ, 'testeapp.py'),
+    'dados': os.path.join(RAIZ, 'dados', 'app.py'),
+}
+
+
+def carregar_app(nome):
+    spec = importlib.util.spec_from_file_location(f'dashboard_{nome}', APPS[nome])
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+inicio = time.perf_counter()
+modulo = carregar_app(os.environ.get('SPEI_APP', 'testeapp'))
+app = modulo.app
+server = app.server
+tempo_carga = time.perf_counter() - inicio
+
+# Tudo o que foi carregado até aqui vai para a geração permanente do coletor de
+# lixo: as varreduras nos workers não tocam esses objetos, e as páginas
+# herdadas do mestre continuam compartilhadas
+gc.freeze()
+
+
+# Sinal de prontidão: só responde depois que os dados compartilhados existem
+@server.route('/pronto')
+def pronto():
+    return jsonify(
+        pronto=True,
+        app=modulo.__name__,
+        meses_spei=int(len(modulo.spei_1)),
+        tempo_carga_s=round(tempo_carga, 3),
+        pid=os.getpid(),
+    )